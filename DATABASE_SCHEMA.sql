@@ -51,6 +51,7 @@ CREATE TABLE IF NOT EXISTS applications (
     candidate_id INTEGER NOT NULL,
     resume_file_path VARCHAR(500),
     resume_file_name VARCHAR(255),
+    resume_sha256 VARCHAR(64), -- content hash; identical files share one stored copy
     status VARCHAR(50) DEFAULT 'submitted' CHECK (
         status IN ('submitted', 'approved_for_interview', 'rejected', 'hired', 'rejected_post_interview')
     ),
@@ -65,6 +66,7 @@ CREATE TABLE IF NOT EXISTS applications (
 CREATE INDEX idx_applications_candidate_id ON applications(candidate_id);
 CREATE INDEX idx_applications_job_id ON applications(job_id);
 CREATE INDEX idx_applications_status ON applications(status);
+CREATE INDEX idx_applications_resume_sha256 ON applications(resume_sha256);
 
 -- ============================================================================
 -- PART 4: RESUME EXTRACTIONS (AI parsed resume data)
@@ -78,6 +80,7 @@ CREATE TABLE IF NOT EXISTS resume_extractions (
     years_of_experience DECIMAL(5, 1),
     education TEXT, -- JSON array: [{"degree": "B.S.", "field": "CS", "university": "MIT"}]
     previous_roles TEXT, -- JSON array: [{"title": "Engineer", "company": "Google", "years": 3}]
+    experience_level VARCHAR(50), -- 'Intern', 'Junior', 'Mid-Level', 'Senior', 'Lead'
     resume_score DECIMAL(3, 1) DEFAULT 0, -- Out of 10
     skill_match_percentage DECIMAL(5, 2) DEFAULT 0, -- Out of 100
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -138,12 +141,14 @@ CREATE TABLE IF NOT EXISTS interview_answers (
     answer_score DECIMAL(3, 1), -- 1-10
     answer_evaluation TEXT, -- AI evaluation of answer
     skill_relevance_score DECIMAL(3, 1), -- How well it matches the skill being assessed
+    needs_reevaluation BOOLEAN DEFAULT FALSE, -- Scored by the heuristic fallback, re-score with the LLM
     submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     evaluated_at TIMESTAMP,
     FOREIGN KEY (question_id) REFERENCES interview_questions(id) ON DELETE CASCADE
 );
 
 CREATE INDEX idx_interview_answers_question_id ON interview_answers(question_id);
+CREATE INDEX idx_interview_answers_needs_reevaluation ON interview_answers(needs_reevaluation);
 
 -- ============================================================================
 -- PART 8: INTERVIEW REPORTS (AI generated comprehensive report)
@@ -232,7 +237,64 @@ CREATE INDEX idx_activity_logs_user_id ON activity_logs(user_id);
 CREATE INDEX idx_activity_logs_created_at ON activity_logs(created_at);
 
 -- ============================================================================
--- PART 12: DATA INTEGRITY CHECKS & CONSTRAINTS
+-- PART 12: RESUME JOBS (Durable resume processing queue)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS resume_jobs (
+    id SERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL UNIQUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'completed', 'failed')),
+    stage VARCHAR(20) NOT NULL DEFAULT 'extract', -- Next stage to run: 'extract', 'score', 'review', 'done'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100), -- Worker holding the lease
+    locked_at TIMESTAMP, -- Lease start, renewed while a stage runs
+    resume_text TEXT, -- Output of the extract stage
+    extraction_data TEXT, -- JSON output of the score stage
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_resume_jobs_application_id ON resume_jobs(application_id);
+CREATE INDEX idx_resume_jobs_due ON resume_jobs(status, next_run_at);
+
+-- ============================================================================
+-- PART 13: RESUME DOCUMENTS (Job-independent parse, shared by content hash)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS resume_documents (
+    id SERIAL PRIMARY KEY,
+    sha256 VARCHAR(64) NOT NULL UNIQUE,
+    resume_text TEXT, -- Extracted text
+    profile TEXT, -- JSON: skills, experience, level, education, roles, summary
+    times_reused INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_resume_documents_sha256 ON resume_documents(sha256);
+
+-- ============================================================================
+-- PART 14: QUESTION POOL (Reusable generated interview questions)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS question_pool (
+    id SERIAL PRIMARY KEY,
+    skill_category VARCHAR(50) NOT NULL, -- Key of SKILL_CATEGORIES
+    candidate_level VARCHAR(20) NOT NULL CHECK (candidate_level IN ('junior', 'mid', 'senior')),
+    focus_area VARCHAR(100) NOT NULL,
+    question_text TEXT NOT NULL,
+    times_served INTEGER NOT NULL DEFAULT 0,
+    last_served_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_question_pool_lookup ON question_pool(skill_category, candidate_level, times_served, last_served_at);
+
+-- ============================================================================
+-- PART 15: DATA INTEGRITY CHECKS & CONSTRAINTS
 -- ============================================================================
 
 -- Ensure application has resume before interview can be created
@@ -248,7 +310,7 @@ ALTER TABLE interviews ADD CONSTRAINT check_interview_approved_app
     ));
 
 -- ============================================================================
--- PART 13: SAMPLE DATA (For testing - OPTIONAL)
+-- PART 16: SAMPLE DATA (For testing - OPTIONAL)
 -- ============================================================================
 
 -- Insert test HR user
@@ -262,7 +324,7 @@ VALUES ('candidate@example.com', 'hashed_password_candidate', 'John Doe', 'candi
 ON CONFLICT (email) DO NOTHING;
 
 -- ============================================================================
--- PART 14: VIEWS (For easier querying)
+-- PART 17: VIEWS (For easier querying)
 -- ============================================================================
 
 -- View: Candidate applications with job and status details
@@ -336,7 +398,10 @@ LEFT JOIN hiring_decisions hd ON a.id = hd.application_id;
 -- 9. hiring_decisions - Final hiring decisions
 -- 10. notifications - User notifications
 -- 11. activity_logs - Audit trail
+-- 12. resume_jobs - Resume processing queue
+-- 13. resume_documents - Parsed resumes shared by content hash
+-- 14. question_pool - Reusable interview questions
 --
--- Total: 11 tables + 3 views
+-- Total: 14 tables + 3 views
 -- Foreign keys enforced for data integrity
 -- Indexes created for performance optimization
@@ -44,6 +44,13 @@ class Settings(BaseSettings):
     def groq_keys(self) -> List[str]:
         return [k.strip() for k in self.groq_api_key.split(",") if k.strip()]
 
+    # Interview evaluation: "immediate" scores each answer in submit_answer,
+    # "deferred" only stores answers and scores them all with the report in end_interview
+    interview_evaluation_mode: str = "immediate"
+    # Interview questions: "fixed" generates all five at start, "adaptive" generates
+    # each next question from the previous answer while the candidate is thinking
+    interview_question_mode: str = "fixed"
+    
     # CORS - parse as comma-separated string from env
     allowed_origins: str = "http://localhost:3000,http://localhost:8000,http://127.0.0.1:3000,http://127.0.0.1:8000,http://localhost:3001,http://localhost:3002,http://127.0.0.1:3001,http://127.0.0.1:3002"
     
@@ -1,15 +1,22 @@
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from app.config import get_settings
 from app.database import Base, engine
+from app.auth import get_current_hr
+from app.services.ai_service import llm_clients, llm_cache, cassette, llm_router, llm_scheduler, single_flight, hedge_policy, structured_parser, token_usage, answer_batcher, local_scorer, task_router, speculation_stats
+from app.services.question_pool import pool_stats
+from app.services.question_speculation import next_question_stats
+from app.services import resume_queue
+from app.services.resume_parser import text_extractor
+from app.services.uploads import upload_stats
 from app.routes import auth, jobs, applications, interviews, decisions, notifications, analytics
 from app.models import (
     User, Job, Application, ResumeExtraction, 
     Interview, InterviewQuestion, InterviewAnswer,
-    InterviewReport, HiringDecision, Notification, ActivityLog
+    InterviewReport, HiringDecision, Notification, ActivityLog, ResumeJob, ResumeDocument
 )
 
 settings = get_settings()
@@ -42,6 +49,44 @@ def health_check():
     """Health check endpoint"""
     return {"status": "ok", "message": "HR Recruitment API is running"}
 
+# LLM client diagnostics (key suffixes, cooldowns, queues): HR only
+@app.get("/health/llm")
+def llm_health(current_user: User = Depends(get_current_hr)):
+    """Connection pool limits and usage of the shared LLM clients"""
+    return {
+        "clients": llm_clients.stats(),
+        "router": llm_router.stats(),
+        "task_routing": task_router.stats(),
+        "circuit_breakers": llm_router.breaker_stats(),
+        "scheduler": llm_scheduler.stats(),
+        "hedging": hedge_policy.stats(),
+        "cache": llm_cache.stats(),
+        "cassette": cassette.stats() if cassette else {"mode": "off"},
+        "structured_output": structured_parser.stats(),
+        "tokens": token_usage.stats(),
+        "answer_batching": answer_batcher.stats(),
+        "local_scorer": local_scorer.stats(),
+        "single_flight": single_flight.stats(),
+        "speculation": speculation_stats,
+        "next_question_speculation": next_question_stats,
+        "question_pool": pool_stats,
+        "resume_queue": resume_queue.stats(),
+        "text_extraction": text_extractor.stats(),
+        "uploads": upload_stats
+    }
+
+@app.on_event("startup")
+async def start_resume_workers():
+    """Process queued resumes, including those left over from a previous run"""
+    resume_queue.start_workers()
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    """Stop the resume workers and extraction processes, release pooled LLM connections"""
+    await resume_queue.stop_workers()
+    text_extractor.shutdown()
+    await llm_clients.aclose()
+
 # Root endpoint
 @app.get("/")
 def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -50,6 +50,7 @@ class Application(Base):
     candidate_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     resume_file_path = Column(String(500))
     resume_file_name = Column(String(255))
+    resume_sha256 = Column(String(64), index=True)  # content hash; identical files share one stored copy
     status = Column(String(50), default='submitted', index=True)  # 'submitted', 'approved_for_interview', 'rejected', 'hired', 'rejected_post_interview'
     hr_notes = Column(Text)
     applied_at = Column(DateTime, default=datetime.utcnow)
@@ -61,6 +62,47 @@ class Application(Base):
     resume_extraction = relationship("ResumeExtraction", back_populates="application", uselist=False, cascade="all, delete-orphan")
     interview = relationship("Interview", back_populates="application", uselist=False, cascade="all, delete-orphan")
     hiring_decision = relationship("HiringDecision", back_populates="application", uselist=False, cascade="all, delete-orphan")
+    resume_job = relationship("ResumeJob", back_populates="application", uselist=False, cascade="all, delete-orphan")
+
+    @property
+    def processing_status(self):
+        """Resume processing state: 'queued', 'running', 'completed' or 'failed' (None before the queue existed)"""
+        return self.resume_job.status if self.resume_job else None
+
+class ResumeJob(Base):
+    __tablename__ = "resume_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey('applications.id', ondelete='CASCADE'), nullable=False, unique=True, index=True)
+    status = Column(String(20), default='queued', nullable=False)  # 'queued', 'running', 'completed', 'failed'
+    stage = Column(String(20), default='extract', nullable=False)  # next stage to run: 'extract', 'score', 'review'
+    attempts = Column(Integer, default=0, nullable=False)
+    next_run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime)
+    resume_text = Column(Text)  # output of the extract stage
+    extraction_data = Column(Text)  # JSON output of the score stage
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_resume_jobs_due', 'status', 'next_run_at'),
+    )
+    
+    # Relationships
+    application = relationship("Application", back_populates="resume_job")
+
+class ResumeDocument(Base):
+    __tablename__ = "resume_documents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True, index=True)
+    resume_text = Column(Text)  # extracted text
+    profile = Column(Text)  # JSON: job-independent parse (skills, experience, level, education, roles, summary)
+    times_reused = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class ResumeExtraction(Base):
     __tablename__ = "resume_extractions"
@@ -118,6 +160,22 @@ class InterviewQuestion(Base):
     interview = relationship("Interview", back_populates="questions")
     answers = relationship("InterviewAnswer", back_populates="question")
 
+class QuestionPoolEntry(Base):
+    __tablename__ = "question_pool"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    skill_category = Column(String(50), nullable=False)  # key of SKILL_CATEGORIES
+    candidate_level = Column(String(20), nullable=False)  # 'junior', 'mid', 'senior'
+    focus_area = Column(String(100), nullable=False)
+    question_text = Column(Text, nullable=False)
+    times_served = Column(Integer, default=0, nullable=False)
+    last_served_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_question_pool_lookup', 'skill_category', 'candidate_level', 'times_served', 'last_served_at'),
+    )
+
 class InterviewAnswer(Base):
     __tablename__ = "interview_answers"
     
@@ -127,6 +185,7 @@ class InterviewAnswer(Base):
     answer_score = Column(Float)  # 1-10
     answer_evaluation = Column(Text)  # AI evaluation
     skill_relevance_score = Column(Float)
+    needs_reevaluation = Column(Boolean, default=False, index=True)  # scored by heuristic fallback
     submitted_at = Column(DateTime, default=datetime.utcnow)
     evaluated_at = Column(DateTime)
     
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 import os
-import json
-from datetime import datetime
 from app.database import get_db
-from app.models import User, Application, Job, ResumeExtraction
+from app.models import User, Application, Job
 from app.schemas import ApplicationCreate, ApplicationStatusUpdate, ApplicationResponse, ApplicationDetailResponse
 from app.auth import get_current_user, get_current_candidate, get_current_hr
-from app.services.ai_service import parse_resume_with_ai
+from app.services import resume_queue
+from app.services.resume_queue import enqueue
+from app.services.uploads import store_upload, UploadTooLarge
 
 router = APIRouter(prefix="/api/applications", tags=["applications"])
 
@@ -21,7 +21,12 @@ async def apply_for_job(
     current_user: User = Depends(get_current_candidate),
     db: Session = Depends(get_db)
 ):
-    """Apply for a job with resume (Candidate only)"""
+    """
+    Apply for a job with resume (Candidate only).
+
+    Returns once the file and application are saved; the resume is processed
+    in the background (see processing_status on the application).
+    """
     # Check if job exists and is open
     job = db.query(Job).filter(Job.id == job_id, Job.status == "open").first()
     if not job:
@@ -60,22 +65,16 @@ async def apply_for_job(
             detail="Invalid file type. Only PDF and DOCX allowed."
         )
         
-    # Validate file size (Need to read chunk to be safe, but spooled file has .size or we check after reading)
-    # Since UploadFile is spooled, we can check size if headers provided, or read content.
-    content = await resume_file.read()
-    if len(content) > MAX_FILE_SIZE:
+    # Save resume file, streamed in chunks and rejected as soon as it exceeds the limit.
+    # Stored by content hash: re-uploads of the same file share one copy.
+    file_extension = resume_file.filename.split(".")[-1]
+    try:
+        file_path, file_sha256, _ = await store_upload(resume_file, UPLOAD_DIR, file_extension, MAX_FILE_SIZE)
+    except UploadTooLarge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File too large. Maximum size is 5MB."
         )
-            
-    # Save resume file
-    file_extension = resume_file.filename.split(".")[-1]
-    filename = f"{current_user.id}_{job_id}_{datetime.utcnow().timestamp()}.{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, filename).replace("\\", "/")
-    
-    with open(file_path, "wb") as f:
-        f.write(content)
     
     # Create application
     new_application = Application(
@@ -83,146 +82,16 @@ async def apply_for_job(
         candidate_id=current_user.id,
         resume_file_path=file_path,
         resume_file_name=resume_file.filename,
+        resume_sha256=file_sha256,
         status="submitted"
     )
     
     db.add(new_application)
+    # Extraction, scoring and auto-reject run on the resume queue
+    enqueue(db, new_application)
     db.commit()
     db.refresh(new_application)
-    
-    # Parse resume with AI (async in background would be better)
-    try:
-        # Read resume file
-        # Parse resume text based on file type
-        try:
-            resume_text = ""
-            file_ext = file_path.lower().split('.')[-1]
-            
-            if file_ext == 'pdf':
-                try:
-                    from pypdf import PdfReader
-                    reader = PdfReader(file_path)
-                    for page in reader.pages:
-                        resume_text += page.extract_text() + "\n"
-                except Exception as e:
-                    print(f"PDF Error: {e}")
-                    # Fallback to binary decode if PDF read fails (unlikely to work but last resort)
-                    with open(file_path, "rb") as f:
-                        resume_text = f.read().decode('utf-8', errors='ignore')
-                        
-            elif file_ext in ['docx', 'doc']:
-                try:
-                    import docx
-                    doc = docx.Document(file_path)
-                    for para in doc.paragraphs:
-                        resume_text += para.text + "\n"
-                except Exception as e:
-                    print(f"DOCX Error: {e}")
-                    with open(file_path, "rb") as f:
-                        resume_text = f.read().decode('utf-8', errors='ignore')
-                        
-            else:
-                # Text file
-                with open(file_path, "rb") as f:
-                    resume_text = f.read().decode('utf-8', errors='ignore')
-                    
-            if not resume_text.strip():
-                resume_text = "No readable text found in resume."
-                
-        except Exception as e:
-            print(f"Text Extraction Error: {e}")
-            resume_text = "Error extracting text."
-        
-        # Parse with AI
-        extraction_data = await parse_resume_with_ai(
-            resume_text,
-            job.required_skills,
-            job.id
-        )
-        
-        # Store extraction
-        resume_extraction = ResumeExtraction(
-            application_id=new_application.id,
-            extracted_text=extraction_data.get("summary", resume_text[:200]),  # Store AI summary
-            extracted_skills=json.dumps(extraction_data.get("skills") or []),
-            years_of_experience=extraction_data.get("experience"),
-            education=json.dumps(extraction_data.get("education") or []),
-            previous_roles=json.dumps(extraction_data.get("roles") or []),
-            experience_level=extraction_data.get("experience_level"),
-            resume_score=extraction_data.get("score", 0),
-            skill_match_percentage=extraction_data.get("match_percentage", 0)
-        )
-        db.add(resume_extraction)
-        
-        # --- Validation Logic ---
-        rejection_reasons = []
-        
-        # 0. Check if it's a resume
-        if extraction_data.get("is_resume") is False:
-             rejection_reasons.append("uploaded document is not a resume")
-        
-        # 1. Check for parsing failure
-        # Heuristic: If skills are empty or extracted text indicates failure
-        if not extraction_data.get("skills") and extraction_data.get("experience") == 0:
-             rejection_reasons.append("resume parsing failed")
-             
-        # 2. Check for experience level mismatch
-        # Normalize levels for comparison
-        job_level = job.experience_level.lower().strip() if job.experience_level else ""
-        candidate_level = str(extraction_data.get("experience_level", "")).lower().strip()
-        
-        # Define hierarchy
-        levels = {
-            "intern": 0,
-            "junior": 1,
-            "mid": 2, "mid-level": 2,
-            "senior": 3,
-            "lead": 4, "manager": 4, "lead / manager": 4
-        }
-        
-        job_level_rank = levels.get(job_level, -1)
-        candidate_level_rank = levels.get(candidate_level, -1)
-        
-        # If both levels are recognized, check if candidate is lower than required
-        if job_level_rank != -1 and candidate_level_rank != -1:
-            if candidate_level_rank < job_level_rank:
-                 rejection_reasons.append("experience level mismatch")
-        
-        # If rejected, update status
-        if rejection_reasons:
-            new_application.status = "rejected"
-            new_application.hr_notes = f"Auto-rejected based on: {', '.join(rejection_reasons)}"
-            
-        db.commit()
-
-        # Send notification to HR (only if not rejected? Or always? User didn't specify, but usually HR wants to know)
-        # If rejected, maybe we don't notify or notify as auto-rejected. Let's notify as usual for now or maybe skip to avoid noise.
-        # User goal is to reject. Let's send notification but maybe indicate rejection?
-        # For now, keeping existing notification logic but maybe updating message if rejected.
-        
-        from app.models import Notification
-        try:
-            notification_type = "new_application"
-            message = f"{current_user.full_name} has applied for the {job.title} position."
-            
-            if new_application.status == "rejected":
-                message += f" (Auto-rejected: {', '.join(rejection_reasons)})"
-            
-            notification = Notification(
-                user_id=job.hr_id,
-                notification_type=notification_type,
-                title=f"New Application: {current_user.full_name}",
-                message=message,
-                related_application_id=new_application.id
-            )
-            db.add(notification)
-            db.commit()
-        except Exception as e:
-            print(f"Error creating notification: {e}")
-
-    except Exception as e:
-        print(f"Error parsing resume: {e}")
-        # Application is still created, just resume parsing failed
+    resume_queue.wake()
     
     return new_application
 
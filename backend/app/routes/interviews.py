@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
+import asyncio
 import json
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models import User, Interview, Application, InterviewQuestion, InterviewAnswer, InterviewReport, Job
 from app.schemas import (
     InterviewStart, InterviewAnswerSubmit, InterviewResponse, 
@@ -10,18 +13,30 @@ from app.schemas import (
     InterviewListResponse
 )
 from app.auth import get_current_user, get_current_candidate, get_current_hr
+from app.config import get_settings
+from app.services import question_speculation
 from app.services.ai_service import (
     generate_adaptive_interview_question,
     evaluate_interview_answer,
     generate_interview_report,
+    stream_interview_report,
     analyze_introduction,
     evaluate_detailed_answer,
     generate_domain_questions,
-    generate_behavioral_question
+    generate_behavioral_question,
+    prepare_interview_questions,
+    generate_next_question,
+    assess_interview,
+    llm_priority,
+    INTERACTIVE,
+    NEAR_REAL_TIME
 )
 
 router = APIRouter(prefix="/api/interviews", tags=["interviews"])
 
+# Questions per interview (4 technical + 1 behavioral)
+INTERVIEW_QUESTION_COUNT = 5
+
 @router.get("/my-interviews", response_model=list[InterviewListResponse])
 def get_my_interviews(
     current_user: User = Depends(get_current_candidate),
@@ -111,10 +126,12 @@ async def start_interview(
         resume_extraction = application.resume_extraction
         resume_text = resume_extraction.extracted_text if resume_extraction else ""
         
-        # 1. Analyze Intro/Resume to Lock Skill
-        analysis = await analyze_introduction(resume_text)
-        locked_skill = analysis.get("primary_skill", "general")
-        experience = analysis.get("experience", "mid")
+        # 1-3. Analyze Intro/Resume to Lock Skill (Technical (4) questions generated
+        # concurrently), then the Behavioral (1) question for the locked level
+        with llm_priority(INTERACTIVE, job.hr_id):
+            prepared = await prepare_interview_questions(resume_text, job.title, db=db)
+        locked_skill = prepared["locked_skill"]
+        experience = prepared["experience"]
         
         print(f"🔒 Locking interview to skill: {locked_skill} ({experience})")
         
@@ -123,22 +140,17 @@ async def start_interview(
         db.add(interview)
         db.commit()
         
-        # 2. Generate Technical Questions (4 Questions)
-        tech_questions_list = await generate_domain_questions(
-            skill_category=locked_skill,
-            candidate_level=experience,
-            count=4
-        )
-        
-        # 3. Generate Behavioral Question (1 Question)
-        behavioral_q = await generate_behavioral_question(
-            job_title=job.title,
-            candidate_level=experience
-        )
+        tech_questions_list = prepared["technical_questions"]
+        behavioral_q = prepared["behavioral_question"]
         
         # 4. Save to DB
         question_objects = []
         
+        adaptive = get_settings().interview_question_mode == "adaptive"
+        if adaptive:
+            # Later questions are generated from each answer (see get_current_question)
+            tech_questions_list = tech_questions_list[:1]
+        
         # Add Technical Questions
         for i, q_text in enumerate(tech_questions_list):
             q = InterviewQuestion(
@@ -151,13 +163,14 @@ async def start_interview(
             question_objects.append(q)
             
         # Add Behavioral Question (Last)
-        last_q = InterviewQuestion(
-            interview_id=interview.id,
-            question_number=5,
-            question_text=behavioral_q,
-            question_type="behavioral"
-        )
-        db.add(last_q)
+        if not adaptive:
+            last_q = InterviewQuestion(
+                interview_id=interview.id,
+                question_number=INTERVIEW_QUESTION_COUNT,
+                question_text=behavioral_q,
+                question_type="behavioral"
+            )
+            db.add(last_q)
         
         db.commit()
         
@@ -220,10 +233,10 @@ async def get_current_question(
         if not answers:
             return question
             
-    # If all questions are answered, check if we need to generate more?
-    # For now, we assume fixed 5 questions as per legacy logic "generating questions once"
-    # But if we wanted to support "infinite" or "upto 10", we would generate here.
-    # Since we generated 5 at start, and legacy had 5 total, we stop here.
+    # Adaptive mode: the next question follows from the last answer and is
+    # usually already generated (speculated in submit_answer)
+    if get_settings().interview_question_mode == "adaptive" and questions and len(questions) < INTERVIEW_QUESTION_COUNT:
+        return await _next_adaptive_question(db, interview, questions[-1])
     
     # Interview complete
     raise HTTPException(
@@ -231,6 +244,95 @@ async def get_current_question(
         detail="Interview complete"
     )
 
+async def _next_adaptive_question(db: Session, interview: Interview, previous: InterviewQuestion) -> InterviewQuestion:
+    """Persist the question following `previous`: speculated if available, generated otherwise"""
+    async with question_speculation.lock(interview.id):
+        existing = db.query(InterviewQuestion).filter(
+            InterviewQuestion.interview_id == interview.id,
+            InterviewQuestion.question_number == previous.question_number + 1
+        ).first()
+        if existing:
+            return existing
+        
+        generated = await question_speculation.take(interview.id, previous.question_number)
+        if generated is None:
+            question_speculation.next_question_stats["generated_on_demand"] += 1
+            job = interview.application.job
+            with llm_priority(INTERACTIVE, job.hr_id):
+                generated = await generate_next_question(
+                    job.title, interview.locked_skill, previous.question_text, previous.answers[0].answer_text,
+                    question_number=previous.question_number + 1, total_questions=INTERVIEW_QUESTION_COUNT
+                )
+        
+        question = InterviewQuestion(
+            interview_id=interview.id,
+            question_number=previous.question_number + 1,
+            question_text=generated["question_text"],
+            question_type=generated["question_type"]
+        )
+        db.add(question)
+        db.commit()
+        db.refresh(question)
+        return question
+
+def _speculate_next_question(interview: Interview, question: InterviewQuestion, answer_text: str):
+    """Adaptive mode: generate the follow-up question while the candidate reads the confirmation"""
+    job = interview.application.job
+    with llm_priority(NEAR_REAL_TIME, job.hr_id):
+        question_speculation.speculate(interview.id, question.question_number, lambda: generate_next_question(
+            job.title, interview.locked_skill, question.question_text, answer_text,
+            question_number=question.question_number + 1, total_questions=INTERVIEW_QUESTION_COUNT
+        ))
+
+def _apply_evaluation(answer: InterviewAnswer, evaluation: dict):
+    answer.answer_score = float(evaluation.get("overall", 5))
+    answer.skill_relevance_score = float(evaluation.get("technical_accuracy", 5))
+    # Store full detailed evaluation JSON in the text field
+    answer.answer_evaluation = json.dumps(evaluation)
+    answer.needs_reevaluation = bool(evaluation.get("needs_reevaluation"))
+    answer.evaluated_at = datetime.utcnow()
+
+async def _reevaluate_flagged_answers(db: Session, interview_id: int):
+    """Re-score answers that were evaluated by the heuristic fallback"""
+    flagged = db.query(InterviewAnswer).join(InterviewQuestion).filter(
+        InterviewQuestion.interview_id == interview_id,
+        InterviewAnswer.needs_reevaluation == True
+    ).all()
+    if not flagged:
+        return
+    evaluations = await asyncio.gather(*[
+        evaluate_detailed_answer(question=a.question.question_text, answer=a.answer_text)
+        for a in flagged
+    ])
+    for answer, evaluation in zip(flagged, evaluations):
+        if not evaluation.get("needs_reevaluation"):
+            _apply_evaluation(answer, evaluation)
+    db.commit()
+
+async def _assess_deferred_answers(db: Session, interview: Interview):
+    """
+    Deferred mode: score answers stored without evaluation together with the
+    report, in one call. Returns the report fields, or None when there was
+    nothing to assess or the combined call failed.
+    """
+    answered = db.query(InterviewAnswer).join(InterviewQuestion).filter(
+        InterviewQuestion.interview_id == interview.id
+    ).order_by(InterviewQuestion.question_number).all()
+    pending = [a for a in answered if a.evaluated_at is None]
+    if not pending:
+        return None
+    job = interview.application.job
+    assessment = await assess_interview(
+        job_title=job.title,
+        required_skills=job.required_skills,
+        qa_items=[(a.question.question_text, a.answer_text) for a in answered]
+    )
+    for answer, evaluation in zip(answered, assessment["evaluations"]):
+        if answer.evaluated_at is None:
+            _apply_evaluation(answer, evaluation)
+    db.commit()
+    return assessment["report"]
+
 @router.post("/{interview_id}/submit-answer")
 async def submit_answer(
     interview_id: int,
@@ -280,34 +382,204 @@ async def submit_answer(
     
     db.add(answer)
     
+    settings = get_settings()
+    if settings.interview_question_mode == "adaptive" and current_question.question_number < INTERVIEW_QUESTION_COUNT:
+        _speculate_next_question(interview, current_question, data.answer_text)
+    
+    if settings.interview_evaluation_mode == "deferred":
+        # Scored together with the report in end_interview
+        db.commit()
+        db.refresh(answer)
+        return {"success": True, "answer_id": answer.id}
+    
     # Evaluate answer with AI
     try:
         job = interview.application.job
-        evaluation = await evaluate_detailed_answer(
-            question=current_question.question_text,
-            answer=data.answer_text
-        )
-        
-        answer.answer_score = float(evaluation.get("overall", 5))
-        answer.skill_relevance_score = float(evaluation.get("technical_accuracy", 5))
-        # Store full detailed evaluation JSON in the text field
-        answer.answer_evaluation = json.dumps(evaluation)
-        answer.evaluated_at = datetime.utcnow()
+        with llm_priority(INTERACTIVE, job.hr_id):
+            evaluation = await evaluate_detailed_answer(
+                question=current_question.question_text,
+                answer=data.answer_text
+            )
+        _apply_evaluation(answer, evaluation)
     except Exception as e:
         print(f"Error evaluating answer: {e}")
+        answer.needs_reevaluation = True
     
     db.commit()
     db.refresh(answer)
     
     return {"success": True, "answer_id": answer.id}
 
+def _interview_qa(db: Session, interview_id: int):
+    """Questions of the interview and the answered ones as question/answer/score dicts"""
+    questions = db.query(InterviewQuestion).filter(
+        InterviewQuestion.interview_id == interview_id
+    ).all()
+
+    qa_pairs = []
+    for question in questions:
+        answers = db.query(InterviewAnswer).filter(
+            InterviewAnswer.question_id == question.id
+        ).all()
+        if answers:
+            qa_pairs.append({
+                "question": question.question_text,
+                "answer": answers[0].answer_text,
+                "score": answers[0].answer_score or 5.0
+            })
+    return questions, qa_pairs
+
+def _save_report(db: Session, interview: Interview, report_data: dict, questions: list, qa_pairs: list) -> InterviewReport:
+    """Persist the InterviewReport, notify HR and write the JSON report file"""
+    job = interview.application.job
+    candidate = interview.candidate
+    overall_score = report_data["overall_score"]
+
+    # Serialize detailed_feedback to JSON string if it's a dict/list
+    detailed_feedback_val = report_data["detailed_feedback"]
+    if isinstance(detailed_feedback_val, (dict, list)):
+        detailed_feedback_val = json.dumps(detailed_feedback_val)
+        
+    report = InterviewReport(
+        interview_id=interview.id,
+        overall_score=report_data["overall_score"],
+        technical_skills_score=report_data["technical_skills_score"],
+        communication_score=report_data["communication_score"],
+        problem_solving_score=report_data["problem_solving_score"],
+        strengths=report_data["strengths"],
+        weaknesses=report_data["weaknesses"],
+        summary=report_data["summary"],
+        recommendation=report_data["recommendation"].lower().replace(" ", "_"),
+        detailed_feedback=detailed_feedback_val
+    )
+    
+    db.add(report)
+    db.commit()
+
+    # Send notification to HR
+    from app.models import Notification
+    try:
+        notification = Notification(
+            user_id=job.hr_id,
+            notification_type="interview_completed",
+            title=f"Interview Completed: {candidate.full_name}",
+            message=f"{candidate.full_name} has completed the interview for {job.title}. AI Score: {overall_score:.1f}",
+            related_application_id=interview.application_id,
+            related_interview_id=interview.id
+        )
+        db.add(notification)
+        db.commit()
+    except Exception as e:
+        print(f"Error creating notification: {e}")
+        
+    # ---------------------------------------------------------
+    # integrate ReportManager for JSON file generation
+    # ---------------------------------------------------------
+    try:
+        try:
+            from backend.interview_process.report_manager import ReportManager
+        except ImportError:
+            from interview_process.report_manager import ReportManager
+            
+        report_manager = ReportManager()
+        
+        # Reconstruct session_state
+        # 1. Candidate Info
+        candidate_info = {
+            "skills": str(interview.locked_skill).split(',') if interview.locked_skill else [],
+            "primary_skill": interview.locked_skill or "general",
+            "experience": "mid", # Defaulting as we might not have stored it explicitly in Interview
+            "intro_score": 0 # Not explicitly stored
+        }
+        
+        # 2. Responses
+        responses_data = []
+        for i, qa in enumerate(qa_pairs):
+            # Try to parse the stored evaluation JSON
+            eval_data = {}
+            try:
+                # Find the answer object again or use what we have
+                # We have 'answer' text in qa_pairs, but we need the evaluation JSON
+                # which is in the Answer table. 
+                # Optimization: We already iterated answers above.
+                # Let's re-fetch or assume we need to query if we didn't keep it.
+                # Actually, let's just use what we have.
+                pass
+            except:
+                pass
+                
+            # Iterate questions again to get full data? 
+            # Or just build from what we have. 
+            # We need the `answer_evaluation` field from InterviewAnswer.
+            
+            # Let's find the specific answer object for this question
+            ans_obj = db.query(InterviewAnswer).filter(
+                 InterviewAnswer.question_id == questions[i].id
+            ).first()
+            
+            evaluation_json = {}
+            if ans_obj and ans_obj.answer_evaluation:
+                try:
+                    evaluation_json = json.loads(ans_obj.answer_evaluation)
+                except:
+                    pass
+            
+            responses_data.append({
+                "question": qa["question"],
+                "answer": qa["answer"],
+                "evaluation": evaluation_json,
+                "score": qa["score"],
+                "question_number": i + 1,
+                "question_type": questions[i].question_type
+            })
+
+        # 3. Questions Asked List
+        questions_list = [q.question_text for q in questions]
+        
+        # 4. Messages (Simulated Transcript)
+        messages = []
+        messages.append({"role": "system", "content": f"Interview initialized for {job.title}", "timestamp": str(interview.started_at)})
+        for resp in responses_data:
+            messages.append({"role": "system", "content": f"Question: {resp['question']}"})
+            messages.append({"role": "candidate", "content": resp['answer']})
+        
+        session_state = {
+            "candidate_profile": candidate_info,
+            "questions_asked": questions_list, # This is the list of strings
+            "question_evaluations": responses_data, # This matches the report manager's expectation
+            "questions": questions_list, # ReportManager uses this too
+            "responses": responses_data, # InterviewManager uses this
+            "overall_score": overall_score,
+            "final_score": overall_score,
+            "messages": messages,
+            "start_time": interview.started_at.timestamp() if interview.started_at else 0,
+            "end_time": interview.ended_at.timestamp() if interview.ended_at else 0,
+            "user_id": candidate.id # For ReportManager to link to DB if it wants (though we already did)
+        }
+        
+        saved_path = report_manager.save_interview_report(session_state)
+        print(f"✅ JSON Report saved to: {saved_path}")
+        
+    except Exception as e:
+        print(f"❌ Error in ReportManager integration: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return report
+
 @router.post("/{interview_id}/end")
 async def end_interview(
     interview_id: int,
+    stream_report: bool = False,
     current_user: User = Depends(get_current_candidate),
     db: Session = Depends(get_db)
 ):
-    """End interview and trigger evaluation"""
+    """
+    End interview and trigger evaluation.
+
+    With stream_report the report is not generated here; the response
+    points to the report stream, which generates and saves it.
+    """
     interview = db.query(Interview).filter(
         Interview.id == interview_id,
         Interview.candidate_id == current_user.id,
@@ -320,6 +592,8 @@ async def end_interview(
             detail="Interview not found or not in progress"
         )
     
+    question_speculation.discard(interview_id)
+    
     # End interview
     interview.status = "completed"
     interview.ended_at = datetime.utcnow()
@@ -327,176 +601,165 @@ async def end_interview(
     # Update application status
     interview.application.status = "interview_completed"
     
-    # Calculate overall score
-    questions = db.query(InterviewQuestion).filter(
-        InterviewQuestion.interview_id == interview_id
-    ).all()
+    # Answers scored while the LLM was unavailable get a second chance
+    try:
+        with llm_priority(NEAR_REAL_TIME, interview.application.job.hr_id):
+            await _reevaluate_flagged_answers(db, interview_id)
+    except Exception as e:
+        print(f"Error re-evaluating answers: {e}")
     
-    scores = []
-    qa_pairs = []
-    for question in questions:
-        answers = db.query(InterviewAnswer).filter(
-            InterviewAnswer.question_id == question.id
-        ).all()
-        if answers:
-            score = answers[0].answer_score or 5.0
-            scores.append(score)
-            qa_pairs.append({
-                "question": question.question_text,
-                "answer": answers[0].answer_text,
-                "score": score
-            })
+    # Answers stored without evaluation are scored in the same call as the report
+    assessed_report = None
+    try:
+        with llm_priority(NEAR_REAL_TIME, interview.application.job.hr_id):
+            assessed_report = await _assess_deferred_answers(db, interview)
+    except Exception as e:
+        print(f"Error assessing interview: {e}")
     
+    # Calculate overall score
+    questions, qa_pairs = _interview_qa(db, interview_id)
+    scores = [qa["score"] for qa in qa_pairs]
+
     overall_score = sum(scores) / len(scores) if scores else 5.0
     interview.overall_score = overall_score
     interview.questions_asked = len(questions)
-    
+
     db.commit()
-    
+
+    if stream_report and assessed_report is None:
+        # The client follows the report as it is generated
+        return {
+            "success": True,
+            "interview_id": interview_id,
+            "status": "completed",
+            "report_stream": f"/api/interviews/{interview_id}/report/stream"
+        }
+
     # Generate report
     try:
         job = interview.application.job
-        report_data = await generate_interview_report(
-            job_title=job.title,
-            required_skills=job.required_skills,
-            all_qa_pairs=qa_pairs,
-            overall_score=overall_score
+        if assessed_report is not None:
+            report_data = {**assessed_report, "overall_score": overall_score}
+        else:
+            with llm_priority(NEAR_REAL_TIME, job.hr_id):
+                report_data = await generate_interview_report(
+                    job_title=job.title,
+                    required_skills=job.required_skills,
+                    all_qa_pairs=qa_pairs,
+                    overall_score=overall_score
+                )
+        _save_report(db, interview, report_data, questions, qa_pairs)
+    except Exception as e:
+        print(f"Error generating report: {e}")
+
+    return {"success": True, "interview_id": interview_id, "status": "completed"}
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _report_payload(report: InterviewReport) -> dict:
+    return {
+        "overall_score": report.overall_score,
+        "technical_skills_score": report.technical_skills_score,
+        "communication_score": report.communication_score,
+        "problem_solving_score": report.problem_solving_score,
+        "strengths": report.strengths,
+        "weaknesses": report.weaknesses,
+        "summary": report.summary,
+        "recommendation": report.recommendation,
+        "detailed_feedback": report.detailed_feedback
+    }
+
+@router.get("/{interview_id}/report/stream")
+async def stream_report_events(
+    interview_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate the report of a completed interview as server-sent events.
+
+    HR receives `delta` events (summary text as it is generated), `field`
+    events as each report field completes and a final `report` event with
+    the saved report. The candidate only receives `status` events. An
+    existing report is sent right away.
+    """
+    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
         )
-        
-        # Serialize detailed_feedback to JSON string if it's a dict/list
-        detailed_feedback_val = report_data["detailed_feedback"]
-        if isinstance(detailed_feedback_val, (dict, list)):
-            detailed_feedback_val = json.dumps(detailed_feedback_val)
-            
-        report = InterviewReport(
-            interview_id=interview_id,
-            overall_score=report_data["overall_score"],
-            technical_skills_score=report_data["technical_skills_score"],
-            communication_score=report_data["communication_score"],
-            problem_solving_score=report_data["problem_solving_score"],
-            strengths=report_data["strengths"],
-            weaknesses=report_data["weaknesses"],
-            summary=report_data["summary"],
-            recommendation=report_data["recommendation"].lower().replace(" ", "_"),
-            detailed_feedback=detailed_feedback_val
+
+    job = interview.application.job
+    if current_user.role == "candidate" and interview.candidate_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view your own interviews"
+        )
+    if current_user.role == "hr" and job.hr_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view reports for your interviews"
+        )
+    if interview.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Interview not completed"
         )
-        
-        db.add(report)
-        db.commit()
 
-        # Send notification to HR
-        from app.models import Notification
-        try:
-            notification = Notification(
-                user_id=job.hr_id,
-                notification_type="interview_completed",
-                title=f"Interview Completed: {current_user.full_name}",
-                message=f"{current_user.full_name} has completed the interview for {job.title}. AI Score: {overall_score:.1f}",
-                related_application_id=interview.application_id,
-                related_interview_id=interview_id
-            )
-            db.add(notification)
-            db.commit()
-        except Exception as e:
-            print(f"Error creating notification: {e}")
-            
-        # ---------------------------------------------------------
-        # integrate ReportManager for JSON file generation
-        # ---------------------------------------------------------
+    include_content = current_user.role == "hr"
+    job_title, required_skills, hr_id = job.title, job.required_skills, job.hr_id
+
+    def finished(report: InterviewReport) -> str:
+        if include_content:
+            return _sse("report", _report_payload(report))
+        return _sse("status", {"status": "completed"})
+
+    async def events():
+        # Own session: the stream outlives the request
+        stream_db = SessionLocal()
         try:
+            interview = stream_db.query(Interview).filter(Interview.id == interview_id).first()
+            if interview.report is not None:
+                yield finished(interview.report)
+                return
+
+            yield _sse("status", {"status": "generating"})
+            questions, qa_pairs = _interview_qa(stream_db, interview_id)
+            report_data = None
+            with llm_priority(NEAR_REAL_TIME, hr_id):
+                async for event in stream_interview_report(
+                    job_title, required_skills, qa_pairs, interview.overall_score or 5.0
+                ):
+                    if event[0] == "report":
+                        report_data = event[1]
+                    elif include_content and event[0] == "delta":
+                        yield _sse("delta", {"field": event[1], "text": event[2]})
+                    elif include_content:
+                        yield _sse("field", {"field": event[1], "value": event[2]})
+
             try:
-                from backend.interview_process.report_manager import ReportManager
-            except ImportError:
-                from interview_process.report_manager import ReportManager
-                
-            report_manager = ReportManager()
-            
-            # Reconstruct session_state
-            # 1. Candidate Info
-            candidate_info = {
-                "skills": str(interview.locked_skill).split(',') if interview.locked_skill else [],
-                "primary_skill": interview.locked_skill or "general",
-                "experience": "mid", # Defaulting as we might not have stored it explicitly in Interview
-                "intro_score": 0 # Not explicitly stored
-            }
-            
-            # 2. Responses
-            responses_data = []
-            for i, qa in enumerate(qa_pairs):
-                # Try to parse the stored evaluation JSON
-                eval_data = {}
-                try:
-                    # Find the answer object again or use what we have
-                    # We have 'answer' text in qa_pairs, but we need the evaluation JSON
-                    # which is in the Answer table. 
-                    # Optimization: We already iterated answers above.
-                    # Let's re-fetch or assume we need to query if we didn't keep it.
-                    # Actually, let's just use what we have.
-                    pass
-                except:
-                    pass
-                    
-                # Iterate questions again to get full data? 
-                # Or just build from what we have. 
-                # We need the `answer_evaluation` field from InterviewAnswer.
-                
-                # Let's find the specific answer object for this question
-                ans_obj = db.query(InterviewAnswer).filter(
-                     InterviewAnswer.question_id == questions[i].id
+                report = _save_report(stream_db, interview, report_data, questions, qa_pairs)
+            except IntegrityError:
+                # Another stream for this interview saved its report first
+                stream_db.rollback()
+                report = stream_db.query(InterviewReport).filter(
+                    InterviewReport.interview_id == interview_id
                 ).first()
-                
-                evaluation_json = {}
-                if ans_obj and ans_obj.answer_evaluation:
-                    try:
-                        evaluation_json = json.loads(ans_obj.answer_evaluation)
-                    except:
-                        pass
-                
-                responses_data.append({
-                    "question": qa["question"],
-                    "answer": qa["answer"],
-                    "evaluation": evaluation_json,
-                    "score": qa["score"],
-                    "question_number": i + 1,
-                    "question_type": questions[i].question_type
-                })
-
-            # 3. Questions Asked List
-            questions_list = [q.question_text for q in questions]
-            
-            # 4. Messages (Simulated Transcript)
-            messages = []
-            messages.append({"role": "system", "content": f"Interview initialized for {job.title}", "timestamp": str(interview.started_at)})
-            for resp in responses_data:
-                messages.append({"role": "system", "content": f"Question: {resp['question']}"})
-                messages.append({"role": "candidate", "content": resp['answer']})
-            
-            session_state = {
-                "candidate_profile": candidate_info,
-                "questions_asked": questions_list, # This is the list of strings
-                "question_evaluations": responses_data, # This matches the report manager's expectation
-                "questions": questions_list, # ReportManager uses this too
-                "responses": responses_data, # InterviewManager uses this
-                "overall_score": overall_score,
-                "final_score": overall_score,
-                "messages": messages,
-                "start_time": interview.started_at.timestamp() if interview.started_at else 0,
-                "end_time": interview.ended_at.timestamp() if interview.ended_at else 0,
-                "user_id": current_user.id # For ReportManager to link to DB if it wants (though we already did)
-            }
-            
-            saved_path = report_manager.save_interview_report(session_state)
-            print(f"✅ JSON Report saved to: {saved_path}")
-            
+            yield finished(report)
         except Exception as e:
-            print(f"❌ Error in ReportManager integration: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"Error streaming report: {e}")
+            yield _sse("error", {"detail": "Report generation failed"})
+        finally:
+            stream_db.close()
 
-    except Exception as e:
-        print(f"Error generating report: {e}")
-    
-    return {"success": True, "interview_id": interview_id, "status": "completed"}
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/{interview_id}", response_model=InterviewDetailResponse)
 def get_interview(
@@ -81,6 +81,7 @@ class ApplicationResponse(BaseModel):
     resume_file_name: Optional[str]
     resume_file_path: Optional[str]
     status: str
+    processing_status: Optional[str] = None
     applied_at: datetime
     updated_at: datetime
     
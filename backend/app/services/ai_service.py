@@ -1,7 +1,6 @@
-from openai import AsyncOpenAI
 import json
 import asyncio
-from functools import partial
+import re
 from app.config import get_settings
 
 # Import from the refactored interview_process package
@@ -9,77 +8,79 @@ from app.config import get_settings
 try:
     from backend.interview_process.question_generator import QuestionGenerator
     from backend.interview_process.response_analyzer import ResponseAnalyzer
-    from backend.interview_process.utils import extract_skills
-    from backend.interview_process.config import MODEL_NAME
+    from backend.interview_process.utils import extract_skills, analyze_response_quality
+    from backend.interview_process.config import MODEL_NAME, LLM_EVAL_BATCHING, LLM_EVAL_BATCH_WINDOW_MS, LLM_EVAL_BATCH_MAX, LOCAL_SCORER_ENABLED
+    from backend.interview_process.local_scorer import local_scorer
+    from backend.interview_process.llm_client import registry as llm_clients, chat_completion, stream_chat_completion
+    from backend.interview_process.llm_cache import llm_cache
+    from backend.interview_process.cassette import cassette
+    from backend.interview_process.llm_router import llm_router
+    from backend.interview_process.llm_scheduler import llm_scheduler, llm_priority, INTERACTIVE, NEAR_REAL_TIME, BATCH
+    from backend.interview_process.single_flight import single_flight
+    from backend.interview_process.task_routing import task_router
+    from backend.interview_process.hedging import hedge_policy
+    from backend.interview_process.structured_output import structured_parser, StreamingFieldParser, ResumeExtraction, InterviewReportData, InterviewAssessment
+    from backend.interview_process.prompt_builder import PromptBuilder, token_usage
+    from backend.interview_process.micro_batcher import MicroBatcher
 except ImportError:
     # Fallback for when running directly within backend directory
     from interview_process.question_generator import QuestionGenerator
     from interview_process.response_analyzer import ResponseAnalyzer
-    from interview_process.utils import extract_skills
-    from interview_process.config import MODEL_NAME
+    from interview_process.utils import extract_skills, analyze_response_quality
+    from interview_process.config import MODEL_NAME, LLM_EVAL_BATCHING, LLM_EVAL_BATCH_WINDOW_MS, LLM_EVAL_BATCH_MAX, LOCAL_SCORER_ENABLED
+    from interview_process.local_scorer import local_scorer
+    from interview_process.llm_client import registry as llm_clients, chat_completion, stream_chat_completion
+    from interview_process.llm_cache import llm_cache
+    from interview_process.cassette import cassette
+    from interview_process.llm_router import llm_router
+    from interview_process.llm_scheduler import llm_scheduler, llm_priority, INTERACTIVE, NEAR_REAL_TIME, BATCH
+    from interview_process.single_flight import single_flight
+    from interview_process.task_routing import task_router
+    from interview_process.hedging import hedge_policy
+    from interview_process.structured_output import structured_parser, StreamingFieldParser, ResumeExtraction, InterviewReportData, InterviewAssessment
+    from interview_process.prompt_builder import PromptBuilder, token_usage
+    from interview_process.micro_batcher import MicroBatcher
 
 settings = get_settings()
 
+# Route across every key in Settings (Anthropic is not OpenAI-compatible, so it is not routed)
+llm_router.configure({
+    "groq": settings.groq_keys,
+    "openai": settings.openai_keys,
+    "deepseek": settings.deepseek_keys,
+    "gemini": settings.gemini_keys
+})
+
 # Initialize modular AI services
 question_gen = QuestionGenerator()
 analyzer = ResponseAnalyzer()
 
-# Helper to run sync methods in async loop
-async def run_sync(func, *args, **kwargs):
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+# Opt-in: concurrent answer evaluations share one multi-item LLM call
+answer_batcher = MicroBatcher(
+    analyzer.evaluate_answers_async,
+    window=LLM_EVAL_BATCH_WINDOW_MS / 1000,
+    max_items=LLM_EVAL_BATCH_MAX
+)
 
 # Helper: Direct OpenAI/Groq Call (Async) for local functions
-async def call_openai_direct(prompt: str, system_instr: str) -> str:
-    # Try Groq first (faster and cheaper), then fall back to OpenAI
-    api_key = None
-    base_url = None
-    
-    if settings.groq_keys:
-        api_key = settings.groq_keys[0]
-        base_url = "https://api.groq.com/openai/v1"
-        model = "llama-3.3-70b-versatile"  # Groq's best model
-    elif settings.openai_keys:
-        api_key = settings.openai_keys[0]
-        base_url = None  # Use default OpenAI base URL
-        model = "gpt-4o"
-    else:
-        raise Exception("No API key found. Please set GROQ_API_KEY or OPENAI_API_KEY in .env file.")
-        
-    client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+async def call_openai_direct(prompt: str, system_instr: str, call_site: str = "default", response_model=None):
+    # Routed across every configured Groq/OpenAI/DeepSeek/Gemini key (healthiest first).
+    # With response_model the reply is requested in JSON mode and returned validated.
     try:
-        response = await client.chat.completions.create(
-            model=model,
-            messages=[
+        return await chat_completion(
+            [
                 {"role": "system", "content": system_instr},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            call_site=call_site,
+            response_model=response_model
         )
-        return response.choices[0].message.content
     except Exception as e:
         print(f"API Call Error: {e}")
         raise e
 
-import re
-
-def clean_json(text: str) -> str:
-    """Clean markdown code blocks from JSON string and extract first JSON object"""
-    # Remove markdown code blocks
-    text = text.replace("```json", "").replace("```", "").strip()
-    
-    # Try to find JSON object with regex if it's not clean
-    match = re.search(r'(\{.*\})', text, re.DOTALL)
-    if match:
-        return match.group(1)
-        
-    match_list = re.search(r'(\[.*\])', text, re.DOTALL)
-    if match_list:
-        return match_list.group(1)
-
-    return text
-
 # ============================================================================
 # Business Logic Functions
 # ============================================================================
@@ -151,11 +152,18 @@ def calculate_match_percentage(extracted_skills: list, required_skills_str: str)
             
     return (matches / len(required)) * 100
 
-async def parse_resume_with_ai(resume_text: str, required_skills: str, job_id: int) -> dict:
+RESUME_PROFILE_FIELDS = ("is_resume", "skills", "experience", "experience_level", "education", "roles", "summary")
+
+async def parse_resume_profile(resume_text: str, fallback: bool = True) -> dict:
     """
-    Parse resume using direct OpenAI call.
+    Job-independent resume fields (skills, experience, level, education,
+    roles, summary), so a parsed resume can be reused across jobs.
+    With fallback=False LLM errors are raised instead of falling back to regex;
+    `parsed_by` says which one produced the profile.
     """
-    prompt = f"""
+    prompt = PromptBuilder("resume_parse").add(
+        "resume_text", resume_text, priority=1, min_tokens=200
+    ).render("""
     Analyze this document. First, determine if it is a Resume or CV.
     
     If it is NOT a resume (e.g., it is a research paper, article, assignment, invoice, or irrelevant text), return JSON with "is_resume": false and "summary": "Document identified as [type] instead of resume.".
@@ -168,8 +176,7 @@ async def parse_resume_with_ai(resume_text: str, required_skills: str, job_id: i
     - Previous job roles (list of job titles)
     - A professional 2-3 sentence summary of the candidate's profile
     
-    Resume content: {resume_text[:4000]}
-    Required skills: {required_skills}
+    Resume content: {resume_text}
     
     Return JSON with this exact structure:
     {{
@@ -179,11 +186,9 @@ async def parse_resume_with_ai(resume_text: str, required_skills: str, job_id: i
         "experience_level": "Mid-Level",
         "education": ["degree1", "degree2"],
         "roles": ["role1", "role2"],
-        "summary": "Professional summary...",
-        "score": 5,
-        "match_percentage": 50
+        "summary": "Professional summary..."
     }}
-    """
+    """)
     
     result = {
          "is_resume": True, # Default to True to give benefit of doubt if AI fails to toggle
@@ -193,43 +198,138 @@ async def parse_resume_with_ai(resume_text: str, required_skills: str, job_id: i
          "education": [], 
          "roles": [], 
          "summary": "No summary available.",
-         "score": 5, 
-         "match_percentage": 0
+         "parsed_by": "regex"
     }
     
     try:
         # Using a consistent system instruction
-        response = await call_openai_direct(prompt, "You are an HR resume analyzer. Return valid JSON only.")
-        result = json.loads(clean_json(response))
+        extraction = await call_openai_direct(
+            prompt, "You are an HR resume analyzer. Return valid JSON only.",
+            call_site="resume_parse", response_model=ResumeExtraction
+        )
+        result = {field: getattr(extraction, field) for field in RESUME_PROFILE_FIELDS}
+        result["parsed_by"] = "llm"
     except Exception as e:
+        if not fallback:
+            raise
         print(f"AI Parse Error: {e}, falling back to regex.")
         # Robust Fallback
         extracted_skills = extract_skills(resume_text)
         result["skills"] = extracted_skills
         result["summary"] = resume_text[:200] + "..." if len(resume_text) > 200 else resume_text
-        
-    # Recalculate match percentage programmatically to be safe
+    
+    return result
+
+def score_resume_profile(profile: dict, required_skills: str) -> dict:
+    """The job-specific part: profile plus skill match percentage and 1-10 score"""
+    result = dict(profile)
     match_pct = calculate_match_percentage(result.get("skills", []), required_skills)
     result["match_percentage"] = round(match_pct, 1)
     # Adjust 1-10 score based on match
     result["score"] = round((match_pct / 10), 1)
-    
     return result
 
+async def parse_resume_with_ai(resume_text: str, required_skills: str, job_id: int, fallback: bool = True) -> dict:
+    """
+    Parse resume using direct OpenAI call and score it against the job.
+    With fallback=False LLM errors are raised instead of falling back to regex.
+    """
+    profile = await parse_resume_profile(resume_text, fallback=fallback)
+    return score_resume_profile(profile, required_skills)
+
 async def analyze_introduction(response_text: str) -> dict:
     """Delegate to ResponseAnalyzer"""
-    return await run_sync(analyzer.analyze_introduction, response_text)
+    return await analyzer.analyze_introduction_async(response_text)
+
+async def _evaluate_with_llm(question: str, answer: str) -> dict:
+    if LLM_EVAL_BATCHING:
+        return await answer_batcher.submit((question, answer))
+    return await analyzer.evaluate_answer_async(question, answer)
 
 async def evaluate_detailed_answer(question: str, answer: str) -> dict:
-    """Delegate to ResponseAnalyzer"""
-    return await run_sync(analyzer.evaluate_answer, question, answer)
+    """
+    Score with the local model when it is confident; otherwise delegate to
+    ResponseAnalyzer (micro-batched when LLM_EVAL_BATCHING is on).
+    """
+    local = local_scorer.score(question, answer) if LOCAL_SCORER_ENABLED else None
+    if local and local["confident"] and not local["audit"]:
+        metrics = analyze_response_quality(answer)
+        evaluation = analyzer.build_local_evaluation(question, answer, metrics)
+        for key in ("technical_accuracy", "completeness", "clarity", "depth", "practicality", "overall"):
+            evaluation[key] = local["score"]
+        evaluation["scored_by"] = "local_model"
+        return evaluation
+
+    evaluation = await _evaluate_with_llm(question, answer)
+    if local and not evaluation.get("needs_reevaluation"):
+        local_scorer.record_llm_score(local["score"], float(evaluation.get("overall", 5)))
+    return evaluation
 
 async def generate_domain_questions(skill_category: str, candidate_level: str = "mid", count: int = 5) -> list:
-    """Delegate to QuestionGenerator"""
+    """Delegate to QuestionGenerator; at most `count` questions"""
     # question_gen returns a list of strings
-    return await run_sync(question_gen.generate_initial_skill_questions, skill_category, candidate_level)
+    questions = await question_gen.generate_initial_skill_questions_async(skill_category, candidate_level)
+    return questions[:count]
+
+
+# Speculative technical-question generation outcomes (see prepare_interview_questions)
+speculation_stats = {"hits": 0, "misses": 0}
+# Technical questions per interview; the behavioral question is the fifth
+TECHNICAL_QUESTION_COUNT = 4
+
+async def prepare_interview_questions(resume_text: str, job_title: str, db=None) -> dict:
+    """
+    Lock the interview skill and generate its questions with minimal wall time.
+
+    Technical questions come from the pre-generated question pool when `db`
+    is given; otherwise (or when the pool is empty) they are generated
+    speculatively, concurrently with the intro analysis, for the skill/level
+    guessed by the local heuristic analyzer, and discarded and regenerated if
+    the AI analysis locks a different pair. The behavioral question is static
+    and is built for the locked level.
+    """
+    from app.services import question_pool
 
+    guess = analyzer.analyze_introduction_heuristic(resume_text)
+    guessed = (guess["primary_skill"], guess["experience"])
 
+    analysis_task = asyncio.create_task(analyze_introduction(resume_text))
+    speculative_task = None
+    if db is None or not question_pool.has_questions(db, *guessed, count=TECHNICAL_QUESTION_COUNT):
+        speculative_task = asyncio.create_task(generate_domain_questions(guessed[0], guessed[1], count=TECHNICAL_QUESTION_COUNT))
+
+    try:
+        analysis = await analysis_task
+    except Exception:
+        if speculative_task:
+            speculative_task.cancel()
+        raise
+
+    locked_skill = analysis.get("primary_skill", "general")
+    experience = analysis.get("experience", "mid")
+
+    technical_questions = question_pool.draw_questions(
+        db, locked_skill, experience, count=TECHNICAL_QUESTION_COUNT
+    ) if db is not None else []
+    if technical_questions:
+        if speculative_task:
+            speculative_task.cancel()
+    elif speculative_task and (locked_skill, experience) == guessed:
+        speculation_stats["hits"] += 1
+        technical_questions = await speculative_task
+    else:
+        if speculative_task:
+            speculation_stats["misses"] += 1
+            speculative_task.cancel()
+        technical_questions = await generate_domain_questions(locked_skill, experience, count=TECHNICAL_QUESTION_COUNT)
+
+    return {
+        "analysis": analysis,
+        "locked_skill": locked_skill,
+        "experience": experience,
+        "technical_questions": technical_questions,
+        "behavioral_question": await generate_behavioral_question(job_title, experience)
+    }
 
 async def generate_adaptive_interview_question(previous_answer: str, previous_question: str, interview_history: list, job_title: str, required_skills: str, candidate_skills: list, current_question_number: int) -> dict:
     """
@@ -246,19 +346,55 @@ async def generate_adaptive_interview_question(previous_answer: str, previous_qu
             # Try to infer category from required_skills string
             pass
 
-       # Generate a batch and pick one based on index
-       questions = await run_sync(question_gen.generate_initial_skill_questions, category, "mid")
-       
-       # Use modulo to pick a distinct question from the batch if possible, or random
-       idx = (current_question_number) % len(questions)
-       q_text = questions[idx] if questions else "Describe your experience."
-       
-       return {"question_text": q_text, "question_type": "technical"}
+       # One question conditioned on the previous answer, not a batch of five
+       return await generate_next_question(
+           job_title, category, previous_question, previous_answer,
+           question_number=current_question_number, total_questions=current_question_number + 1
+       )
     else:
        # Intro/Behavioral Phase
-       q_text = await run_sync(question_gen.generate_behavioral_question_ai, background)
+       q_text = question_gen.generate_behavioral_question_ai(background)
        return {"question_text": q_text, "question_type": "behavioral"}
 
+async def generate_next_question(job_title: str, skill: str, previous_question: str, previous_answer: str,
+                                 question_number: int, total_questions: int) -> dict:
+    """
+    Adaptive mode: the question following `previous_answer`. Technical
+    follow-ups until the last question, which is behavioral.
+    """
+    if question_number >= total_questions:
+        background = {"primary_skill": skill or "general"}
+        return {"question_text": question_gen.generate_behavioral_question_ai(background), "question_type": "behavioral"}
+
+    prompt = PromptBuilder("next_question").fixed("job_title", job_title).fixed(
+        "skill", skill or "general"
+    ).fixed("question", previous_question).add(
+        "answer", previous_answer, priority=1, min_tokens=100
+    ).render("""
+    You are interviewing a candidate for {job_title} (domain: {skill}).
+
+    Previous question: {question}
+    Candidate's answer: {answer}
+
+    Ask the next technical question. Build on the answer: probe a gap, a
+    claim worth verifying or a natural next step, without repeating it.
+    Reply with the question only, on one line, ending with "?".
+    """)
+    try:
+        content = await chat_completion(
+            [{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=120,
+            call_site="next_question"
+        )
+        lines = [line.strip().strip('"') for line in (content or "").split("\n") if line.strip().endswith("?")]
+        if lines:
+            return {"question_text": re.sub(r'^\d+[\.\)]\s*', '', lines[0]), "question_type": "technical"}
+    except Exception as e:
+        print(f"Next question error: {e}")
+    fallback = question_gen.fallback_questions(skill)
+    return {"question_text": fallback[question_number % len(fallback)], "question_type": "technical"}
+
 # Aliases for backward compatibility
 evaluate_interview_answer = evaluate_detailed_answer
 
@@ -269,35 +405,49 @@ async def generate_behavioral_question(job_title: str, candidate_level: str) ->
         "primary_skill": "general", 
         "full_name": "Candidate" 
     }
-    return await run_sync(question_gen.generate_behavioral_question_ai, background)
+    return question_gen.generate_behavioral_question_ai(background)
 
 
-async def generate_interview_report(job_title: str, required_skills: str, all_qa_pairs: list, overall_score: float) -> dict:
-    """
-    Generate Hiring Report using OpenAI directly (Legacy Logic preserved).
-    """
-    qa = "\\n".join([f"Q: {i['question']} A: {i['answer']}" for i in all_qa_pairs])
-    prompt = f"""
+def _report_fields(data: InterviewReportData, overall_score: float) -> dict:
+    """InterviewReport column values from a validated report"""
+    return {
+        "overall_score": overall_score,
+        "technical_skills_score": data.technical_score,
+        "communication_score": data.communication_score,
+        "problem_solving_score": data.problem_solving_score,
+        "strengths": json.dumps(data.strengths),
+        "weaknesses": json.dumps(data.weaknesses),
+        "summary": data.summary,
+        "recommendation": data.recommendation or "consider",
+        "detailed_feedback": data.detailed_feedback
+    }
+
+REPORT_SYSTEM_PROMPT = "Generate professional HR report. Return valid JSON."
+
+def _report_prompt(job_title: str, all_qa_pairs: list, overall_score: float) -> str:
+    return PromptBuilder("interview_report").fixed("job_title", job_title).fixed(
+        "overall_score", overall_score
+    ).add(
+        "qa", [f"Q: {i['question']} A: {i['answer']}" for i in all_qa_pairs], priority=1
+    ).render("""
     Generate Hiring Report for {job_title}.
     QA: {qa}
     Score: {overall_score}
     
     Return JSON: {{ "summary": "...", "recommendation": "...", "strengths": [], "weaknesses": [], "technical_score": 5, "communication_score": 5, "problem_solving_score": 5, "detailed_feedback": "..." }}
+    """)
+
+async def generate_interview_report(job_title: str, required_skills: str, all_qa_pairs: list, overall_score: float) -> dict:
     """
+    Generate Hiring Report using OpenAI directly (Legacy Logic preserved).
+    """
+    prompt = _report_prompt(job_title, all_qa_pairs, overall_score)
     try:
-        response = await call_openai_direct(prompt, "Generate professional HR report. Return valid JSON.")
-        data = json.loads(clean_json(response))
-        return {
-            "overall_score": overall_score,
-            "technical_skills_score": float(data.get("technical_score", 5)),
-             "communication_score": float(data.get("communication_score", 5)),
-             "problem_solving_score": float(data.get("problem_solving_score", 5)),
-             "strengths": json.dumps(data.get("strengths", [])),
-             "weaknesses": json.dumps(data.get("weaknesses", [])),
-             "summary": data.get("summary", ""),
-             "recommendation": data.get("recommendation", "consider"),
-             "detailed_feedback": data.get("detailed_feedback", "")
-        }
+        data = await call_openai_direct(
+            prompt, REPORT_SYSTEM_PROMPT,
+            call_site="interview_report", response_model=InterviewReportData
+        )
+        return _report_fields(data, overall_score)
     except Exception as e:
         print(f"Report Gen Error: {e}")
         return {
@@ -305,3 +455,91 @@ async def generate_interview_report(job_title: str, required_skills: str, all_qa
             "technical_skills_score": 5, "communication_score": 5, "problem_solving_score": 5,
             "strengths": "[]", "weaknesses": "[]", "summary": "Report gen failed", "recommendation": "consider", "detailed_feedback": "N/A"
         }
+
+async def stream_interview_report(job_title: str, required_skills: str, all_qa_pairs: list, overall_score: float):
+    """
+    generate_interview_report as a stream of events: ("delta", field, text)
+    while a top-level string field (summary first) is generated, ("field",
+    name, value) as each field completes, and finally ("report", fields)
+    with the dict generate_interview_report returns. If the stream fails or
+    its output does not validate, the final report comes from the
+    non-streaming call instead, so earlier deltas are only a preview.
+    """
+    prompt = _report_prompt(job_title, all_qa_pairs, overall_score)
+    parser = StreamingFieldParser()
+    parts = []
+    try:
+        async for delta in stream_chat_completion(
+            [
+                {"role": "system", "content": REPORT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2000,
+            call_site="interview_report",
+            response_model=InterviewReportData
+        ):
+            parts.append(delta)
+            for event in parser.feed(delta):
+                yield event
+        data = structured_parser.parse("".join(parts), InterviewReportData, "stream")
+        yield ("report", _report_fields(data, overall_score))
+    except Exception as e:
+        print(f"Report stream error: {e}")
+        yield ("report", await generate_interview_report(job_title, required_skills, all_qa_pairs, overall_score))
+
+async def assess_interview(job_title: str, required_skills: str, qa_items: list) -> dict:
+    """
+    Deferred evaluation: score every (question, answer) pair and write the
+    hiring report in one structured call. Returns {"evaluations": [...],
+    "report": {...} or None}; evaluations missing from the reply (or all of
+    them, if the call fails) come from ResponseAnalyzer instead, and report
+    is None when the combined call failed. overall_score in the report is
+    left for the caller to fill in from the final answer scores.
+    """
+    entries = [
+        f"[{i}] Question: {question}\nAnswer ({len(answer.split())} words): {answer}"
+        for i, (question, answer) in enumerate(qa_items)
+    ]
+    prompt = PromptBuilder("interview_assessment").fixed("job_title", job_title).fixed(
+        "required_skills", required_skills or ""
+    ).add("entries", entries, priority=1, joiner="\n\n").render("""
+    Assess this interview for {job_title} (required skills: {required_skills}).
+
+    {entries}
+
+    1. For every answer, score 1-10: technical_accuracy, completeness, clarity,
+       depth, practicality and overall (their average), with 1-2 strengths and
+       weaknesses, in an "evaluations" list keyed by "index".
+    2. Then write the hiring report for the whole interview: summary,
+       recommendation, strengths, weaknesses, technical_score,
+       communication_score, problem_solving_score and detailed_feedback.
+    """)
+
+    evaluations = [None] * len(qa_items)
+    report = None
+    try:
+        data = await chat_completion(
+            [
+                {"role": "system", "content": "You are a technical interviewer and HR analyst. Be fair but critical. Return valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.4,
+            max_tokens=600 + 200 * len(qa_items),
+            call_site="interview_assessment",
+            response_model=InterviewAssessment
+        )
+        for evaluation in data.evaluations:
+            if 0 <= evaluation.index < len(qa_items) and evaluations[evaluation.index] is None:
+                answer = qa_items[evaluation.index][1]
+                evaluations[evaluation.index] = analyzer.score_evaluation(evaluation, answer)
+        report = _report_fields(data, 0.0)
+    except Exception as e:
+        print(f"Interview assessment error: {e}")
+
+    missing = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+    if missing:
+        retried = await analyzer.evaluate_answers_async([qa_items[i] for i in missing])
+        for i, evaluation in zip(missing, retried):
+            evaluations[i] = evaluation
+    return {"evaluations": evaluations, "report": report}
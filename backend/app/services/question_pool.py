@@ -0,0 +1,150 @@
+"""
+Pre-generated technical question pools.
+
+Questions are stored per (skill category, candidate level, focus area) in the
+question_pool table. start_interview draws from the pool with a single indexed
+query; when the number of unserved questions for a pair drops below the low
+watermark a background task asks the LLM for another batch.
+"""
+import asyncio
+import os
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import QuestionPoolEntry
+from app.services.ai_service import question_gen, llm_priority, BATCH
+
+try:
+    from backend.interview_process.config import QUESTION_FOCUS_AREAS
+except ImportError:
+    from interview_process.config import QUESTION_FOCUS_AREAS
+
+POOL_LOW_WATERMARK = int(os.getenv("QUESTION_POOL_LOW_WATERMARK", "10"))
+# Questions are retired after being served this many times so sets keep rotating
+POOL_MAX_SERVES = int(os.getenv("QUESTION_POOL_MAX_SERVES", "3"))
+# Technical questions per interview (the fifth question is behavioral)
+POOL_SET_SIZE = 4
+
+pool_stats = {"draws": 0, "empty": 0, "refills": 0, "refill_errors": 0}
+
+_refilling = set()
+_background_tasks = set()
+
+
+def _servable(db: Session, skill_category: str, candidate_level: str):
+    return db.query(QuestionPoolEntry).filter(
+        QuestionPoolEntry.skill_category == skill_category,
+        QuestionPoolEntry.candidate_level == candidate_level,
+        QuestionPoolEntry.times_served < POOL_MAX_SERVES
+    )
+
+
+def has_questions(db: Session, skill_category: str, candidate_level: str, count: int = POOL_SET_SIZE) -> bool:
+    """True if the pool can serve a full set for this pair"""
+    return _servable(db, skill_category, candidate_level).limit(count).count() >= count
+
+
+def draw_questions(db: Session, skill_category: str, candidate_level: str, count: int = POOL_SET_SIZE) -> list:
+    """
+    Take `count` questions for the pair, least-served (then least recently
+    served) first, and mark them served. Returns [] if the pool cannot fill
+    a full set. Schedules a refill when unserved questions run low.
+    """
+    entries = _servable(db, skill_category, candidate_level).order_by(
+        QuestionPoolEntry.times_served,
+        QuestionPoolEntry.last_served_at.is_(None).desc(),
+        QuestionPoolEntry.last_served_at
+    ).limit(count).all()
+
+    if len(entries) < count:
+        pool_stats["empty"] += 1
+        schedule_refill(skill_category, candidate_level)
+        return []
+
+    now = datetime.utcnow()
+    for entry in entries:
+        entry.times_served += 1
+        entry.last_served_at = now
+    db.commit()
+    pool_stats["draws"] += 1
+
+    unserved = _servable(db, skill_category, candidate_level).filter(
+        QuestionPoolEntry.times_served == 0
+    ).count()
+    if unserved < POOL_LOW_WATERMARK:
+        schedule_refill(skill_category, candidate_level)
+
+    return [entry.question_text for entry in entries]
+
+
+def add_questions(db: Session, skill_category: str, candidate_level: str, focus_area: str, questions: list, times_served: int = 0) -> int:
+    """Insert new questions for the pair, skipping ones already pooled"""
+    existing = {
+        q for (q,) in db.query(QuestionPoolEntry.question_text).filter(
+            QuestionPoolEntry.skill_category == skill_category,
+            QuestionPoolEntry.candidate_level == candidate_level
+        ).all()
+    }
+    added = 0
+    for q_text in questions:
+        if not q_text or q_text in existing:
+            continue
+        existing.add(q_text)
+        db.add(QuestionPoolEntry(
+            skill_category=skill_category,
+            candidate_level=candidate_level,
+            focus_area=focus_area,
+            question_text=q_text,
+            times_served=times_served,
+            last_served_at=datetime.utcnow() if times_served else None
+        ))
+        added += 1
+    db.commit()
+    return added
+
+
+def _next_focus_area(db: Session, skill_category: str, candidate_level: str) -> str:
+    """Focus area with the fewest servable questions for the pair"""
+    counts = dict(
+        _servable(db, skill_category, candidate_level).with_entities(
+            QuestionPoolEntry.focus_area, func.count(QuestionPoolEntry.id)
+        ).group_by(QuestionPoolEntry.focus_area).all()
+    )
+    return min(QUESTION_FOCUS_AREAS, key=lambda area: counts.get(area, 0))
+
+
+async def refill_pool(skill_category: str, candidate_level: str):
+    """Generate one batch for the least-stocked focus area of the pair"""
+    key = (skill_category, candidate_level)
+    if key in _refilling:
+        return
+    _refilling.add(key)
+    db = SessionLocal()
+    try:
+        focus_area = _next_focus_area(db, skill_category, candidate_level)
+        # Refills inherit the drawing request's context; they are background work
+        with llm_priority(BATCH, "question_pool"):
+            # Static fallback questions must not be pooled: let LLM errors raise
+            questions = await question_gen.generate_initial_skill_questions_async(
+                skill_category, candidate_level, focus_area=focus_area, fallback=False
+            )
+        added = add_questions(db, skill_category, candidate_level, focus_area, questions)
+        pool_stats["refills"] += 1
+        print(f"Question pool refilled: {skill_category}/{candidate_level}/{focus_area} (+{added})")
+    except Exception as e:
+        pool_stats["refill_errors"] += 1
+        print(f"Question pool refill error: {e}")
+    finally:
+        db.close()
+        _refilling.discard(key)
+
+
+def schedule_refill(skill_category: str, candidate_level: str):
+    """Refill the pair in the background if an event loop is running"""
+    try:
+        task = asyncio.get_running_loop().create_task(refill_pool(skill_category, candidate_level))
+    except RuntimeError:
+        return
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,111 @@
+"""
+Speculative next-question generation for the adaptive interview mode.
+
+As soon as an answer is saved, the follow-up question is generated in the
+background, conditioned on that answer, while the candidate is still
+reading the confirmation. get_current_question then takes the finished (or
+still running) result instead of generating on the request path.
+
+Results are kept in process memory per interview, tagged with the number of
+the question they follow. A process without an entry (restart, another
+worker) generates on demand, so the store is only ever an optimization.
+Entries of interviews that are abandoned without end_interview are evicted
+once idle for SPECULATION_IDLE_SECONDS, or oldest first beyond
+SPECULATION_MAX_INTERVIEWS.
+"""
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+SPECULATION_IDLE_SECONDS = float(os.getenv("SPECULATION_IDLE_SECONDS", "3600"))
+SPECULATION_MAX_INTERVIEWS = int(os.getenv("SPECULATION_MAX_INTERVIEWS", "1000"))
+
+next_question_stats = {
+    "started": 0,
+    "served_ready": 0,     # finished before the candidate asked for it
+    "served_waited": 0,    # still running; the request awaited the remainder
+    "generated_on_demand": 0,
+    "discarded": 0,        # never served: superseded, out of date or interview ended
+    "failed": 0,
+    "evicted": 0,          # interview idle too long (abandoned) or store full
+}
+
+# interview_id -> (number of the question being followed up, task)
+_pending: Dict[int, Tuple[int, asyncio.Task]] = {}
+_locks: Dict[int, asyncio.Lock] = {}
+# interview_id -> last use (time.monotonic); re-inserted on use, so least recently used first
+_last_used: Dict[int, float] = {}
+
+
+def _drop(entry: Optional[Tuple[int, asyncio.Task]]):
+    if entry is None:
+        return
+    _, task = entry
+    next_question_stats["discarded"] += 1
+    if not task.done():
+        task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _touch(interview_id: int):
+    """Mark the interview as in use and evict idle or excess ones"""
+    now = time.monotonic()
+    _last_used.pop(interview_id, None)
+    excess = len(_last_used) + 1 - SPECULATION_MAX_INTERVIEWS
+    evict = []
+    for other, used in _last_used.items():  # least recently used first
+        if excess <= 0 and now - used <= SPECULATION_IDLE_SECONDS:
+            break
+        lock = _locks.get(other)
+        if lock is not None and lock.locked():
+            continue  # a request is using it right now
+        evict.append(other)
+        excess -= 1
+    for other in evict:
+        del _last_used[other]
+        _drop(_pending.pop(other, None))
+        _locks.pop(other, None)
+        next_question_stats["evicted"] += 1
+    _last_used[interview_id] = now
+
+
+def speculate(interview_id: int, after_number: int, make_question: Callable[[], Awaitable[dict]]):
+    """Start generating the question that follows question `after_number`"""
+    _touch(interview_id)
+    _drop(_pending.pop(interview_id, None))
+    _pending[interview_id] = (after_number, asyncio.create_task(make_question()))
+    next_question_stats["started"] += 1
+
+
+async def take(interview_id: int, after_number: int) -> Optional[dict]:
+    """The speculated question following `after_number`, or None if there is none usable"""
+    entry = _pending.pop(interview_id, None)
+    if entry is None:
+        return None
+    if entry[0] != after_number:
+        _drop(entry)
+        return None
+    task = entry[1]
+    ready = task.done()
+    try:
+        question = await task
+    except Exception as e:
+        print(f"Speculative question failed: {e}")
+        next_question_stats["failed"] += 1
+        return None
+    next_question_stats["served_ready" if ready else "served_waited"] += 1
+    return question
+
+
+def discard(interview_id: int):
+    """Interview over: drop any unserved speculation"""
+    _drop(_pending.pop(interview_id, None))
+    _locks.pop(interview_id, None)
+    _last_used.pop(interview_id, None)
+
+
+def lock(interview_id: int) -> asyncio.Lock:
+    """Serializes taking/persisting the next question of one interview"""
+    _touch(interview_id)
+    return _locks.setdefault(interview_id, asyncio.Lock())
@@ -0,0 +1,385 @@
+"""
+Durable resume-processing queue.
+
+apply_for_job stores the file and the Application, adds a ResumeJob row in
+the same transaction and returns. Workers claim due jobs from the
+resume_jobs table and run the stages in order:
+
+    extract  -> text of the uploaded file       (saved on the job)
+    score    -> LLM resume profile, scored against the job: ResumeExtraction row
+    review   -> auto-reject rules, HR notification
+
+Extracted text and the job-independent profile are cached per file content
+hash in resume_documents, so re-uploads of the same resume (another job, a
+re-application) only recompute the skill match against the new job.
+
+Each stage commits its output and advances `stage`, so a retry resumes
+where the previous attempt failed. A stage's output is committed only while
+the worker still holds the job's lease (renewed in the background during
+long stages), so a job reclaimed by another worker is never processed twice.
+Failures are retried with exponential
+backoff; the last attempt lets the resume parser fall back to regex and a
+job that still fails is marked 'failed', as is one whose file timed out or
+hit the memory limit during text extraction. A job whose worker died is
+reclaimed once its lease expires, so queued work survives restarts.
+
+Workers run inside the API process (RESUME_WORKERS) or standalone:
+
+    python -m app.services.resume_queue
+"""
+import asyncio
+import json
+import os
+import random
+import socket
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, or_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import Application, ResumeDocument, ResumeExtraction, ResumeJob, Notification
+from app.services.ai_service import parse_resume_profile, score_resume_profile, llm_priority, BATCH
+from app.services.resume_parser import text_extractor, ExtractionFailed, FAILED_TEXT
+
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "2"))
+RESUME_JOB_MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "5"))
+RESUME_JOB_BACKOFF_SECONDS = float(os.getenv("RESUME_JOB_BACKOFF_SECONDS", "5"))
+RESUME_JOB_MAX_BACKOFF_SECONDS = float(os.getenv("RESUME_JOB_MAX_BACKOFF_SECONDS", "600"))
+# A running job not heard from for this long is considered abandoned
+RESUME_JOB_LEASE_SECONDS = float(os.getenv("RESUME_JOB_LEASE_SECONDS", "600"))
+RESUME_JOB_POLL_SECONDS = float(os.getenv("RESUME_JOB_POLL_SECONDS", "5"))
+
+EXPERIENCE_LEVEL_RANKS = {
+    "intern": 0,
+    "junior": 1,
+    "mid": 2, "mid-level": 2,
+    "senior": 3,
+    "lead": 4, "manager": 4, "lead / manager": 4
+}
+
+resume_queue_stats = {"enqueued": 0, "completed": 0, "retried": 0, "failed": 0, "reclaimed": 0,
+                      "lease_lost": 0, "text_reused": 0, "profile_reused": 0}
+
+_wakeup: Optional[asyncio.Event] = None
+_workers = []
+
+
+def enqueue(db: Session, application: Application) -> ResumeJob:
+    """Add the processing job for a new application (committed with the caller's transaction)"""
+    job = ResumeJob(application=application, status="queued", stage="extract", next_run_at=datetime.utcnow())
+    db.add(job)
+    resume_queue_stats["enqueued"] += 1
+    return job
+
+
+def wake():
+    """Have an idle worker look for due jobs now instead of at the next poll"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def rejection_reasons(extraction_data: dict, job_level: Optional[str]) -> list:
+    """Auto-reject rules applied to a parsed resume"""
+    reasons = []
+
+    # 0. Check if it's a resume
+    if extraction_data.get("is_resume") is False:
+        reasons.append("uploaded document is not a resume")
+
+    # 1. Check for parsing failure
+    # Heuristic: If skills are empty or extracted text indicates failure
+    if not extraction_data.get("skills") and extraction_data.get("experience") == 0:
+        reasons.append("resume parsing failed")
+
+    # 2. Check for experience level mismatch
+    job_level_rank = EXPERIENCE_LEVEL_RANKS.get(job_level.lower().strip() if job_level else "", -1)
+    candidate_level_rank = EXPERIENCE_LEVEL_RANKS.get(str(extraction_data.get("experience_level", "")).lower().strip(), -1)
+
+    # If both levels are recognized, check if candidate is lower than required
+    if job_level_rank != -1 and candidate_level_rank != -1 and candidate_level_rank < job_level_rank:
+        reasons.append("experience level mismatch")
+    return reasons
+
+
+def _resume_document(db: Session, sha256: Optional[str]) -> Optional[ResumeDocument]:
+    """Cache row for a stored file, created on first use (None for files stored before hashing)"""
+    if not sha256:
+        return None
+    document = db.query(ResumeDocument).filter(ResumeDocument.sha256 == sha256).first()
+    if document is None:
+        # Own session: losing an insert race must not roll back this job's work
+        other = SessionLocal()
+        try:
+            other.add(ResumeDocument(sha256=sha256))
+            other.commit()
+        except IntegrityError:
+            other.rollback()
+        finally:
+            other.close()
+        document = db.query(ResumeDocument).filter(ResumeDocument.sha256 == sha256).first()
+    return document
+
+
+async def _extract(db: Session, resume_job: ResumeJob, application: Application):
+    document = _resume_document(db, application.resume_sha256)
+    if document is not None and document.resume_text:
+        resume_job.resume_text = document.resume_text
+        resume_queue_stats["text_reused"] += 1
+    else:
+        # Parsed in the extraction process pool, never on the event loop
+        resume_job.resume_text = await text_extractor.extract(application.resume_file_path, fallback=False)
+        if document is not None and resume_job.resume_text != FAILED_TEXT:
+            document.resume_text = resume_job.resume_text
+    resume_job.stage = "score"
+
+
+async def _score(db: Session, resume_job: ResumeJob, application: Application):
+    job = application.job
+    document = _resume_document(db, application.resume_sha256)
+    if document is not None and document.profile:
+        profile = json.loads(document.profile)
+        document.times_reused += 1
+        resume_queue_stats["profile_reused"] += 1
+    else:
+        last_attempt = resume_job.attempts >= RESUME_JOB_MAX_ATTEMPTS
+        with llm_priority(BATCH, job.hr_id):
+            profile = await parse_resume_profile(resume_job.resume_text, fallback=last_attempt)
+        # Regex fallbacks are not cached: the next upload of this file gets a real parse
+        if document is not None and profile.get("parsed_by") == "llm":
+            document.profile = json.dumps(profile)
+
+    # Only the match against this job's required skills is job-specific
+    extraction_data = score_resume_profile(profile, job.required_skills)
+
+    # application_id is unique: a re-run of this stage replaces the earlier row
+    db.query(ResumeExtraction).filter(ResumeExtraction.application_id == application.id).delete()
+    db.add(ResumeExtraction(
+        application_id=application.id,
+        extracted_text=extraction_data.get("summary", resume_job.resume_text[:200]),  # Store AI summary
+        extracted_skills=json.dumps(extraction_data.get("skills") or []),
+        years_of_experience=extraction_data.get("experience"),
+        education=json.dumps(extraction_data.get("education") or []),
+        previous_roles=json.dumps(extraction_data.get("roles") or []),
+        experience_level=extraction_data.get("experience_level"),
+        resume_score=extraction_data.get("score", 0),
+        skill_match_percentage=extraction_data.get("match_percentage", 0)
+    ))
+    resume_job.extraction_data = json.dumps(extraction_data)
+    resume_job.stage = "review"
+
+
+async def _review(db: Session, resume_job: ResumeJob, application: Application):
+    job = application.job
+    reasons = rejection_reasons(json.loads(resume_job.extraction_data), job.experience_level)
+
+    # HR may already have acted on the application while it was queued
+    if reasons and application.status == "submitted":
+        application.status = "rejected"
+        application.hr_notes = f"Auto-rejected based on: {', '.join(reasons)}"
+
+    candidate_name = application.candidate.full_name
+    message = f"{candidate_name} has applied for the {job.title} position."
+    if application.status == "rejected" and reasons:
+        message += f" (Auto-rejected: {', '.join(reasons)})"
+
+    db.add(Notification(
+        user_id=job.hr_id,
+        notification_type="new_application",
+        title=f"New Application: {candidate_name}",
+        message=message,
+        related_application_id=application.id
+    ))
+    resume_job.resume_text = None
+    resume_job.status = "completed"
+    resume_job.stage = "done"
+
+
+STAGES = {"extract": _extract, "score": _score, "review": _review}
+
+
+def _due(now: datetime):
+    lease_expired = now - timedelta(seconds=RESUME_JOB_LEASE_SECONDS)
+    return or_(
+        and_(ResumeJob.status == "queued", ResumeJob.next_run_at <= now),
+        and_(ResumeJob.status == "running", ResumeJob.locked_at < lease_expired)
+    )
+
+
+def _claim(db: Session, worker_id: str) -> Optional[int]:
+    """Atomically take one due job; safe with several workers and processes"""
+    now = datetime.utcnow()
+    candidates = db.query(ResumeJob.id, ResumeJob.status).filter(_due(now)).order_by(ResumeJob.next_run_at).limit(5).all()
+    for job_id, previous_status in candidates:
+        claimed = db.query(ResumeJob).filter(ResumeJob.id == job_id, _due(now)).update({
+            "status": "running",
+            "locked_by": worker_id,
+            "locked_at": now,
+            "attempts": ResumeJob.attempts + 1
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            if previous_status == "running":
+                resume_queue_stats["reclaimed"] += 1
+            return job_id
+    return None
+
+
+class LeaseLost(Exception):
+    """The job was reclaimed by another worker; this worker must not write its results"""
+
+
+def _renew_lease(db: Session, job_id: int, worker_id: str) -> bool:
+    """Extend the lease if this worker still holds it (in the caller's transaction)"""
+    return db.query(ResumeJob).filter(
+        ResumeJob.id == job_id, ResumeJob.locked_by == worker_id, ResumeJob.status == "running"
+    ).update({"locked_at": datetime.utcnow()}, synchronize_session=False) == 1
+
+
+def _commit_owned(db: Session, job_id: int, worker_id: str):
+    """Commit the stage output together with a lease renewal, or roll back and raise LeaseLost"""
+    if not _renew_lease(db, job_id, worker_id):
+        db.rollback()
+        raise LeaseLost()
+    db.commit()
+
+
+async def _heartbeat(job_id: int, worker_id: str):
+    """Keep the lease while a stage runs (e.g. an LLM call queued behind interactive traffic)"""
+    while True:
+        await asyncio.sleep(RESUME_JOB_LEASE_SECONDS / 3)
+        db = SessionLocal()
+        try:
+            renewed = _renew_lease(db, job_id, worker_id)
+            db.commit()
+        except Exception as e:
+            print(f"Resume job lease renewal error: {e}")
+            continue
+        finally:
+            db.close()
+        if not renewed:
+            return
+
+
+def _backoff(attempts: int) -> float:
+    delay = min(RESUME_JOB_MAX_BACKOFF_SECONDS, RESUME_JOB_BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def process_job(job_id: int, worker_id: str):
+    """Run the remaining stages of a claimed job"""
+    db = SessionLocal()
+    try:
+        resume_job = db.query(ResumeJob).filter(ResumeJob.id == job_id).first()
+        if resume_job is None or resume_job.locked_by != worker_id:
+            return
+        if resume_job.attempts > RESUME_JOB_MAX_ATTEMPTS:
+            # Reclaimed after its last attempt's worker died
+            resume_job.status = "failed"
+            resume_job.last_error = "Lease expired on the final attempt"
+            resume_queue_stats["failed"] += 1
+            db.commit()
+            return
+        heartbeat = asyncio.create_task(_heartbeat(job_id, worker_id))
+        try:
+            while resume_job.stage in STAGES:
+                await STAGES[resume_job.stage](db, resume_job, resume_job.application)
+                _commit_owned(db, job_id, worker_id)
+            resume_queue_stats["completed"] += 1
+        except LeaseLost:
+            print(f"Resume job {job_id} was reclaimed by another worker; discarding this attempt")
+            resume_queue_stats["lease_lost"] += 1
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without charging the attempt
+            db.rollback()
+            db.query(ResumeJob).filter(ResumeJob.id == job_id, ResumeJob.locked_by == worker_id).update({
+                "status": "queued",
+                "locked_by": None,
+                "attempts": ResumeJob.attempts - 1
+            }, synchronize_session=False)
+            db.commit()
+            raise
+        except Exception as e:
+            db.rollback()
+            resume_job = db.query(ResumeJob).filter(ResumeJob.id == job_id).first()
+            if resume_job is None:
+                return  # application withdrawn while processing
+            print(f"Resume processing error (application {resume_job.application_id}, "
+                  f"stage {resume_job.stage}, attempt {resume_job.attempts}): {e}")
+            update = {"last_error": str(e)[:1000], "locked_by": None}
+            # A file that timed out or hit the memory limit would do so again
+            permanent = isinstance(e, ExtractionFailed) and not e.retryable
+            if permanent or resume_job.attempts >= RESUME_JOB_MAX_ATTEMPTS:
+                update["status"] = "failed"
+                outcome = "failed"
+            else:
+                update["status"] = "queued"
+                update["next_run_at"] = datetime.utcnow() + timedelta(seconds=_backoff(resume_job.attempts))
+                outcome = "retried"
+            # Only if still ours: a reclaimed job belongs to the other worker now
+            owned = db.query(ResumeJob).filter(
+                ResumeJob.id == job_id, ResumeJob.locked_by == worker_id
+            ).update(update, synchronize_session=False)
+            db.commit()
+            resume_queue_stats[outcome if owned else "lease_lost"] += 1
+        finally:
+            heartbeat.cancel()
+    finally:
+        db.close()
+
+
+async def _worker(worker_id: str):
+    while True:
+        _wakeup.clear()
+        try:
+            db = SessionLocal()
+            try:
+                job_id = _claim(db, worker_id)
+            finally:
+                db.close()
+            if job_id is not None:
+                await process_job(job_id, worker_id)
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Resume worker error: {e}")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=RESUME_JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_workers(count: int = RESUME_WORKERS):
+    """Start `count` worker tasks on the running event loop"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    for i in range(count):
+        _workers.append(asyncio.create_task(_worker(f"{host}:{i}")))
+
+
+async def stop_workers():
+    """Cancel the workers; interrupted jobs go back to the queue at their current stage"""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def stats() -> dict:
+    db = SessionLocal()
+    try:
+        by_status = dict(db.query(ResumeJob.status, func.count(ResumeJob.id)).group_by(ResumeJob.status).all())
+    finally:
+        db.close()
+    return {"workers": len(_workers), "jobs": by_status, **resume_queue_stats}
+
+
+async def run_workers(count: int = max(1, RESUME_WORKERS)):
+    start_workers(count)
+    await asyncio.gather(*_workers)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_workers())
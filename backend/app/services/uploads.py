@@ -0,0 +1,66 @@
+"""
+Streaming, content-addressed storage of uploaded files.
+
+The upload is copied in fixed-size chunks to a temporary file next to its
+destination, hashed as it goes, and renamed to `<sha256>.<ext>` only once it
+is complete, so memory use per upload is constant and a partial or oversized
+file never appears under its final name. Identical files map to the same
+name and are stored once.
+"""
+import hashlib
+import os
+import re
+import uuid
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+upload_stats = {"stored": 0, "deduplicated": 0, "too_large": 0}
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded the size limit; nothing was stored"""
+
+
+async def store_upload(upload: UploadFile, directory: str, extension: str, max_size: int):
+    """
+    Stream `upload` into `directory` as `<sha256>.<extension>`; returns
+    (path, sha256 hex digest, size). An identical file already stored is
+    reused. Raises UploadTooLarge as soon as more than `max_size` bytes are read.
+    """
+    # Size is known once the multipart body is parsed: reject without copying
+    if upload.size is not None and upload.size > max_size:
+        upload_stats["too_large"] += 1
+        raise UploadTooLarge()
+
+    extension = re.sub(r"[^a-z0-9]", "", extension.lower())[:10] or "bin"
+    temp_path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    upload_stats["too_large"] += 1
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                await f.write(chunk)
+
+        sha256 = digest.hexdigest()
+        final_path = os.path.join(directory, f"{sha256}.{extension}").replace("\\", "/")
+        if await aiofiles.os.path.exists(final_path):
+            await aiofiles.os.remove(temp_path)
+            upload_stats["deduplicated"] += 1
+        else:
+            await aiofiles.os.replace(temp_path, final_path)
+            upload_stats["stored"] += 1
+    except BaseException:
+        try:
+            await aiofiles.os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return final_path, sha256, size
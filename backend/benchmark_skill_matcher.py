@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark of the skill-keyword matcher against the previous nested
+substring scans (kept below as reference implementations).
+
+    python benchmark_skill_matcher.py --repeat 2000
+
+For each input size it prints the per-call time of skill extraction,
+category mapping of a skill list and the fallback intro analysis
+(skills + category counts), old vs new, and the keywords only the old
+substring scan reported (its false positives, e.g. "UI" inside "building").
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from interview_process.config import SKILL_CATEGORIES  # noqa: E402
+from interview_process.skill_matcher import skill_matcher  # noqa: E402
+from interview_process.utils import extract_skills  # noqa: E402
+from interview_process.skill_mapper import map_skills_to_category  # noqa: E402
+
+
+def legacy_extract_skills(text):
+    found_skills = []
+    text_lower = text.lower()
+    for category, keywords in SKILL_CATEGORIES.items():
+        for keyword in keywords:
+            if keyword.lower() in text_lower:
+                found_skills.append(keyword)
+    unique_skills, seen = [], set()
+    for skill in found_skills:
+        skill_clean = skill.strip()
+        if skill_clean.lower() not in seen:
+            seen.add(skill_clean.lower())
+            unique_skills.append(skill_clean)
+    return unique_skills
+
+
+def legacy_category_counts(skills):
+    scores = {cat: 0 for cat in SKILL_CATEGORIES}
+    for skill in skills:
+        s = skill.lower()
+        for cat, keywords in SKILL_CATEGORIES.items():
+            for k in keywords:
+                if k.lower() in s:
+                    scores[cat] += 1
+    return scores
+
+
+def legacy_map_skills_to_category(skills):
+    scores = legacy_category_counts(skills)
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else "backend"
+
+
+def legacy_fallback_analysis(text):
+    skills = legacy_extract_skills(text)
+    return skills, legacy_category_counts(skills)
+
+
+INTRO = ("Hi, I'm a backend engineer with five years of experience. I have built good REST APIs in Python "
+         "and Go, deployed them with Docker and Kubernetes on AWS, and designed CI/CD pipelines. Recently I "
+         "have been going deeper into data engineering with SQL and some machine learning. I enjoy building "
+         "reliable systems and I have worked in teams using agile processes. ")
+FILLER = ("Responsible for maintaining services, reviewing code, mentoring juniors and improving the "
+          "onboarding guide for the team; collaborated with product and design on quarterly goals. ")
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "React", "Good communication", "Agile"]
+
+INPUTS = {
+    "intro (~70 words)": INTRO,
+    "resume (~800 words)": INTRO + FILLER * 28,
+    "long doc (~5000 words)": INTRO + FILLER * 190,
+}
+
+
+def per_call_us(fn, arg, repeat):
+    return min(timeit.repeat(lambda: fn(arg), number=repeat, repeat=3)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{len(skill_matcher.keywords)} keywords, {len(skill_matcher._goto)} automaton states\n")
+    print(f"{'input':24} {'operation':18} {'old us':>10} {'new us':>10} {'speedup':>8}")
+    for name, text in INPUTS.items():
+        rows = [
+            ("extract_skills", legacy_extract_skills, extract_skills, text),
+            ("fallback_analysis", legacy_fallback_analysis, skill_matcher.match, text),
+        ]
+        for operation, old, new, arg in rows:
+            old_us, new_us = per_call_us(old, arg, args.repeat), per_call_us(new, arg, args.repeat)
+            print(f"{name:24} {operation:18} {old_us:10.1f} {new_us:10.1f} {old_us / new_us:7.1f}x")
+    old_us = per_call_us(legacy_map_skills_to_category, SKILLS, args.repeat * 10)
+    new_us = per_call_us(map_skills_to_category, SKILLS, args.repeat * 10)
+    print(f"{'skill list (8)':24} {'map_to_category':18} {old_us:10.1f} {new_us:10.1f} {old_us / new_us:7.1f}x")
+
+    old_only = sorted(set(legacy_extract_skills(INTRO)) - set(extract_skills(INTRO)))
+    new_only = sorted(set(extract_skills(INTRO)) - set(legacy_extract_skills(INTRO)))
+    print(f"\nOnly the substring scan (false positives): {old_only}")
+    print(f"Only the matcher: {new_only}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import asyncio
+import difflib
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from .config import (
+    LLM_CASSETTE_MODE,
+    LLM_CASSETTE_PATH,
+    LLM_CASSETTE_LATENCY,
+    LLM_CASSETTE_MATCH,
+    LLM_CASSETTE_SEED,
+)
+
+
+class LatencyModel:
+    """
+    Synthetic response latency for replayed requests.
+
+    Specs: "recorded" (the latency seen while recording), "none",
+    "fixed:0.4", "uniform:0.2,1.5", "normal:0.8,0.2" (mean, std) or
+    "lognormal:0.8,0.5" (median, sigma). Sampling is seeded, so a replay
+    run is repeatable.
+    """
+
+    def __init__(self, spec: str = "recorded", seed: Optional[int] = None):
+        self.spec = spec
+        self.kind, _, args = spec.partition(":")
+        self.args = [float(a) for a in args.split(",") if a.strip()]
+        self.rng = random.Random(seed)
+        if self.kind not in ("recorded", "none", "fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown cassette latency '{spec}'")
+
+    def sample(self, recorded: float) -> float:
+        if self.kind == "recorded":
+            return recorded
+        if self.kind == "none":
+            return 0.0
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(self.args[0], self.args[1])
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(self.args[0], self.args[1]))
+        return self.args[0] * self.rng.lognormvariate(0.0, self.args[1])
+
+
+def request_key(body: dict) -> str:
+    """What identifies a chat request on replay: the conversation and output format, not the model"""
+    material = {
+        "messages": body.get("messages"),
+        "response_format": body.get("response_format"),
+        "stream": bool(body.get("stream")),
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+def _user_text(body: dict) -> str:
+    return "\n".join(str(m.get("content", "")) for m in body.get("messages") or [])
+
+
+class _PacedStream(httpx.AsyncByteStream):
+    """Replays a recorded SSE body event by event, spreading the latency across events"""
+
+    def __init__(self, body: bytes, latency: float):
+        self.events = [e + b"\n\n" for e in body.split(b"\n\n") if e.strip()]
+        self.delay = latency / max(1, len(self.events))
+
+    async def __aiter__(self):
+        for event in self.events:
+            await asyncio.sleep(self.delay)
+            yield event
+
+
+class Cassette:
+    """
+    Recorded chat-completion exchanges in a JSONL file.
+
+    Identical requests may be recorded several times (sampling at high
+    temperature); replay cycles through them in recorded order. With
+    match="fuzzy" a request that was never recorded is answered with the
+    most similar recorded one (same output format), which keeps replays
+    working when prompts contain random parts such as a focus area.
+    """
+
+    def __init__(self, path: str = LLM_CASSETTE_PATH, match: str = LLM_CASSETTE_MATCH):
+        self.path = path
+        self.match = match
+        self._lock = threading.Lock()
+        self.entries: Dict[str, List[Dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        self.counters = {"recorded": 0, "replayed": 0, "fuzzy_matches": 0, "misses": 0}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["key"], []).append(entry)
+
+    def record(self, body: dict, status: int, content_type: str, response: bytes, latency: float):
+        entry = {
+            "key": request_key(body),
+            "request": {k: body.get(k) for k in ("model", "messages", "temperature", "max_tokens", "response_format", "stream")},
+            "status": status,
+            "content_type": content_type,
+            "body": response.decode("utf-8", errors="replace"),
+            "latency": round(latency, 4),
+        }
+        with self._lock:
+            self.entries.setdefault(entry["key"], []).append(entry)
+            self.counters["recorded"] += 1
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def lookup(self, body: dict) -> Optional[Dict]:
+        key = request_key(body)
+        with self._lock:
+            candidates = self.entries.get(key)
+            if not candidates and self.match == "fuzzy":
+                candidates = self._nearest(body)
+                if candidates:
+                    self.counters["fuzzy_matches"] += 1
+            if not candidates:
+                self.counters["misses"] += 1
+                return None
+            slot = candidates[0]["key"]
+            index = self._cursor.get(slot, 0)
+            self._cursor[slot] = index + 1
+            self.counters["replayed"] += 1
+            return candidates[index % len(candidates)]
+
+    def _nearest(self, body: dict) -> Optional[List[Dict]]:
+        text = _user_text(body)
+        same_shape = [
+            group for group in self.entries.values()
+            if group[0]["request"].get("response_format") == body.get("response_format")
+            and bool(group[0]["request"].get("stream")) == bool(body.get("stream"))
+        ]
+        if not same_shape:
+            return None
+        return max(same_shape, key=lambda g: difflib.SequenceMatcher(None, text, _user_text(g[0]["request"])).ratio())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": LLM_CASSETTE_MODE,
+                "path": self.path,
+                "match": self.match,
+                "recorded_requests": len(self.entries),
+                "recorded_responses": sum(len(g) for g in self.entries.values()),
+                **self.counters,
+            }
+
+
+def _plain_headers(response: httpx.Response) -> List:
+    """Headers for a response rebuilt from its already-decoded body"""
+    return [(k, v) for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+
+
+def _miss_response(request: httpx.Request) -> httpx.Response:
+    # 400 (not a connection error) so the router does not treat a miss as a provider outage
+    return httpx.Response(
+        400,
+        json={"error": {"message": "No cassette recording for this request", "type": "cassette_miss"}},
+        request=request,
+    )
+
+
+class CassetteTransport(httpx.AsyncBaseTransport, httpx.BaseTransport):
+    """
+    httpx transport for the shared LLM clients.
+
+    mode="record" forwards every request to `inner` and appends the
+    exchange to the cassette; mode="replay" answers chat completions from
+    the cassette only (no network), after a latency drawn from `latency`.
+    Anything that is not a chat completion is passed through in record
+    mode and rejected in replay mode.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str, latency: LatencyModel,
+                 inner: Optional[httpx.AsyncBaseTransport] = None,
+                 sync_inner: Optional[httpx.BaseTransport] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.inner = inner
+        self.sync_inner = sync_inner
+
+    @staticmethod
+    def _chat_body(request: httpx.Request) -> Optional[dict]:
+        if request.method != "POST" or not request.url.path.endswith("/chat/completions"):
+            return None
+        try:
+            return json.loads(request.content or b"{}")
+        except ValueError:
+            return None
+
+    def _replayed(self, request: httpx.Request, entry: Dict, stream: Optional[httpx.AsyncByteStream] = None) -> httpx.Response:
+        headers = {"content-type": entry["content_type"]}
+        if stream is not None:
+            return httpx.Response(entry["status"], headers=headers, stream=stream, request=request)
+        return httpx.Response(entry["status"], headers=headers, content=entry["body"].encode("utf-8"), request=request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = self._chat_body(request)
+        if self.mode == "replay":
+            entry = self.cassette.lookup(body) if body is not None else None
+            if entry is None:
+                return _miss_response(request)
+            delay = self.latency.sample(entry["latency"])
+            if entry["request"].get("stream"):
+                return self._replayed(request, entry, _PacedStream(entry["body"].encode("utf-8"), delay))
+            await asyncio.sleep(delay)
+            return self._replayed(request, entry)
+
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        if body is None:
+            return response
+        content = await response.aread()
+        await response.aclose()
+        self.cassette.record(body, response.status_code, response.headers.get("content-type", "application/json"),
+                             content, time.monotonic() - started)
+        return httpx.Response(response.status_code, headers=_plain_headers(response), content=content, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = self._chat_body(request)
+        if self.mode == "replay":
+            entry = self.cassette.lookup(body) if body is not None else None
+            if entry is None:
+                return _miss_response(request)
+            time.sleep(self.latency.sample(entry["latency"]))
+            return self._replayed(request, entry)
+
+        started = time.monotonic()
+        response = self.sync_inner.handle_request(request)
+        if body is None:
+            return response
+        content = response.read()
+        response.close()
+        self.cassette.record(body, response.status_code, response.headers.get("content-type", "application/json"),
+                             content, time.monotonic() - started)
+        return httpx.Response(response.status_code, headers=_plain_headers(response), content=content, request=request)
+
+    async def aclose(self):
+        if self.inner is not None:
+            await self.inner.aclose()
+
+    def close(self):
+        if self.sync_inner is not None:
+            self.sync_inner.close()
+
+
+def cassette_from_config() -> Optional[Cassette]:
+    """The process-wide cassette, or None when LLM_CASSETTE_MODE is off"""
+    if LLM_CASSETTE_MODE == "off":
+        return None
+    return Cassette(LLM_CASSETTE_PATH, LLM_CASSETTE_MATCH)
+
+
+cassette = cassette_from_config()
+latency_model = LatencyModel(LLM_CASSETTE_LATENCY, LLM_CASSETTE_SEED)
@@ -0,0 +1,90 @@
+from typing import Dict
+
+import openai
+
+from .config import LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RECOVERY_TIMEOUT
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-provider breaker over outage-type failures (timeouts, connection
+    errors, 5xx); 429s and auth errors are per-key and handled by the router.
+
+    CLOSED -> OPEN after `failure_threshold` consecutive failures. Once
+    `recovery_timeout` has passed one probe request is let through
+    (HALF_OPEN); its success closes the breaker, its failure re-opens it.
+    Not thread-safe on its own: LLMRouter calls it under its lock.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = LLM_BREAKER_RECOVERY_TIMEOUT,
+    ):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    def ready(self, now: float) -> bool:
+        """Whether a request may be sent now (does not change state)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now - self.opened_at >= self.recovery_timeout
+        # HALF_OPEN: one probe at a time; a probe that never reported back expires
+        return now - self.probe_started >= self.recovery_timeout
+
+    def on_dispatch(self, now: float):
+        if self.state != CLOSED:
+            self.state = HALF_OPEN
+            self.probe_started = now
+
+    def on_cancel(self):
+        if self.state == HALF_OPEN:
+            self.probe_started = 0.0  # let the next request probe
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            print(f"Circuit for {self.provider} closed")
+        self.state = CLOSED
+
+    def record_failure(self, now: float):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            if self.state == CLOSED:
+                self.times_opened += 1
+            print(f"Circuit for {self.provider} open ({self.consecutive_failures} consecutive failures)")
+            self.state = OPEN
+            self.opened_at = now
+
+    def stats(self, now: float) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+            "retry_in": round(max(0.0, self.opened_at + self.recovery_timeout - now), 1) if self.state == OPEN else 0.0,
+        }
+
+
+def is_outage(error: Exception) -> bool:
+    """Failures that say the provider itself is unhealthy"""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
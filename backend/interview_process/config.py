@@ -7,10 +7,193 @@ OPENROUTER_API_KEY = os.getenv("GROQ_API_KEY")
 OPENROUTER_BASE_URL = "https://api.groq.com/openai/v1"
 MODEL_NAME = "llama-3.3-70b-versatile"
 
+# OpenAI-compatible providers (None = SDK default base URL)
+PROVIDER_BASE_URLS = {
+    "groq": "https://api.groq.com/openai/v1",
+    "openai": None,
+    "deepseek": "https://api.deepseek.com",
+    "gemini": "https://generativelanguage.googleapis.com/v1beta/openai/",
+}
+
+# Default chat model per provider
+PROVIDER_MODELS = {
+    "groq": MODEL_NAME,
+    "openai": "gpt-4o",
+    "deepseek": "deepseek-chat",
+    "gemini": "gemini-2.0-flash",
+}
+
+# Chat model per provider and size tier; call sites pick a tier via LLM_TASK_ROUTES
+PROVIDER_MODEL_TIERS = {
+    "groq": {"small": os.getenv("GROQ_SMALL_MODEL", "llama-3.1-8b-instant"), "large": MODEL_NAME},
+    "openai": {"small": os.getenv("OPENAI_SMALL_MODEL", "gpt-4o-mini"), "large": "gpt-4o"},
+    "deepseek": {"small": "deepseek-chat", "large": "deepseek-chat"},
+    "gemini": {"small": os.getenv("GEMINI_SMALL_MODEL", "gemini-2.0-flash-lite"), "large": "gemini-2.0-flash"},
+}
+
+# Task routing per call site: model tier, p95 latency SLO (seconds) and the
+# largest acceptable share of malformed structured output. A small-tier task
+# that breaks its quality SLO is served by the large tier for
+# LLM_TASK_ESCALATION_SECONDS. Override a tier with e.g. LLM_TASK_TIER_RESUME_PARSE=large
+LLM_TASK_ROUTES = {
+    site: {**route, "tier": os.getenv(f"LLM_TASK_TIER_{site.upper()}", route["tier"])}
+    for site, route in {
+        "intro_analysis": {"tier": "small", "latency_slo": 2.0, "max_failure_rate": 0.05},
+        "resume_parse": {"tier": "small", "latency_slo": 4.0, "max_failure_rate": 0.05},
+        "answer_evaluation": {"tier": "small", "latency_slo": 3.0, "max_failure_rate": 0.05},
+        "answer_evaluation_batch": {"tier": "small", "latency_slo": 8.0, "max_failure_rate": 0.05},
+        "skill_questions": {"tier": "small", "latency_slo": 3.0, "max_failure_rate": 0.05},
+        "interview_summary": {"tier": "small", "latency_slo": 3.0, "max_failure_rate": 0.05},
+        "next_question": {"tier": "small", "latency_slo": 2.0, "max_failure_rate": 0.05},
+        "interview_report": {"tier": "large", "latency_slo": 10.0, "max_failure_rate": 0.02},
+        "interview_assessment": {"tier": "large", "latency_slo": 15.0, "max_failure_rate": 0.02},
+        "default": {"tier": "large", "latency_slo": 5.0, "max_failure_rate": 0.05},
+    }.items()
+}
+LLM_TASK_SLO_WINDOW = int(os.getenv("LLM_TASK_SLO_WINDOW", "100"))
+LLM_TASK_SLO_MIN_SAMPLES = int(os.getenv("LLM_TASK_SLO_MIN_SAMPLES", "20"))
+LLM_TASK_ESCALATION_SECONDS = float(os.getenv("LLM_TASK_ESCALATION_SECONDS", "300"))
+
+def _csv_env(name: str) -> list:
+    return [k.strip() for k in os.getenv(name, "").split(",") if k.strip()]
+
+# Comma-separated key lists; every key becomes a routable endpoint
+LLM_PROVIDER_KEYS = {
+    "groq": _csv_env("GROQ_API_KEY"),
+    "openai": _csv_env("OPENAI_API_KEY"),
+    "deepseek": _csv_env("DEEPSEEK_API_KEY"),
+    "gemini": _csv_env("GEMINI_API_KEY"),
+}
+
+# Router tuning: relative cost bias per provider (lower is preferred),
+# cooldowns after rate limiting / auth failures, attempts per request
+LLM_PROVIDER_PREFERENCE = {"groq": 1.0, "deepseek": 1.2, "gemini": 1.2, "openai": 1.5}
+LLM_RATE_LIMIT_COOLDOWN = float(os.getenv("LLM_RATE_LIMIT_COOLDOWN", "30"))
+LLM_AUTH_ERROR_COOLDOWN = float(os.getenv("LLM_AUTH_ERROR_COOLDOWN", "600"))
+LLM_ROUTER_MAX_ATTEMPTS = int(os.getenv("LLM_ROUTER_MAX_ATTEMPTS", "3"))
+LLM_ROUTER_MAX_COOLDOWN_WAIT = float(os.getenv("LLM_ROUTER_MAX_COOLDOWN_WAIT", "10"))
+
+# Per-key outbound limits (requests / tokens per minute) and the AIMD
+# concurrency window that shrinks on 429s/timeouts and grows on success
+LLM_RPM_LIMITS = {
+    "groq": int(os.getenv("GROQ_RPM", "30")),
+    "openai": int(os.getenv("OPENAI_RPM", "500")),
+    "deepseek": int(os.getenv("DEEPSEEK_RPM", "300")),
+    "gemini": int(os.getenv("GEMINI_RPM", "60")),
+}
+LLM_TPM_LIMITS = {
+    "groq": int(os.getenv("GROQ_TPM", "12000")),
+    "openai": int(os.getenv("OPENAI_TPM", "30000")),
+    "deepseek": int(os.getenv("DEEPSEEK_TPM", "60000")),
+    "gemini": int(os.getenv("GEMINI_TPM", "60000")),
+}
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))
+
+# Opt-in micro-batching of answer evaluations: evaluations arriving within
+# the window (or until max items are waiting) share one LLM call
+LLM_EVAL_BATCHING = os.getenv("LLM_EVAL_BATCHING", "false").lower() == "true"
+LLM_EVAL_BATCH_WINDOW_MS = int(os.getenv("LLM_EVAL_BATCH_WINDOW_MS", "50"))
+LLM_EVAL_BATCH_MAX = int(os.getenv("LLM_EVAL_BATCH_MAX", "8"))
+
+# Per-provider circuit breaker: open after this many consecutive outage
+# failures, probe again after the recovery timeout (seconds)
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RECOVERY_TIMEOUT = float(os.getenv("LLM_BREAKER_RECOVERY_TIMEOUT", "30"))
+
+# Hedged requests: if the primary provider has not answered within this
+# percentile of its recent latency, send the request to another provider too.
+# Hedges are capped at LLM_HEDGE_BUDGET of eligible requests.
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Share of LLM capacity reserved for each scheduler priority class
+LLM_SCHEDULER_SHARES = {
+    "interactive": float(os.getenv("LLM_SHARE_INTERACTIVE", "0.5")),
+    "near_real_time": float(os.getenv("LLM_SHARE_NEAR_REAL_TIME", "0.3")),
+    "batch": float(os.getenv("LLM_SHARE_BATCH", "0.2")),
+}
+
+# Shared HTTP connection pool for LLM clients
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+# LLM response cache (memory LRU + SQLite disk tier)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024"))
+LLM_CACHE_DISK_ENTRIES = int(os.getenv("LLM_CACHE_DISK_ENTRIES", "50000"))
+
+# Record/replay of LLM HTTP exchanges for offline benchmarks: LLM_CASSETTE_MODE
+# off | record | replay. Replay latency: recorded | none | fixed:S | uniform:A,B |
+# normal:MEAN,STD | lognormal:MEDIAN,SIGMA. LLM_CASSETTE_MATCH=fuzzy answers
+# unrecorded prompts with the most similar recorded one.
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.jsonl")
+LLM_CASSETTE_LATENCY = os.getenv("LLM_CASSETTE_LATENCY", "recorded")
+LLM_CASSETTE_MATCH = os.getenv("LLM_CASSETTE_MATCH", "exact")
+LLM_CASSETTE_SEED = int(os.getenv("LLM_CASSETTE_SEED", "0"))
+
+# Resume text extraction runs in a process pool (0 workers = one per core);
+# each file gets a time budget, a page cap and a per-worker address-space limit
+TEXT_EXTRACTION_WORKERS = int(os.getenv("TEXT_EXTRACTION_WORKERS", "0")) or os.cpu_count() or 1
+TEXT_EXTRACTION_TIMEOUT = float(os.getenv("TEXT_EXTRACTION_TIMEOUT", "20"))
+TEXT_EXTRACTION_MAX_PAGES = int(os.getenv("TEXT_EXTRACTION_MAX_PAGES", "30"))
+TEXT_EXTRACTION_MAX_CHARS = int(os.getenv("TEXT_EXTRACTION_MAX_CHARS", "200000"))
+TEXT_EXTRACTION_MEMORY_MB = int(os.getenv("TEXT_EXTRACTION_MEMORY_MB", "1024"))
+
+# Local answer scorer (train with train_local_scorer.py); answers whose
+# predicted score has a standard error above LOCAL_SCORER_MAX_STDERR go to the LLM
+LOCAL_SCORER_ENABLED = os.getenv("LOCAL_SCORER_ENABLED", "true").lower() == "true"
+LOCAL_SCORER_PATH = os.getenv("LOCAL_SCORER_PATH", "local_scorer.npz")
+LOCAL_SCORER_MAX_STDERR = float(os.getenv("LOCAL_SCORER_MAX_STDERR", "0.75"))
+LOCAL_SCORER_AUDIT_RATE = float(os.getenv("LOCAL_SCORER_AUDIT_RATE", "0.05"))
+LOCAL_SCORER_MIN_SAMPLES = int(os.getenv("LOCAL_SCORER_MIN_SAMPLES", "50"))
+
+# Prompt token budget per call site (user prompt, estimated locally);
+# override with e.g. PROMPT_BUDGET_RESUME_PARSE=2000
+PROMPT_TOKEN_BUDGETS = {
+    site: int(os.getenv(f"PROMPT_BUDGET_{site.upper()}", str(default)))
+    for site, default in {
+        "resume_parse": 1500,
+        "intro_analysis": 600,
+        "answer_evaluation": 1200,
+        "answer_evaluation_batch": 6000,
+        "interview_report": 2500,
+        "interview_assessment": 6000,
+        "interview_summary": 800,
+        "next_question": 800,
+        "default": 2000,
+    }.items()
+}
+
+# Cache TTL (seconds) per call site; 0 disables caching for that site
+LLM_CACHE_TTLS = {
+    "resume_parse": 7 * 24 * 3600,
+    "intro_analysis": 24 * 3600,
+    "answer_evaluation": 24 * 3600,
+    "answer_evaluation_batch": 24 * 3600,
+    "interview_report": 24 * 3600,
+    "interview_assessment": 24 * 3600,
+    "skill_questions": 0,  # deliberately random prompts
+    "default": 3600,
+}
+
 # Interview settings
 MAX_QUESTIONS = 7
 MIN_QUESTIONS = 3
 QUESTION_DIFFICULTY_LEVELS = ["basic", "intermediate", "advanced", "scenario-based"]
+QUESTION_FOCUS_AREAS = [
+    "performance and optimization",
+    "security and best practices",
+    "architecture and design",
+    "debugging and troubleshooting",
+    "modern features and updates"
+]
 
 # Skill categories
 SKILL_CATEGORIES = {
@@ -0,0 +1,79 @@
+import threading
+from typing import Dict, List, Optional
+
+from .config import (
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_BUDGET,
+    LLM_HEDGE_MIN_SAMPLES,
+)
+from .llm_router import llm_router
+
+
+class HedgePolicy:
+    """
+    When to send a backup request to a second provider, and how often.
+
+    The hedge delay is the primary provider's recent latency percentile; no
+    hedge is sent until that provider has enough samples. Hedges are limited
+    to `budget` (a fraction) of the requests that were eligible for one.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = LLM_HEDGE_ENABLED,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        budget: float = LLM_HEDGE_BUDGET,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.counters = {
+            "eligible": 0,
+            "hedged": 0,
+            "budget_denied": 0,
+            "primary_won": 0,
+            "hedge_won": 0,
+            "both_failed": 0,
+        }
+
+    def secondary_providers(self, primary: str, providers: Optional[List[str]] = None) -> List[str]:
+        allowed = set(providers) if providers else None
+        return [p for p in llm_router.providers(available_only=True) if p != primary and (allowed is None or p in allowed)]
+
+    def delay(self, provider: str) -> Optional[float]:
+        return llm_router.latency_percentile(provider, self.percentile, self.min_samples)
+
+    def record_eligible(self):
+        with self._lock:
+            self.counters["eligible"] += 1
+
+    def try_spend(self) -> bool:
+        """Reserve one hedge if the budget allows it"""
+        with self._lock:
+            if self.counters["hedged"] + 1 > self.budget * self.counters["eligible"]:
+                self.counters["budget_denied"] += 1
+                return False
+            self.counters["hedged"] += 1
+            return True
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.counters[outcome] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            "budget": self.budget,
+            "hedge_rate": round(counters["hedged"] / counters["eligible"], 3) if counters["eligible"] else 0.0,
+            **counters,
+        }
+
+
+hedge_policy = HedgePolicy()
@@ -3,9 +3,9 @@ from typing import Dict, List
 from .utils import format_response, calculate_performance_score, calculate_detailed_score, get_performance_feedback
 from .question_generator import QuestionGenerator
 from .response_analyzer import ResponseAnalyzer
+from .prompt_builder import PromptBuilder
 from .config import MAX_QUESTIONS, MIN_QUESTIONS
-import openai
-from .config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL
+from .llm_client import chat_completion, run_blocking
 
 class InterviewManager: 
     def __init__(self):
@@ -303,40 +303,41 @@ class InterviewManager:
     def _generate_ai_summary(self) -> str:
         """Generate AI summary of candidate performance"""
         try:
-            # Prepare conversation history
-            history_text = ""
+            # Prepare conversation history (trimmed to the call site's token budget)
+            history = []
             for i, response in enumerate(self.interview_data.get("responses", [])):
                 if i == 0:
                     continue
-                history_text += f"Q{i}: {response.get('question', '')}\n"
-                history_text += f"A{i}: {response.get('answer', '')[:100]}...\n"
+                history.append(f"Q{i}: {response.get('question', '')}\nA{i}: {response.get('answer', '')}")
             
-            prompt = f"""
+            prompt = PromptBuilder("interview_summary").fixed(
+                "skills", self.interview_data['candidate_info'].get('skills', [])[:5]
+            ).fixed(
+                "experience", self.interview_data['candidate_info'].get('experience', 'mid')
+            ).add("history", history, priority=1).render("""
             Analyze this interview performance and provide a brief, professional summary.
             
             Candidate Background:
-            Skills: {self.interview_data['candidate_info'].get('skills', [])[:5]}
-            Experience: {self.interview_data['candidate_info'].get('experience', 'mid')}
+            Skills: {skills}
+            Experience: {experience}
             
             Interview Summary:
-            {history_text}
+            {history}
             
             Provide a 2-3 sentence summary highlighting key strengths and areas for improvement.
-            """
+            """)
             
-            openai.api_key = OPENROUTER_API_KEY
-            openai.api_base = OPENROUTER_BASE_URL
-            response = openai.ChatCompletion.create(
-                model="xiaomi/mimo-v2-flash:free",
-                messages=[
+            summary = run_blocking(chat_completion(
+                [
                     {"role": "system", "content": "You are an HR analyst providing interview feedback."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.5,
-                max_tokens=150
-            )
+                max_tokens=150,
+                call_site="interview_summary"
+            ))
             
-            return response.choices[0].message.content.strip()
+            return summary.strip()
             
         except Exception as e:
             return "AI analysis unavailable. See detailed scores below."
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_DISK_ENTRIES,
+    LLM_CACHE_TTLS,
+)
+
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+    """Content address of a completion request"""
+    payload = json.dumps([model, system_prompt, user_prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM completions.
+
+    Lookups hit an in-memory LRU first, then a SQLite table that survives
+    restarts and is shared by every worker on the host. Entries carry an
+    absolute expiry; the disk tier is trimmed by last access once it grows
+    past its entry cap.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        disk_entries: int = LLM_CACHE_DISK_ENTRIES,
+        enabled: bool = LLM_CACHE_ENABLED,
+    ):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.enabled = enabled
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, call_site TEXT, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def _count(self, call_site: str, outcome: str):
+        site = self.counters.setdefault(call_site, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0})
+        site[outcome] += 1
+
+    def ttl_for(self, call_site: str) -> int:
+        return LLM_CACHE_TTLS.get(call_site, LLM_CACHE_TTLS["default"])
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        """Return a cached completion or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count(call_site, "memory_hits")
+                    return value
+                del self._memory[key]
+
+            try:
+                db = self._db()
+                row = db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    db.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                    db.commit()
+                    self._remember(key, row[0], row[1])
+                    self._count(call_site, "disk_hits")
+                    return row[0]
+            except sqlite3.Error as e:
+                print(f"LLM cache read error: {e}")
+
+            self._count(call_site, "misses")
+            return None
+
+    def set(self, key: str, value: str, call_site: str = "default", ttl: Optional[int] = None):
+        """Store a completion for ttl seconds (defaults to the call site's TTL)"""
+        ttl = self.ttl_for(call_site) if ttl is None else ttl
+        if ttl <= 0 or not value:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, call_site, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, call_site, expires_at, now)
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._prune(db, now)
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"LLM cache write error: {e}")
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self, db: sqlite3.Connection, now: float):
+        """Drop expired rows, then least recently used rows beyond the disk cap"""
+        db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.disk_entries,)
+        )
+
+    def record_bypass(self, call_site: str):
+        with self._lock:
+            self._count(call_site, "bypassed")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                self._db().execute("DELETE FROM llm_cache")
+                self._db().commit()
+            except sqlite3.Error as e:
+                print(f"LLM cache clear error: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_entries,
+                "call_sites": {site: dict(c) for site, c in self.counters.items()},
+            }
+
+
+llm_cache = LLMCache()
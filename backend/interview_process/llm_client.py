@@ -0,0 +1,510 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Type, TypeVar
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient
+
+from .config import (
+    PROVIDER_BASE_URLS,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_TIMEOUT,
+    LLM_ROUTER_MAX_ATTEMPTS,
+    LLM_ROUTER_MAX_COOLDOWN_WAIT,
+    LLM_CASSETTE_MODE,
+)
+from .llm_cache import llm_cache, make_cache_key
+from .cassette import CassetteTransport, cassette, latency_model
+from .llm_router import llm_router, is_retryable
+from .hedging import hedge_policy
+from .llm_scheduler import llm_scheduler
+from .single_flight import single_flight
+from .structured_output import structured_parser, with_schema_instructions, StructuredOutputError
+from .task_routing import task_router
+from .rate_limiter import estimate_tokens
+from .prompt_builder import count_tokens, token_usage
+
+T = TypeVar("T")
+
+
+def _mask_key(api_key: str) -> str:
+    """Short, log-safe identifier for an API key"""
+    return f"...{api_key[-4:]}" if api_key and len(api_key) > 4 else "***"
+
+
+def _pool_usage(http_client) -> Dict:
+    """Connection counts of an httpx client's pool (best effort, httpcore internals)"""
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for c in connections if c.is_idle())
+    return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+
+class ClientRegistry:
+    """
+    Process-wide cache of OpenAI-compatible clients keyed by (provider, api_key).
+
+    Every client shares the same pool limits so HTTP keep-alive connections
+    (and their TLS sessions) are reused across requests instead of being
+    re-established per call. Async clients are additionally scoped to the
+    event loop that created them, since httpx pools cannot cross loops.
+    With LLM_CASSETTE_MODE set, clients record to or replay from the
+    cassette (see cassette.py).
+    """
+
+    def __init__(self, limits: Optional[httpx.Limits] = None, timeout: float = LLM_TIMEOUT):
+        self.limits = limits or httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sync_clients: Dict[Tuple[str, str], OpenAI] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+        self._created = 0
+        self._reused = 0
+
+    def _resolve(self, provider: str, api_key: Optional[str]) -> Tuple[str, Optional[str]]:
+        if provider not in PROVIDER_BASE_URLS:
+            raise ValueError(f"Unknown LLM provider '{provider}'")
+        if not api_key:
+            raise ValueError(f"No API key configured for provider '{provider}'")
+        return api_key, PROVIDER_BASE_URLS[provider]
+
+    def _transport(self, sync: bool) -> Dict:
+        """httpx client kwargs: the cassette transport when recording/replaying"""
+        if cassette is None:
+            return {}
+        inner = {}
+        if LLM_CASSETTE_MODE == "record":
+            # A custom transport replaces httpx's pool, so it carries the limits itself
+            inner = {"sync_inner": httpx.HTTPTransport(limits=self.limits)} if sync else \
+                {"inner": httpx.AsyncHTTPTransport(limits=self.limits)}
+        return {"transport": CassetteTransport(cassette, LLM_CASSETTE_MODE, latency_model, **inner)}
+
+    def get_client(self, provider: str, api_key: Optional[str]) -> OpenAI:
+        """Return the shared sync client for this provider/key"""
+        api_key, base_url = self._resolve(provider, api_key)
+        key = (provider, api_key)
+        with self._lock:
+            client = self._sync_clients.get(key)
+            if client is not None:
+                self._reused += 1
+                return client
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=DefaultHttpxClient(limits=self.limits, timeout=self.timeout, **self._transport(sync=True)),
+            )
+            self._sync_clients[key] = client
+            self._created += 1
+            return client
+
+    def get_async_client(self, provider: str, api_key: Optional[str]) -> AsyncOpenAI:
+        """Return the shared async client for this provider/key on the running loop"""
+        api_key, base_url = self._resolve(provider, api_key)
+        loop = asyncio.get_running_loop()
+        key = (provider, api_key)
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is not None:
+                self._reused += 1
+                return client
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=DefaultAsyncHttpxClient(limits=self.limits, timeout=self.timeout, **self._transport(sync=False)),
+                max_retries=0,  # chat_completion retries through llm_router instead
+            )
+            clients[key] = client
+            self._created += 1
+            return client
+
+    def stats(self) -> Dict:
+        """Pool limits, client counts and per-client connection usage"""
+        with self._lock:
+            sync_items = list(self._sync_clients.items())
+            async_items = [item for clients in self._async_clients.values() for item in clients.items()]
+
+        clients = []
+        for kind, items in (("sync", sync_items), ("async", async_items)):
+            for (provider, api_key), client in items:
+                clients.append({
+                    "kind": kind,
+                    "provider": provider,
+                    "key": _mask_key(api_key),
+                    "connections": _pool_usage(client._client),
+                })
+
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+                "timeout": self.timeout,
+            },
+            "clients_created": self._created,
+            "client_reuses": self._reused,
+            "clients": clients,
+        }
+
+    async def aclose(self):
+        """Close the async clients owned by the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.pop(loop, {})
+        for client in clients.values():
+            await client.close()
+
+
+# Shared by ai_service, ResponseAnalyzer and QuestionGenerator
+registry = ClientRegistry()
+
+
+# ============================================================================
+# Async completion + sync bridge
+# ============================================================================
+
+def _prompt_parts(messages: List[Dict]) -> Tuple[str, str]:
+    """Join system and user/assistant content for cache keying"""
+    system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+    user = "\n".join(f'{m["role"]}: {m["content"]}' for m in messages if m["role"] != "system")
+    return system, user
+
+
+async def _complete_routed(messages, model, temperature, max_tokens, providers, on_send=None, tier=None, **options):
+    """
+    Send the request through llm_router, retrying on the next healthiest key.
+    Without an explicit model, each key's provider serves its `tier` model.
+    """
+    estimated_tokens = estimate_tokens(messages, max_tokens)
+    tried = []
+    while True:
+        endpoint = llm_router.pick(providers, exclude=tried)
+        tried.append(endpoint)
+        try:
+            # Only reached for a cooling key when every eligible key is cooling
+            cooldown = endpoint.cooldown_until - time.monotonic()
+            if cooldown > 0:
+                await asyncio.sleep(min(cooldown, LLM_ROUTER_MAX_COOLDOWN_WAIT))
+            # Wait for a concurrency slot and RPM/TPM budget on this key
+            await endpoint.limiter.acquire(estimated_tokens)
+        except asyncio.CancelledError:
+            llm_router.release(endpoint)
+            raise
+
+        if on_send is not None:
+            on_send(endpoint)
+        started = time.monotonic()
+        try:
+            client = registry.get_async_client(endpoint.provider, endpoint.api_key)
+            response = await client.chat.completions.create(
+                model=model or task_router.model_for(endpoint.provider, tier),
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **options
+            )
+        except asyncio.CancelledError:
+            endpoint.limiter.release(estimated_tokens, succeeded=False)
+            llm_router.release(endpoint)
+            raise
+        except Exception as e:
+            endpoint.limiter.release(
+                estimated_tokens,
+                throttled=isinstance(e, (openai.RateLimitError, openai.APITimeoutError)),
+                succeeded=False
+            )
+            llm_router.record_failure(endpoint, e, time.monotonic() - started)
+            if not is_retryable(e) or len(tried) >= LLM_ROUTER_MAX_ATTEMPTS:
+                raise
+            print(f"LLM call failed on {endpoint.name} ({type(e).__name__}), retrying")
+            continue
+        usage = getattr(response, "usage", None)
+        endpoint.limiter.release(estimated_tokens, used_tokens=getattr(usage, "total_tokens", 0) or 0)
+        llm_router.record_success(endpoint, time.monotonic() - started)
+        return response
+
+
+def _discard(task: Optional[asyncio.Task]):
+    """Cancel a losing attempt without leaving its exception unretrieved"""
+    if task is None:
+        return
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _has_content(response) -> bool:
+    return bool(response.choices and response.choices[0].message.content)
+
+
+async def _complete_hedged(messages, model, temperature, max_tokens, providers, tier=None, **options):
+    """
+    _complete_routed with an optional hedge: once the primary request has
+    been outstanding for hedge_policy.delay() of its provider, the same
+    request goes to another provider and the first valid response wins.
+    """
+    if not hedge_policy.enabled or model:
+        # An explicit model only makes sense on the provider it was chosen for
+        return await _complete_routed(messages, model, temperature, max_tokens, providers, tier=tier, **options)
+
+    loop = asyncio.get_running_loop()
+    trigger = loop.create_future()
+    timer = None
+
+    def on_send(endpoint):
+        nonlocal timer
+        if timer is not None:
+            timer.cancel()  # primary retried on another key: restart the clock
+        delay = hedge_policy.delay(endpoint.provider)
+        secondary = hedge_policy.secondary_providers(endpoint.provider, providers)
+        if delay is not None and secondary:
+            timer = loop.call_later(delay, lambda: trigger.done() or trigger.set_result(secondary))
+
+    hedge_policy.record_eligible()
+    primary = asyncio.create_task(
+        _complete_routed(messages, model, temperature, max_tokens, providers, on_send=on_send, tier=tier, **options)
+    )
+    hedge = None
+    try:
+        done, _ = await asyncio.wait({primary, trigger}, return_when=asyncio.FIRST_COMPLETED)
+        if primary in done or not hedge_policy.try_spend():
+            return await primary
+
+        hedge = asyncio.create_task(
+            _complete_routed(messages, model, temperature, max_tokens, trigger.result(), tier=tier, **options)
+        )
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and _has_content(task.result()):
+                    hedge_policy.record("hedge_won" if task is hedge else "primary_won")
+                    return task.result()
+                error = error or task.exception()
+        hedge_policy.record("both_failed")
+        if error is not None:
+            raise error
+        return primary.result()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        trigger.cancel()
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                _discard(task)
+
+
+async def chat_completion(
+    messages: List[Dict],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 250,
+    call_site: str = "default",
+    bypass_cache: bool = False,
+    providers: Optional[List[str]] = None,
+    response_model: Optional[Type[Any]] = None,
+) -> Any:
+    """
+    Run one chat completion and return its text.
+
+    The endpoint (provider + API key) is chosen by llm_router from every
+    configured key; retryable failures move on to the next healthiest key.
+    Without `model`, task_router picks the model size tier for call_site
+    (small models for classification/extraction) and records its latency
+    and output quality against the call site's SLOs. `model` overrides
+    that and is normally only given together with `providers`.
+
+    Responses are cached by (model, system prompt, user prompt, temperature)
+    with the TTL configured for call_site; pass bypass_cache for prompts that
+    are meant to produce a different answer every time.
+
+    Identical requests already in flight are joined rather than re-sent
+    (except with bypass_cache). Cache misses are admitted by llm_scheduler
+    using the priority class and owner set with llm_priority() around the
+    caller. Raises CircuitOpenError without waiting when the circuit breaker
+    of every allowed provider is open.
+
+    With a pydantic `response_model` the request uses JSON mode and the
+    validated (locally repaired if needed) model instance is returned;
+    output that still does not fit raises StructuredOutputError and is
+    never cached.
+    """
+    options = {}
+    if response_model is not None:
+        messages = with_schema_instructions(messages, response_model)
+        options["response_format"] = {"type": "json_object"}
+
+    tier = None if model else task_router.tier_for(call_site)
+    model_key = model or f"auto:{tier}"
+
+    use_cache = llm_cache.enabled and not bypass_cache and llm_cache.ttl_for(call_site) > 0
+    if use_cache:
+        cache_key = make_cache_key(model_key, *_prompt_parts(messages), temperature)
+        cached = llm_cache.get(cache_key, call_site)
+        if cached is not None:
+            return structured_parser.parse(cached, response_model, "cache") if response_model else cached
+    else:
+        llm_cache.record_bypass(call_site)
+
+    # Fail fast while every provider's breaker is open; callers fall back to heuristics
+    llm_router.check_available(providers)
+
+    async def complete() -> Any:
+        async with llm_scheduler.slot():
+            started = time.monotonic()
+            response = await _complete_hedged(messages, model, temperature, max_tokens, providers, tier=tier, **options)
+            latency = time.monotonic() - started
+        content = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        token_usage.record_completion(
+            call_site,
+            getattr(usage, "prompt_tokens", 0) or sum(count_tokens(m["content"]) for m in messages),
+            getattr(usage, "completion_tokens", 0) or count_tokens(content)
+        )
+        result = content
+        if response_model is not None:
+            try:
+                result = structured_parser.parse(content, response_model, getattr(response, "model", None) or model or "unknown")
+            except StructuredOutputError:
+                if tier is not None:
+                    task_router.record(call_site, tier, latency, ok=False)
+                raise
+        if tier is not None:
+            task_router.record(call_site, tier, latency, ok=bool(content.strip()))
+        if use_cache:
+            llm_cache.set(cache_key, content, call_site)
+        return result
+
+    if bypass_cache:
+        return await complete()
+    flight_key = make_cache_key(
+        f"{model_key}|{max_tokens}|{','.join(providers or [])}|{getattr(response_model, '__name__', '')}",
+        *_prompt_parts(messages), temperature
+    )
+    return await single_flight.do(flight_key, complete, call_site)
+
+
+async def stream_chat_completion(
+    messages: List[Dict],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 250,
+    call_site: str = "default",
+    providers: Optional[List[str]] = None,
+    response_model: Optional[Type[Any]] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream one chat completion as text deltas.
+
+    Routed, rate limited, scheduled and SLO-tracked like chat_completion,
+    but never cached, coalesced or hedged: every caller gets its own
+    stream. A failing key is retried on the next one only while nothing
+    has been yielded yet. With `response_model` the request uses JSON mode;
+    parse the joined text with structured_parser when the stream ends.
+    """
+    options = {}
+    if response_model is not None:
+        messages = with_schema_instructions(messages, response_model)
+        options["response_format"] = {"type": "json_object"}
+
+    llm_router.check_available(providers)
+    tier = None if model else task_router.tier_for(call_site)
+    estimated_tokens = estimate_tokens(messages, max_tokens)
+    prompt_tokens = sum(count_tokens(m["content"]) for m in messages)
+    tried = []
+    async with llm_scheduler.slot():
+        while True:
+            endpoint = llm_router.pick(providers, exclude=tried)
+            tried.append(endpoint)
+            try:
+                cooldown = endpoint.cooldown_until - time.monotonic()
+                if cooldown > 0:
+                    await asyncio.sleep(min(cooldown, LLM_ROUTER_MAX_COOLDOWN_WAIT))
+                await endpoint.limiter.acquire(estimated_tokens)
+            except asyncio.CancelledError:
+                llm_router.release(endpoint)
+                raise
+
+            started = time.monotonic()
+            stream = None
+            parts = []
+            try:
+                client = registry.get_async_client(endpoint.provider, endpoint.api_key)
+                stream = await client.chat.completions.create(
+                    model=model or task_router.model_for(endpoint.provider, tier),
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    **options
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            except (asyncio.CancelledError, GeneratorExit):
+                # Consumer went away (client disconnect): free the connection and the key
+                if stream is not None:
+                    await stream.close()
+                endpoint.limiter.release(estimated_tokens, succeeded=False)
+                llm_router.release(endpoint)
+                raise
+            except Exception as e:
+                endpoint.limiter.release(
+                    estimated_tokens,
+                    throttled=isinstance(e, (openai.RateLimitError, openai.APITimeoutError)),
+                    succeeded=False
+                )
+                llm_router.record_failure(endpoint, e, time.monotonic() - started)
+                if parts or not is_retryable(e) or len(tried) >= LLM_ROUTER_MAX_ATTEMPTS:
+                    raise
+                print(f"LLM stream failed on {endpoint.name} ({type(e).__name__}), retrying")
+                continue
+
+            latency = time.monotonic() - started
+            content = "".join(parts)
+            completion_tokens = count_tokens(content)
+            endpoint.limiter.release(estimated_tokens, used_tokens=prompt_tokens + completion_tokens)
+            llm_router.record_success(endpoint, latency)
+            token_usage.record_completion(call_site, prompt_tokens, completion_tokens)
+            if tier is not None:
+                task_router.record(call_site, tier, latency, ok=bool(content.strip()))
+            return
+
+
+_bridge_loop: Optional[asyncio.AbstractEventLoop] = None
+_bridge_lock = threading.Lock()
+
+
+def _get_bridge_loop() -> asyncio.AbstractEventLoop:
+    global _bridge_loop
+    with _bridge_lock:
+        if _bridge_loop is None:
+            _bridge_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_bridge_loop.run_forever,
+                name="llm-sync-bridge",
+                daemon=True
+            ).start()
+        return _bridge_loop
+
+
+def run_blocking(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine from synchronous code (sample.py, InterviewManager).
+
+    Uses one long-lived background loop so the async clients it creates keep
+    their connection pools between calls instead of being torn down by
+    asyncio.run().
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_bridge_loop()).result()
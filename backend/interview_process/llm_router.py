@@ -0,0 +1,240 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+import openai
+
+from .config import (
+    LLM_PROVIDER_KEYS,
+    LLM_PROVIDER_PREFERENCE,
+    LLM_RATE_LIMIT_COOLDOWN,
+    LLM_AUTH_ERROR_COOLDOWN,
+    PROVIDER_BASE_URLS,
+    PROVIDER_MODELS,
+    LLM_RPM_LIMITS,
+    LLM_TPM_LIMITS,
+    LLM_INITIAL_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+)
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, is_outage
+from .rate_limiter import KeyLimiter
+
+# EWMA smoothing for latency / error rate, and the latency assumed for
+# endpoints that have not answered yet (so new keys get traffic)
+_ALPHA = 0.2
+_INITIAL_LATENCY = 1.0
+# Recent successful latencies kept per endpoint for percentiles
+_LATENCY_SAMPLES = 200
+
+
+class Endpoint:
+    """One (provider, api key) pair and its observed health"""
+
+    def __init__(self, provider: str, api_key: str):
+        self.provider = provider
+        self.api_key = api_key
+        self.latency_ewma = _INITIAL_LATENCY
+        self.error_rate = 0.0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.latencies = deque(maxlen=_LATENCY_SAMPLES)
+        self.limiter = KeyLimiter(
+            rpm=LLM_RPM_LIMITS.get(provider, 60),
+            tpm=LLM_TPM_LIMITS.get(provider, 60000),
+            initial_concurrency=LLM_INITIAL_CONCURRENCY,
+            max_concurrency=LLM_MAX_CONCURRENCY
+        )
+
+    @property
+    def name(self) -> str:
+        suffix = self.api_key[-4:] if len(self.api_key) > 4 else "***"
+        return f"{self.provider}:...{suffix}"
+
+    @property
+    def default_model(self) -> str:
+        return PROVIDER_MODELS[self.provider]
+
+    def available(self, now: float) -> bool:
+        return self.cooldown_until <= now
+
+    def score(self) -> float:
+        """Lower is better: expected latency inflated by load, errors and cost"""
+        preference = LLM_PROVIDER_PREFERENCE.get(self.provider, 1.0)
+        return self.latency_ewma * (self.in_flight + 1) * (1 + 4 * self.error_rate) * preference
+
+    def stats(self, now: float) -> Dict:
+        return {
+            "endpoint": self.name,
+            "latency_ewma": round(self.latency_ewma, 3),
+            "error_rate": round(self.error_rate, 3),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "cooldown_remaining": round(max(0.0, self.cooldown_until - now), 1),
+            "limiter": self.limiter.stats(),
+        }
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class LLMRouter:
+    """
+    Spreads completions across every configured key of every
+    OpenAI-compatible provider.
+
+    Each key is scored from its latency EWMA, error-rate EWMA, in-flight
+    requests and a per-provider cost bias; the lowest score wins. Keys that
+    return 429 sit out for Retry-After (or LLM_RATE_LIMIT_COOLDOWN) seconds,
+    keys that fail authentication for LLM_AUTH_ERROR_COOLDOWN. Providers
+    whose circuit breaker is open are skipped entirely.
+    """
+
+    def __init__(self, provider_keys: Optional[Dict[str, List[str]]] = None):
+        self._lock = threading.Lock()
+        self.endpoints: List[Endpoint] = []
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.configure(provider_keys or LLM_PROVIDER_KEYS)
+
+    def configure(self, provider_keys: Dict[str, List[str]]):
+        """Replace the endpoint set, keeping health data for keys that remain"""
+        with self._lock:
+            current = {(e.provider, e.api_key): e for e in self.endpoints}
+            endpoints = []
+            for provider, keys in provider_keys.items():
+                if provider not in PROVIDER_BASE_URLS:
+                    continue
+                for key in dict.fromkeys(keys):
+                    endpoints.append(current.get((provider, key)) or Endpoint(provider, key))
+            self.endpoints = endpoints
+            self.breakers = {
+                e.provider: self.breakers.get(e.provider) or CircuitBreaker(e.provider)
+                for e in endpoints
+            }
+
+    def pick(self, providers: Optional[Iterable[str]] = None, exclude: Iterable[Endpoint] = ()) -> Endpoint:
+        """Healthiest endpoint, optionally restricted to some providers"""
+        now = time.monotonic()
+        allowed = set(providers) if providers else None
+        excluded = set(id(e) for e in exclude)
+        with self._lock:
+            eligible = self._eligible(allowed, now)
+            # Prefer keys not yet tried for this request; reuse them once all have been
+            candidates = [e for e in eligible if id(e) not in excluded] or eligible
+            ready = [e for e in candidates if e.available(now)]
+            if not ready:
+                # Everything is cooling down: use the one that recovers first
+                endpoint = min(candidates, key=lambda e: e.cooldown_until)
+            else:
+                best = min(e.score() for e in ready)
+                endpoint = random.choice([e for e in ready if e.score() <= best * 1.05])
+            self.breakers[endpoint.provider].on_dispatch(now)
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _eligible(self, allowed, now: float) -> List[Endpoint]:
+        """Endpoints of allowed providers whose breaker lets requests through"""
+        configured = [e for e in self.endpoints if allowed is None or e.provider in allowed]
+        if not configured:
+            raise RuntimeError("No LLM API keys configured. Please set GROQ_API_KEY or OPENAI_API_KEY in .env file.")
+        eligible = [e for e in configured if self.breakers[e.provider].ready(now)]
+        if not eligible:
+            for provider in set(e.provider for e in configured):
+                self.breakers[provider].short_circuited += 1
+            raise CircuitOpenError("Circuit open for all LLM providers")
+        return eligible
+
+    def check_available(self, providers: Optional[Iterable[str]] = None):
+        """Raise CircuitOpenError up front if no allowed provider can be called"""
+        with self._lock:
+            self._eligible(set(providers) if providers else None, time.monotonic())
+
+    def release(self, endpoint: Endpoint):
+        """Give back an endpoint whose request was cancelled (no health signal)"""
+        with self._lock:
+            endpoint.in_flight -= 1
+            self.breakers[endpoint.provider].on_cancel()
+
+    def record_success(self, endpoint: Endpoint, latency: float):
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.latency_ewma += _ALPHA * (latency - endpoint.latency_ewma)
+            endpoint.error_rate *= (1 - _ALPHA)
+            endpoint.latencies.append(latency)
+            self.breakers[endpoint.provider].record_success()
+
+    def record_failure(self, endpoint: Endpoint, error: Exception, latency: float):
+        now = time.monotonic()
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.failures += 1
+            endpoint.error_rate += _ALPHA * (1 - endpoint.error_rate)
+            if isinstance(error, openai.RateLimitError):
+                endpoint.rate_limited += 1
+                endpoint.cooldown_until = now + (_retry_after(error) or LLM_RATE_LIMIT_COOLDOWN)
+            elif isinstance(error, (openai.AuthenticationError, openai.PermissionDeniedError)):
+                endpoint.cooldown_until = now + LLM_AUTH_ERROR_COOLDOWN
+            elif isinstance(error, openai.APITimeoutError):
+                endpoint.latency_ewma += _ALPHA * (latency - endpoint.latency_ewma)
+            breaker = self.breakers[endpoint.provider]
+            if is_outage(error):
+                breaker.record_failure(now)
+            else:
+                breaker.on_cancel()  # says nothing about the provider itself
+
+    def providers(self, available_only: bool = False) -> List[str]:
+        """Providers with at least one configured key (and, optionally, a passable breaker)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                p for p in dict.fromkeys(e.provider for e in self.endpoints)
+                if not available_only or self.breakers[p].ready(now)
+            ]
+
+    def latency_percentile(self, provider: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Recent latency percentile across a provider's keys, None if too few samples"""
+        with self._lock:
+            samples = sorted(l for e in self.endpoints if e.provider == provider for l in e.latencies)
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def capacity(self) -> int:
+        """Combined concurrency window of every configured key"""
+        with self._lock:
+            return sum(int(e.limiter.window.limit) for e in self.endpoints)
+
+    def stats(self) -> List[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [e.stats(now) for e in self.endpoints]
+
+    def breaker_stats(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {p: b.stats(now) for p, b in self.breakers.items()}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Errors worth retrying on a different key/provider"""
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+                          openai.InternalServerError, openai.AuthenticationError, openai.PermissionDeniedError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+llm_router = LLMRouter()
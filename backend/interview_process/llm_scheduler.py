@@ -0,0 +1,187 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Hashable, Optional
+
+from .config import LLM_SCHEDULER_SHARES
+from .llm_router import llm_router
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"        # candidate is waiting on the response
+NEAR_REAL_TIME = "near_real_time"  # user-visible but not blocking an answer
+BATCH = "batch"                    # resume parsing, pool refills, backfills
+PRIORITY_CLASSES = (INTERACTIVE, NEAR_REAL_TIME, BATCH)
+
+_current = contextvars.ContextVar("llm_priority", default=(NEAR_REAL_TIME, None))
+
+
+@contextmanager
+def llm_priority(priority: str, owner: Optional[Hashable] = None):
+    """
+    Tag LLM calls made in this block (and tasks it spawns) with a priority
+    class and a fairness owner, e.g. the HR user that owns the job.
+    """
+    token = _current.set((priority, owner))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_priority():
+    return _current.get()
+
+
+class LLMScheduler:
+    """
+    Admission control for outbound LLM work.
+
+    Capacity is read from a callable (the router's combined AIMD windows).
+    Each class has a reserved share of it. A class may always use its own
+    reservation, and may borrow free capacity except the unused reservations
+    of higher classes. So a flood of batch work never takes the slots kept for
+    interactive calls, while interactive calls can use anything that is free.
+    Within a class, waiters are served round-robin per owner.
+    """
+
+    def __init__(self, capacity: Callable[[], int], shares: Optional[Dict[str, float]] = None):
+        self.capacity = capacity
+        self.shares = shares or LLM_SCHEDULER_SHARES
+        self._lock = threading.Lock()
+        self.in_flight = {c: 0 for c in PRIORITY_CLASSES}
+        self._queues: Dict[str, "OrderedDict[Hashable, deque]"] = {c: OrderedDict() for c in PRIORITY_CLASSES}
+        self.granted = {c: 0 for c in PRIORITY_CLASSES}
+        self.total_wait = {c: 0.0 for c in PRIORITY_CLASSES}
+        self.max_wait = {c: 0.0 for c in PRIORITY_CLASSES}
+
+    def _reserved(self, capacity: int) -> Dict[str, int]:
+        return {c: max(1, int(capacity * self.shares.get(c, 0))) for c in PRIORITY_CLASSES}
+
+    def _can_start(self, priority: str, capacity: int, reserved: Dict[str, int]) -> bool:
+        total = sum(self.in_flight.values())
+        if total >= capacity:
+            return False
+        if self.in_flight[priority] < reserved[priority]:
+            return True
+        held_back = 0
+        for higher in PRIORITY_CLASSES[:PRIORITY_CLASSES.index(priority)]:
+            held_back += max(0, reserved[higher] - self.in_flight[higher])
+        return total < capacity - held_back
+
+    def _queued(self, priority: str) -> int:
+        return sum(len(q) for q in self._queues[priority].values())
+
+    def _pop_waiter(self, priority: str):
+        """Next waiter of a class, rotating across owners"""
+        queues = self._queues[priority]
+        while queues:
+            owner, waiters = queues.popitem(last=False)
+            waiter = waiters.popleft() if waiters else None
+            if waiters:
+                queues[owner] = waiters  # back of the rotation
+            if waiter is not None and not waiter[1].done():
+                return waiter
+        return None
+
+    def _dispatch(self):
+        capacity = max(1, self.capacity())
+        reserved = self._reserved(capacity)
+        while True:
+            # Classes below their reservation first (no starvation), then by priority
+            order = sorted(
+                (c for c in PRIORITY_CLASSES if self._queues[c]),
+                key=lambda c: (self.in_flight[c] >= reserved[c], PRIORITY_CLASSES.index(c))
+            )
+            for priority in order:
+                if self._can_start(priority, capacity, reserved):
+                    waiter = self._pop_waiter(priority)
+                    if waiter is None:
+                        continue
+                    self.in_flight[priority] += 1
+                    loop, future, _ = waiter
+                    loop.call_soon_threadsafe(self._deliver, priority, future)
+                    break
+            else:
+                return
+
+    def _deliver(self, priority: str, future: asyncio.Future):
+        if future.cancelled():
+            self.release(priority)
+        else:
+            future.set_result(None)
+
+    async def acquire(self, priority: str, owner: Optional[Hashable] = None):
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            capacity = max(1, self.capacity())
+            if not self._queued(priority) and self._can_start(priority, capacity, self._reserved(capacity)):
+                self.in_flight[priority] += 1
+                self.granted[priority] += 1
+                return
+            future = loop.create_future()
+            self._queues[priority].setdefault(owner, deque()).append((loop, future, owner))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            else:
+                with self._lock:
+                    waiters = self._queues[priority].get(owner)
+                    if waiters is not None:
+                        try:
+                            waiters.remove((loop, future, owner))
+                        except ValueError:
+                            pass  # already granted; _deliver returns the slot
+                        if not waiters:
+                            del self._queues[priority][owner]
+            raise
+        waited = time.monotonic() - started
+        with self._lock:
+            self.granted[priority] += 1
+            self.total_wait[priority] += waited
+            self.max_wait[priority] = max(self.max_wait[priority], waited)
+
+    def release(self, priority: str):
+        with self._lock:
+            self.in_flight[priority] -= 1
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[str] = None, owner: Optional[Hashable] = None):
+        """Hold one scheduler slot; defaults to the context's priority/owner"""
+        if priority is None:
+            priority, owner = current_priority()
+        await self.acquire(priority, owner)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            capacity = max(1, self.capacity())
+            reserved = self._reserved(capacity)
+            return {
+                "capacity": capacity,
+                "classes": {
+                    c: {
+                        "reserved": reserved[c],
+                        "in_flight": self.in_flight[c],
+                        "queued": self._queued(c),
+                        "queued_owners": len(self._queues[c]),
+                        "granted": self.granted[c],
+                        "avg_wait": round(self.total_wait[c] / self.granted[c], 3) if self.granted[c] else 0.0,
+                        "max_wait": round(self.max_wait[c], 3),
+                    }
+                    for c in PRIORITY_CLASSES
+                },
+            }
+
+
+# Sized from the router's AIMD windows, so priorities apply where keys saturate
+llm_scheduler = LLMScheduler(capacity=llm_router.capacity)
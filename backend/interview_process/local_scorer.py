@@ -0,0 +1,236 @@
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    LOCAL_SCORER_PATH,
+    LOCAL_SCORER_MAX_STDERR,
+    LOCAL_SCORER_AUDIT_RATE,
+    LOCAL_SCORER_MIN_SAMPLES,
+)
+from .utils import analyze_response_quality
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it of on or that the this to was we what when "
+    "which why will with you your".split()
+)
+
+# Below this share of known answer terms the prediction is not trusted
+_MIN_COVERAGE = 0.3
+
+# Question-specific cues also used by ResponseAnalyzer._fallback_evaluation
+_QUESTION_CUES = (
+    ("debug", ("log", "monitor", "analyze", "profile")),
+    ("design", ("scalable", "architecture", "components", "trade-off")),
+    ("difference between", ("vs", "versus", "while", "whereas", "on the other hand")),
+)
+
+
+def _tokens(text: str) -> List[str]:
+    return [t.rstrip(".") for t in _TOKEN.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def heuristic_features(question: str, answer: str) -> List[float]:
+    """Dense features from analyze_response_quality plus question cues and term overlap"""
+    metrics = analyze_response_quality(answer)
+    words = metrics["word_count"]
+    question_lower, answer_lower = question.lower(), answer.lower()
+    cues = [
+        float(cue in question_lower and any(term in answer_lower for term in terms))
+        for cue, terms in _QUESTION_CUES
+    ]
+    question_terms = set(_tokens(question))
+    overlap = len(question_terms & set(_tokens(answer))) / max(1, len(question_terms))
+    return [
+        math.log1p(words),
+        float(words < 50),
+        float(50 <= words < 100),
+        float(100 <= words <= 250),
+        float(words > 300),
+        float(metrics["has_examples"]),
+        float(metrics["has_technical_terms"]),
+        float(metrics["has_explanation"]),
+        math.log1p(metrics["sentence_count"]),
+        min(metrics["avg_sentence_length"], 60) / 60,
+        overlap,
+        *cues,
+    ]
+
+
+class LocalScorer:
+    """
+    Ridge regression over heuristic features and TF-IDF of the question and
+    answer, fitted offline on historical InterviewAnswer.answer_score values
+    (see train_local_scorer.py).
+
+    `predict` returns the score and its standard error; the error combines
+    the training residual variance with the leverage of the new point, so
+    answers unlike the training data come back uncertain and are escalated
+    to the LLM. Without a trained model every answer is escalated.
+    """
+
+    def __init__(self, path: str = LOCAL_SCORER_PATH, max_stderr: float = LOCAL_SCORER_MAX_STDERR,
+                 audit_rate: float = LOCAL_SCORER_AUDIT_RATE):
+        self.path = path
+        self.max_stderr = max_stderr
+        self.audit_rate = audit_rate
+        self.vocab: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.mean: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+        self.covariance: Optional[np.ndarray] = None  # (X'X + lambda*I)^-1
+        self.residual_var = 0.0
+        self.samples = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            "scored_locally": 0,
+            "escalated": 0,
+            "audited": 0,
+            "compared": 0,
+            "within_one_point": 0,
+            "abs_error_sum": 0.0,
+            "local_time_ms": 0.0,
+        }
+        if path and os.path.exists(path):
+            try:
+                self.load(path)
+            except Exception as e:
+                print(f"Local scorer: could not load {path}: {e}")
+
+    @property
+    def ready(self) -> bool:
+        return self.weights is not None and self.samples >= LOCAL_SCORER_MIN_SAMPLES
+
+    def _vectorize(self, question: str, answer: str) -> np.ndarray:
+        size = len(self.vocab)
+        tfidf = np.zeros(2 * size)
+        for offset, text in ((0, question), (size, answer)):
+            counts = Counter(t for t in _tokens(text) if t in self.vocab)
+            if not counts:
+                continue
+            for term, count in counts.items():
+                tfidf[offset + self.vocab[term]] = (1 + math.log(count)) * self.idf[self.vocab[term]]
+            norm = np.linalg.norm(tfidf[offset:offset + size])
+            tfidf[offset:offset + size] /= norm
+        dense = (np.asarray(heuristic_features(question, answer)) - self.mean) / self.scale
+        return np.concatenate(([1.0], dense, tfidf))
+
+    def fit(self, samples: Iterable[Tuple[str, str, float]], vocab_size: int = 300, ridge: float = 1.0) -> "LocalScorer":
+        samples = [(q or "", a or "", float(s)) for q, a, s in samples]
+        if not samples:
+            raise ValueError("No scored answers to train on")
+        document_freq = Counter()
+        for question, answer, _ in samples:
+            document_freq.update(set(_tokens(question)) | set(_tokens(answer)))
+        terms = [t for t, df in document_freq.most_common(vocab_size) if df >= 2]
+        self.vocab = {term: i for i, term in enumerate(terms)}
+        self.idf = np.array([math.log((1 + len(samples)) / (1 + document_freq[t])) + 1 for t in terms])
+
+        dense = np.array([heuristic_features(q, a) for q, a, _ in samples])
+        self.mean = dense.mean(axis=0)
+        self.scale = np.where(dense.std(axis=0) > 0, dense.std(axis=0), 1.0)
+        X = np.array([self._vectorize(q, a) for q, a, _ in samples])
+        y = np.array([s for _, _, s in samples])
+
+        penalty = ridge * np.eye(X.shape[1])
+        penalty[0, 0] = 0.0  # intercept is not shrunk
+        self.covariance = np.linalg.pinv(X.T @ X + penalty)
+        self.weights = self.covariance @ X.T @ y
+        residuals = y - X @ self.weights
+        self.residual_var = float(residuals @ residuals / max(1, len(y) - 1))
+        self.samples = len(samples)
+        return self
+
+    def predict(self, question: str, answer: str) -> Tuple[float, float]:
+        """(score clamped to 1-10, standard error of the prediction)"""
+        x = self._vectorize(question, answer)
+        score = float(x @ self.weights)
+        stderr = math.sqrt(self.residual_var * (1 + float(x @ self.covariance @ x)))
+        return max(1.0, min(10.0, score)), stderr
+
+    def coverage(self, answer: str) -> float:
+        """Share of answer tokens in the training vocabulary"""
+        tokens = _tokens(answer)
+        return sum(t in self.vocab for t in tokens) / len(tokens) if tokens else 0.0
+
+    def score(self, question: str, answer: str) -> Optional[Dict]:
+        """
+        Local prediction as {"score", "stderr", "confident", "audit"}, or
+        None when no model is loaded. A prediction is confident when its
+        standard error is small and the answer is mostly made of terms seen
+        in training (the TF-IDF part says nothing about unseen vocabulary).
+        Confident predictions are still sent to the LLM at `audit_rate` so
+        agreement is measured on both tiers.
+        """
+        if not self.ready:
+            return None
+        started = time.perf_counter()
+        score, stderr = self.predict(question, answer)
+        elapsed = (time.perf_counter() - started) * 1000
+        confident = stderr <= self.max_stderr and self.coverage(answer) >= _MIN_COVERAGE
+        audit = confident and random.random() < self.audit_rate
+        with self._lock:
+            self.counters["local_time_ms"] += elapsed
+            if confident and not audit:
+                self.counters["scored_locally"] += 1
+            else:
+                self.counters["audited" if audit else "escalated"] += 1
+        return {"score": round(score, 1), "stderr": round(stderr, 2), "confident": confident, "audit": audit}
+
+    def record_llm_score(self, local_score: float, llm_score: float):
+        """Compare an escalated/audited local prediction with the LLM's score"""
+        error = abs(local_score - llm_score)
+        with self._lock:
+            self.counters["compared"] += 1
+            self.counters["abs_error_sum"] += error
+            self.counters["within_one_point"] += error <= 1.0
+
+    def save(self, path: Optional[str] = None):
+        terms = sorted(self.vocab, key=self.vocab.get)
+        np.savez(
+            path or self.path,
+            vocab=np.array(terms, dtype=str), idf=self.idf, mean=self.mean, scale=self.scale,
+            weights=self.weights, covariance=self.covariance,
+            residual_var=self.residual_var, samples=self.samples,
+        )
+
+    def load(self, path: str):
+        with np.load(path) as data:
+            self.vocab = {str(term): i for i, term in enumerate(data["vocab"])}
+            self.idf = data["idf"]
+            self.mean = data["mean"]
+            self.scale = data["scale"]
+            self.weights = data["weights"]
+            self.covariance = data["covariance"]
+            self.residual_var = float(data["residual_var"])
+            self.samples = int(data["samples"])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            c = dict(self.counters)
+        predictions = c["scored_locally"] + c["escalated"] + c["audited"]
+        return {
+            "ready": self.ready,
+            "training_samples": self.samples,
+            "max_stderr": self.max_stderr,
+            "llm_calls_avoided": c["scored_locally"],
+            "escalated": c["escalated"],
+            "audited": c["audited"],
+            "local_rate": round(c["scored_locally"] / predictions, 3) if predictions else 0.0,
+            "avg_local_ms": round(c["local_time_ms"] / predictions, 3) if predictions else 0.0,
+            "llm_comparisons": c["compared"],
+            "mean_abs_error": round(c["abs_error_sum"] / c["compared"], 2) if c["compared"] else None,
+            "agreement_within_one_point": round(c["within_one_point"] / c["compared"], 3) if c["compared"] else None,
+        }
+
+
+local_scorer = LocalScorer()
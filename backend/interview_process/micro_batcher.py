@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, Callable, Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects items submitted within `window` seconds (or until `max_items`
+    are waiting) and hands them to `handler` as one list. The handler
+    returns one result per item, in order; each submitter gets its own.
+    Pending batches are kept per event loop.
+    """
+
+    def __init__(self, handler: Callable[[List[T]], Awaitable[List[R]]], window: float = 0.05, max_items: int = 8):
+        self.handler = handler
+        self.window = window
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List]" = weakref.WeakKeyDictionary()
+        self._timers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.TimerHandle]" = weakref.WeakKeyDictionary()
+        self._tasks = set()
+        self.counters = {"items": 0, "batches": 0, "flushed_full": 0, "flushed_window": 0, "errors": 0}
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            pending = self._pending.setdefault(loop, [])
+            pending.append((item, future))
+            self.counters["items"] += 1
+            full = len(pending) >= self.max_items
+            if len(pending) == 1 and not full:
+                self._timers[loop] = loop.call_later(self.window, self._flush, loop, "flushed_window")
+        if full:
+            self._flush(loop, "flushed_full")
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, reason: str):
+        with self._lock:
+            batch = self._pending.pop(loop, [])
+            timer = self._timers.pop(loop, None)
+            if not batch:
+                return
+            self.counters["batches"] += 1
+            self.counters[reason] += 1
+        if timer is not None:
+            timer.cancel()
+        task = loop.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List):
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as e:
+            self.counters["errors"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "window_ms": round(self.window * 1000),
+            "max_items": self.max_items,
+            "avg_batch_size": round(counters["items"] / counters["batches"], 2) if counters["batches"] else 0.0,
+            **counters,
+        }
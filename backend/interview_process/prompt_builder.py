@@ -0,0 +1,149 @@
+import threading
+from typing import Dict, List, Optional, Union
+
+from .config import PROMPT_TOKEN_BUDGETS
+
+_CHARS_PER_TOKEN = 4
+_TRUNCATED = " ...[truncated]"
+
+
+def count_tokens(text: str) -> int:
+    """Local token estimate (~4 characters per token), no tokenizer round trip"""
+    return (len(text or "") + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def _truncate(text: str, tokens: int) -> str:
+    """Keep the head of text within `tokens`, cut at a word boundary"""
+    if count_tokens(text) <= tokens:
+        return text
+    limit = max(0, tokens * _CHARS_PER_TOKEN - len(_TRUNCATED))
+    head = text[:limit]
+    if " " in head[limit // 2:]:
+        head = head[:head.rindex(" ")]
+    return head.rstrip() + _TRUNCATED
+
+
+def _fill_cap(sizes: List[int], target: int) -> int:
+    """Largest per-item cap c with sum(min(size, c)) <= target"""
+    low, high = 0, max(sizes, default=0)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if sum(min(s, mid) for s in sizes) <= target:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+class _Section:
+    def __init__(self, name: str, content: Union[str, List[str]], priority: Optional[int], min_tokens: int, joiner: str):
+        self.name = name
+        self.items = content if isinstance(content, list) else None
+        self.text = "" if self.items is not None else (content or "")
+        self.priority = priority  # None: fixed, never trimmed
+        self.min_tokens = min_tokens
+        self.joiner = joiner
+
+    def render(self) -> str:
+        return self.joiner.join(self.items) if self.items is not None else self.text
+
+    @property
+    def tokens(self) -> int:
+        return count_tokens(self.render())
+
+    def shrink_to(self, tokens: int):
+        if self.items is None:
+            self.text = _truncate(self.text, tokens)
+            return
+        # Trim the longest items first so every entry keeps some content
+        budget = max(0, tokens - count_tokens(self.joiner) * max(0, len(self.items) - 1))
+        cap = _fill_cap([count_tokens(item) for item in self.items], budget)
+        self.items = [_truncate(item, cap) for item in self.items]
+
+
+class PromptBuilder:
+    """
+    Fits prompt sections into the token budget of a call site.
+
+    The template is a str.format string; each placeholder is a section.
+    Fixed sections (instructions, job title) are never trimmed. Trimmable
+    sections are cut lowest priority first, down to their min_tokens, until
+    the rendered prompt fits. List sections (transcripts, history) are
+    trimmed entry by entry, longest first.
+    """
+
+    def __init__(self, call_site: str, budget: Optional[int] = None):
+        self.call_site = call_site
+        self.budget = budget or PROMPT_TOKEN_BUDGETS.get(call_site, PROMPT_TOKEN_BUDGETS["default"])
+        self.sections: Dict[str, _Section] = {}
+
+    def fixed(self, name: str, text) -> "PromptBuilder":
+        self.sections[name] = _Section(name, str(text), None, 0, "")
+        return self
+
+    def add(self, name: str, content: Union[str, List[str]], priority: int = 1, min_tokens: int = 0, joiner: str = "\n") -> "PromptBuilder":
+        self.sections[name] = _Section(name, content, priority, min_tokens, joiner)
+        return self
+
+    def render(self, template: str) -> str:
+        overhead = count_tokens(template.format(**{name: "" for name in self.sections}))
+        total = overhead + sum(s.tokens for s in self.sections.values())
+        excess = total - self.budget
+        trimmed = 0
+        if excess > 0:
+            trimmable = sorted((s for s in self.sections.values() if s.priority is not None), key=lambda s: s.priority)
+            for section in trimmable:
+                if excess <= 0:
+                    break
+                before = section.tokens
+                section.shrink_to(max(section.min_tokens, before - excess))
+                cut = before - section.tokens
+                excess -= cut
+                trimmed += cut
+        prompt = template.format(**{name: s.render() for name, s in self.sections.items()})
+        token_usage.record_prompt(self.call_site, count_tokens(prompt), trimmed)
+        return prompt
+
+
+class TokenUsage:
+    """Prompt/completion tokens and budget trimming per call site"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _site(self, call_site: str) -> Dict[str, int]:
+        return self.counters.setdefault(call_site, {
+            "requests": 0, "input_tokens": 0, "output_tokens": 0,
+            "prompts_built": 0, "prompts_trimmed": 0, "tokens_trimmed": 0,
+        })
+
+    def record_prompt(self, call_site: str, tokens: int, trimmed: int):
+        with self._lock:
+            site = self._site(call_site)
+            site["prompts_built"] += 1
+            if trimmed:
+                site["prompts_trimmed"] += 1
+                site["tokens_trimmed"] += trimmed
+
+    def record_completion(self, call_site: str, input_tokens: int, output_tokens: int):
+        with self._lock:
+            site = self._site(call_site)
+            site["requests"] += 1
+            site["input_tokens"] += input_tokens
+            site["output_tokens"] += output_tokens
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                site: {
+                    **c,
+                    "budget": PROMPT_TOKEN_BUDGETS.get(site, PROMPT_TOKEN_BUDGETS["default"]),
+                    "avg_input_tokens": round(c["input_tokens"] / c["requests"]) if c["requests"] else 0,
+                    "avg_output_tokens": round(c["output_tokens"] / c["requests"]) if c["requests"] else 0,
+                }
+                for site, c in self.counters.items()
+            }
+
+
+token_usage = TokenUsage()
@@ -1,15 +1,9 @@
-from openai import OpenAI
 import random
-from typing import List, Dict
-from .config import SKILL_CATEGORIES, OPENROUTER_API_KEY, OPENROUTER_BASE_URL, MODEL_NAME
+from typing import List, Dict, Optional
+from .config import SKILL_CATEGORIES, QUESTION_FOCUS_AREAS
+from .llm_client import chat_completion, run_blocking
 
 class QuestionGenerator:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=OPENROUTER_API_KEY,
-            base_url=OPENROUTER_BASE_URL
-        )
-
     # 1️⃣ FIRST QUESTION (GENERIC)
     def generate_general_intro_question(self) -> str:
         return (
@@ -19,8 +13,21 @@ class QuestionGenerator:
 
     # 2️⃣ TECHNICAL QUESTIONS (CATEGORY LOCKED)
     def generate_initial_skill_questions(
-        self, skill_category: str, candidate_level: str = "mid"
+        self, skill_category: str, candidate_level: str = "mid", focus_area: Optional[str] = None
     ) -> List[str]:
+        """Sync wrapper around generate_initial_skill_questions_async"""
+        return run_blocking(
+            self.generate_initial_skill_questions_async(skill_category, candidate_level, focus_area)
+        )
+
+    async def generate_initial_skill_questions_async(
+        self, skill_category: str, candidate_level: str = "mid", focus_area: Optional[str] = None,
+        fallback: bool = True
+    ) -> List[str]:
+        """
+        Up to five questions for the domain. With fallback=False LLM errors are
+        raised instead of returning the static fallback_questions.
+        """
 
         skills = SKILL_CATEGORIES.get(skill_category, [])
         skills_text = ", ".join(skills[:6]) if skills else skill_category
@@ -40,21 +47,21 @@ class QuestionGenerator:
         Each must be strictly related to the domain.
         
         IMPORTANT: Vary the questions. Do not use the same standard questions every time.
-        Focus on: {random.choice(['performance and optimization', 'security and best practices', 'architecture and design', 'debugging and troubleshooting', 'modern features and updates'])}
+        Focus on: {focus_area or random.choice(QUESTION_FOCUS_AREAS)}
         """
 
         try:
-            res = self.client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[{"role": "user", "content": prompt}],
+            content = await chat_completion(
+                [{"role": "user", "content": prompt}],
                 temperature=0.9, # Increased for variance
-                max_tokens=250
+                max_tokens=250,
+                call_site="skill_questions",
+                bypass_cache=True  # random focus area; caching would defeat the variance
             )
 
             import re
             # Clean up leading numbers (1. Question -> Question)
             cleaned_questions = []
-            content = res.choices[0].message.content
             if content:
                 for q in [x for x in content.split("\n") if x.strip().endswith("?")]:
                     cleaned = re.sub(r'^\d+[\.\)]\s*', '', q.strip())
@@ -63,7 +70,9 @@ class QuestionGenerator:
             return cleaned_questions[:5] # Ensure max 5
 
         except Exception:
-            return self._fallback(skill_category)
+            if not fallback:
+                raise
+            return self.fallback_questions(skill_category)
 
     def generate_behavioral_question_ai(
         self,
@@ -90,7 +99,8 @@ class QuestionGenerator:
         )
 
 
-    def _fallback(self, category: str) -> List[str]:
+    def fallback_questions(self, category: str) -> List[str]:
+        """Static questions for the category, used when the LLM is unavailable"""
         skills = SKILL_CATEGORIES.get(category, [])
         if not skills:
             return [
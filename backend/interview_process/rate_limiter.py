@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Requests-per-minute / tokens-per-minute budget.
+
+    State is guarded by a thread lock and waiting is done with asyncio.sleep,
+    so one bucket can be shared by the app loop and the sync bridge loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # Requests larger than the whole bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) tokens after the fact"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class AIMDWindow:
+    """
+    Adaptive concurrency limit: +1 per window of successes, halved on
+    throttling or timeouts. Waiters are queued FIFO and woken across loops
+    with call_soon_threadsafe.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 64):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._waiters:
+                self.in_flight += 1
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.done() and not waiter.cancelled():
+                    # Slot was handed to us just before cancellation; pass it on
+                    self.in_flight -= 1
+                    self._wake()
+                else:
+                    try:
+                        self._waiters.remove((loop, waiter))
+                    except ValueError:
+                        pass  # already granted; _deliver returns the slot
+            raise
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._deliver, waiter)
+
+    def _deliver(self, waiter: asyncio.Future):
+        if waiter.cancelled():
+            # Cancelled after being granted a slot: hand it to the next waiter
+            with self._lock:
+                self.in_flight -= 1
+                self._wake()
+        else:
+            waiter.set_result(None)
+
+    def release(self, throttled: bool = False, succeeded: bool = True):
+        with self._lock:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif succeeded:
+                self.limit = min(self.maximum, self.limit + 1.0 / max(1.0, self.limit))
+            self._wake()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+
+class KeyLimiter:
+    """RPM + TPM token buckets and an AIMD window for one API key"""
+
+    def __init__(self, rpm: int, tpm: int, initial_concurrency: int, max_concurrency: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.window = AIMDWindow(initial_concurrency, maximum=max_concurrency)
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """Wait for a concurrency slot and RPM/TPM budget; returns seconds waited"""
+        started = time.monotonic()
+        await self.window.acquire()
+        try:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+        except BaseException:
+            self.window.release(succeeded=False)
+            raise
+        waited = time.monotonic() - started
+        self.waits += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def release(self, estimated_tokens: int, used_tokens: int = 0, throttled: bool = False, succeeded: bool = True):
+        if used_tokens:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+        self.window.release(throttled=throttled, succeeded=succeeded)
+
+    def stats(self) -> Dict:
+        return {
+            "concurrency_limit": round(self.window.limit, 2),
+            "in_flight": self.window.in_flight,
+            "queue_depth": self.window.queued,
+            "avg_wait": round(self.total_wait / self.waits, 3) if self.waits else 0.0,
+            "max_wait": round(self.max_wait, 3),
+            "rpm_available": int(self.requests.tokens),
+            "tpm_available": int(self.tokens.tokens),
+        }
+
+
+def estimate_tokens(messages, max_tokens: int) -> int:
+    """Rough prompt + completion token count (~4 characters per token)"""
+    return sum(len(m.get("content") or "") for m in messages) // 4 + max_tokens
@@ -1,37 +1,31 @@
-from openai import OpenAI
+import asyncio
 import re
 from typing import Dict, List, Tuple
-from .config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, MODEL_NAME, SKILL_CATEGORIES
+from .llm_client import chat_completion, run_blocking
+from .structured_output import AnswerEvaluation, AnswerEvaluationBatch, IntroAnalysis
+from .prompt_builder import PromptBuilder
 from .utils import extract_skills, analyze_response_quality
 from .skill_mapper import map_skills_to_category
+from .skill_matcher import skill_matcher
 
 class ResponseAnalyzer:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=OPENROUTER_API_KEY,
-            base_url=OPENROUTER_BASE_URL
+    async def _complete(self, messages: List[Dict], temperature: float, max_tokens: int, call_site: str, response_model=None):
+        """Chat completion routed across the configured providers/keys"""
+        return await chat_completion(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            call_site=call_site,
+            response_model=response_model
         )
 
     def _fallback_analysis(self, response: str) -> Dict:
         """Fallback analysis when AI analysis fails"""
-        from .utils import extract_skills
-        
-        skills = extract_skills(response)
-        
-        # Simple skill categorization
-        skill_counts = {cat: 0 for cat in SKILL_CATEGORIES}
-        
-        for skill in skills:
-            s = skill.lower()
-            for cat, keywords in SKILL_CATEGORIES.items():
-                for k in keywords:
-                    if k.lower() in s:
-                        skill_counts[cat] += 1
+        # Skills and per-category counts in one pass over the response
+        skills, skill_counts = skill_matcher.match(response)
         
         # Determine primary skill
-        primary_skill = max(skill_counts, key=skill_counts.get) if skill_counts else "backend"
-        if skill_counts.get(primary_skill, 0) == 0:
-            primary_skill = "backend"
+        primary_skill = skill_matcher.primary_category(skill_counts, default="backend")
         
         # Estimate experience level based on word count and content
         word_count = len(response.split())
@@ -81,89 +75,20 @@ class ResponseAnalyzer:
 
 
 
-    def _parse_intro_analysis(self, analysis_text: str, original_response: str) -> Dict:
-        """Parse introduction analysis with detailed metrics"""
-        # Initialize with defaults
+    def _build_intro_analysis(self, analysis: IntroAnalysis, original_response: str) -> Dict:
+        """Turn the validated AI analysis into the introduction metrics"""
+        skills = [skill.lower() for skill in analysis.skills]
         result = {
-            "skills": [],
-            "experience": "mid",
-            "primary_skill": "frontend",
-            "confidence": "medium",
-            "communication": "adequate",
-            "projects_mentioned": 0,
+            "skills": skills,
+            "experience": self._categorize_experience(analysis.experience_level),
+            "primary_skill": self._extract_skill_from_text(", ".join(skills) or analysis.primary_technical_area),
+            "confidence": self._categorize_confidence(analysis.confidence),
+            "communication": self._categorize_communication(analysis.communication),
+            "projects_mentioned": analysis.projects_mentioned,
             "word_count": len(original_response.split()),
             "intro_score": 7
         }
         
-        # If analysis_text is empty or too short, use fallback
-        if not analysis_text or len(analysis_text.strip()) < 20:
-            print("AI analysis text too short, using enhanced fallback")
-            return self._enhanced_fallback_analysis(original_response)
-        
-        lines = analysis_text.strip().split('\n')
-        
-        # Try to extract information with multiple patterns
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            line_lower = line.lower()
-            
-            # Extract skills with multiple patterns
-            if "skill" in line_lower and ("primary" in line_lower or "main" in line_lower or ":" in line):
-                if ":" in line:
-                    parts = line.split(":", 1)
-                    if len(parts) > 1:
-                        skill_text = parts[1].strip()
-                        # Extract skill from text
-                        skill = self._extract_skill_from_text(skill_text)
-                        if skill:
-                            result["primary_skill"] = skill
-            
-            # Extract experience level
-            elif "experience" in line_lower and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    exp_text = parts[1].strip().lower()
-                    result["experience"] = self._categorize_experience(exp_text)
-            
-            # Extract confidence
-            elif "confidence" in line_lower and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    conf_text = parts[1].strip().lower()
-                    result["confidence"] = self._categorize_confidence(conf_text)
-            
-            # Extract communication
-            elif "communication" in line_lower and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    comm_text = parts[1].strip().lower()
-                    result["communication"] = self._categorize_communication(comm_text)
-            
-            # Extract projects count
-            elif "project" in line_lower and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    try:
-                        result["projects_mentioned"] = int(parts[1].strip())
-                    except:
-                        # Try to extract number from text
-                        numbers = re.findall(r'\d+', parts[1])
-                        if numbers:
-                            result["projects_mentioned"] = int(numbers[0])
-            
-            # Extract all skills mentioned (not just primary)
-            elif "skill" in line_lower and ":" in line and "primary" not in line_lower and "main" not in line_lower:
-                parts = line.split(":", 1)
-                if len(parts) > 1:
-                    skills_text = parts[1].strip()
-                    # Parse comma-separated skills
-                    skills = [s.strip().lower() for s in skills_text.split(",") if s.strip()]
-                    if skills:
-                        result["skills"] = skills
-        
         # If no skills extracted, use fallback extraction
         if not result["skills"]:
             result["skills"] = extract_skills(original_response)
@@ -182,15 +107,11 @@ class ResponseAnalyzer:
         """Extract skill category from text using config first"""
         text_lower = text.lower()
         
-        # Use config-driven mapping first (Source of Truth)
-        try:
-            from .config import SKILL_CATEGORIES
-            for category, keywords in SKILL_CATEGORIES.items():
-                for keyword in keywords:
-                    if keyword.lower() in text_lower:
-                        return category
-        except ImportError:
-            pass # Fallback to hardcoded if import fails
+        # Use config-driven mapping first (Source of Truth): first category in config order with a match
+        _, counts = skill_matcher.match(text)
+        for category, count in counts.items():
+            if count:
+                return category
             
         skill_mapping = {
             "backend": ["backend", "back-end", "server", "api", "database", "python", "java", "node", "spring"],
@@ -456,6 +377,10 @@ class ResponseAnalyzer:
         }
 
     def evaluate_answer(self, question: str, answer: str) -> Dict:
+        """Evaluate candidate's answer quality with detailed scoring (sync wrapper)"""
+        return run_blocking(self.evaluate_answer_async(question, answer))
+
+    async def evaluate_answer_async(self, question: str, answer: str) -> Dict:
         """Evaluate candidate's answer quality with detailed scoring"""
         
         # First, get basic metrics
@@ -482,105 +407,91 @@ class ResponseAnalyzer:
             - Examples provided?
             - Structure and organization?
             
-            Provide scores in this exact format:
-            Technical Accuracy: [score]
-            Completeness: [score]
-            Clarity: [score]
-            Depth: [score]
-            Practicality: [score]
-            Overall: [average score]
-            Strengths: [1-2 key strengths]
-            Weaknesses: [1-2 areas for improvement]
+            Return JSON with numeric scores for technical_accuracy, completeness,
+            clarity, depth, practicality and overall (their average), plus
+            "strengths" and "weaknesses" as lists of 1-2 short points each.
         """
         
         try:
-            evaluation = self.client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
+            evaluation = await self._complete(
+                [
                     {"role": "system", "content": "You are a technical interviewer evaluating answers. Be fair but critical."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.4,
-                max_tokens=250
+                max_tokens=250,
+                call_site="answer_evaluation",
+                response_model=AnswerEvaluation
             )
             
-            eval_text = evaluation.choices[0].message.content # type: ignore
-            return self._parse_detailed_evaluation(eval_text, word_count, metrics)
+            return self._score_evaluation(evaluation, word_count, metrics)
             
         except Exception as e:
             print(f"AI evaluation error: {e}")
-            # Fallback to rule-based scoring
-            return self._fallback_evaluation(question, answer, word_count, metrics)
+            # Fallback to rule-based scoring, flagged so it can be re-scored later
+            result = self._fallback_evaluation(question, answer, word_count, metrics)
+            result["needs_reevaluation"] = True
+            return result
 
-    def _parse_detailed_evaluation(self, eval_text: str, word_count: int, metrics: Dict) -> Dict:
-        """Parse detailed AI evaluation"""
-        scores = {
-            "technical_accuracy": 5,
-            "completeness": 5,
-            "clarity": 5,
-            "depth": 5,
-            "practicality": 5,
-            "overall": 5,
-            "strengths": [],
-            "weaknesses": []
-        }
-        
-        lines = eval_text.strip().split('\n')
-        strengths_found = False
-        weaknesses_found = False
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Parse scores
-            if "technical accuracy:" in line_lower:
-                try:
-                    scores["technical_accuracy"] = float(line.split(":", 1)[1].strip())
-                except:
-                    pass
-            elif "completeness:" in line_lower:
-                try:
-                    scores["completeness"] = float(line.split(":", 1)[1].strip())
-                except:
-                    pass
-            elif "clarity:" in line_lower:
-                try:
-                    scores["clarity"] = float(line.split(":", 1)[1].strip())
-                except:
-                    pass
-            elif "depth:" in line_lower:
-                try:
-                    scores["depth"] = float(line.split(":", 1)[1].strip())
-                except:
-                    pass
-            elif "practicality:" in line_lower:
-                try:
-                    scores["practicality"] = float(line.split(":", 1)[1].strip())
-                except:
-                    pass
-            elif "overall:" in line_lower:
-                try:
-                    scores["overall"] = float(line.split(":", 1)[1].strip())
-                except:
-                    pass
-            
-            # Parse strengths and weaknesses
-            elif "strengths:" in line_lower:
-                strengths_found = True
-                weaknesses_found = False
-                strength_text = line.split(":", 1)[1].strip()
-                if strength_text:
-                    scores["strengths"].append(strength_text)
-            elif "weaknesses:" in line_lower:
-                strengths_found = False
-                weaknesses_found = True
-                weakness_text = line.split(":", 1)[1].strip()
-                if weakness_text:
-                    scores["weaknesses"].append(weakness_text)
-            elif strengths_found and line_lower and not line_lower.startswith(("technical", "completeness", "clarity", "depth", "practicality", "overall", "weaknesses")):
-                scores["strengths"].append(line.strip())
-            elif weaknesses_found and line_lower and not line_lower.startswith(("technical", "completeness", "clarity", "depth", "practicality", "overall", "strengths")):
-                scores["weaknesses"].append(line.strip())
+    async def evaluate_answers_async(self, items: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Evaluate several (question, answer) pairs with one structured call.
+        Items missing from the reply, or the whole batch if the call fails,
+        are evaluated individually.
+        """
+        if len(items) == 1:
+            return [await self.evaluate_answer_async(*items[0])]
+
+        entries = [
+            f"[{i}] Question: {question}\nAnswer ({len(answer.split())} words): {answer}"
+            for i, (question, answer) in enumerate(items)
+        ]
+        prompt = PromptBuilder("answer_evaluation_batch").add("entries", entries, priority=1, joiner="\n\n").render("""
+            Evaluate each of these technical interview answers independently.
+
+            {entries}
+
+            For every answer score 1-10: technical_accuracy, completeness, clarity,
+            depth, practicality and overall (their average). Ideal length is 80-200
+            words; reward examples and correct technical terms.
+            Return JSON with an "evaluations" list holding one object per answer,
+            each with its "index", the scores, and 1-2 "strengths" and "weaknesses".
+        """)
+
+        results: List = [None] * len(items)
+        try:
+            batch = await self._complete(
+                [
+                    {"role": "system", "content": "You are a technical interviewer evaluating answers. Be fair but critical."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.4,
+                max_tokens=200 * len(items),
+                call_site="answer_evaluation_batch",
+                response_model=AnswerEvaluationBatch
+            )
+            for evaluation in batch.evaluations:
+                if 0 <= evaluation.index < len(items) and results[evaluation.index] is None:
+                    _, answer = items[evaluation.index]
+                    results[evaluation.index] = self.score_evaluation(evaluation, answer)
+        except Exception as e:
+            print(f"AI batch evaluation error: {e}")
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        retried = await asyncio.gather(*[self.evaluate_answer_async(*items[i]) for i in missing])
+        for i, result in zip(missing, retried):
+            results[i] = result
+        return results
+
+    def score_evaluation(self, evaluation: AnswerEvaluation, answer: str) -> Dict:
+        """Evaluation dict from a parsed AI evaluation of `answer`, with the length and content adjustments"""
+        return self._score_evaluation(evaluation, len(answer.split()), analyze_response_quality(answer))
+
+    def _score_evaluation(self, evaluation: AnswerEvaluation, word_count: int, metrics: Dict) -> Dict:
+        """Apply answer-length and content adjustments to the AI scores"""
+        scores = evaluation.model_dump(exclude={"index"})
+        scores["strengths"] = scores["strengths"][:2]
+        scores["weaknesses"] = scores["weaknesses"][:2]
         
         # Adjust based on word count (80-200 words ideal for technical answers)
         if 80 <= word_count <= 200:
@@ -612,6 +523,10 @@ class ResponseAnalyzer:
         
         return scores
 
+    def build_local_evaluation(self, question: str, answer: str, metrics: Dict) -> Dict:
+        """Rule-based evaluation dict from analyze_response_quality metrics, no LLM call"""
+        return self._fallback_evaluation(question, answer, metrics["word_count"], metrics)
+
     def _fallback_evaluation(self, question: str, answer: str, word_count: int, metrics: Dict) -> Dict:
         """Fallback evaluation when AI fails"""
         base_score = 5
@@ -701,14 +616,22 @@ class ResponseAnalyzer:
         
         return False, ""
     
+    def analyze_introduction_heuristic(self, response: str) -> Dict:
+        """Keyword-based introduction analysis, no LLM call (same fields as analyze_introduction)"""
+        return self._enhanced_fallback_analysis(response)
+
     def analyze_introduction(self, response: str) -> Dict:
+        """Analyze candidate's introduction with better AI analysis (sync wrapper)"""
+        return run_blocking(self.analyze_introduction_async(response))
+
+    async def analyze_introduction_async(self, response: str) -> Dict:
         """Analyze candidate's introduction with better AI analysis"""
-        prompt = f"""
+        prompt = PromptBuilder("intro_analysis").add("response", response, priority=1, min_tokens=100).render("""
             Analyze the candidate's introduction as a technical recruiter conducting a
             medium-difficulty interview.
 
             Response:
-            {response[:500]}
+            {response}
 
             Evaluation guidelines:
             - Be fair and slightly liberal in interpretation, but do NOT overestimate the
@@ -717,27 +640,26 @@ class ResponseAnalyzer:
             - Assume a junior-to-mid level candidate unless strong evidence suggests otherwise.
             - Avoid generic assumptions or exaggerated classifications.
 
-            Provide the analysis in EXACTLY the following format:
+            Provide the analysis as JSON with these fields:
 
-            Skills: [comma-separated list of specific technical skills explicitly mentioned or strongly implied]
-            Experience Level: [junior/mid/senior]
-            Primary Technical Area: [backend/frontend/fullstack/devops/data/mobile]
-            Confidence: [low/medium/high]
-            Communication: [weak/adequate/strong]
-            Projects Mentioned: [number]
+            skills: [list of specific technical skills explicitly mentioned or strongly implied]
+            experience_level: junior/mid/senior
+            primary_technical_area: backend/frontend/fullstack/devops/data/mobile
+            confidence: low/medium/high
+            communication: weak/adequate/strong
+            projects_mentioned: number
 
             Evaluation focus:
             - Technical skills demonstrated (not guessed)
             - Clarity and structure of the introduction
             - Evidence of hands-on or project experience
             - Professional tone and confidence level
-        """
+        """)
         
         try:
             print("[DEBUG] Sending to AI for analysis...")
-            response_analysis = self.client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
+            analysis = await self._complete(
+                [
                     {"role": "system", "content": '''
                             You are a technical recruiter evaluating candidate responses during an interview. Analyze each answer carefully and provide specific, detailed, and objective feedback based strictly on the content provided.
                             Evaluate the candidate liberally and fairly, recognizing effort, clarity, and correct reasoning, but do not inflate scores or assessments beyond what the response genuinely demonstrates.
@@ -752,13 +674,12 @@ class ResponseAnalyzer:
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,  # Slightly higher temperature for more varied responses
-                max_tokens=250
+                max_tokens=250,
+                call_site="intro_analysis",
+                response_model=IntroAnalysis
             )
             
-            analysis_text = response_analysis.choices[0].message.content # type: ignore
-            # (f"[DEBUG] AI Response:\n{analysis_text}")
-            
-            return self._parse_intro_analysis(analysis_text, response)
+            return self._build_intro_analysis(analysis, response)
         except Exception as e:
             print(f"[DEBUG] AI analysis error: {e}")
             return self._enhanced_fallback_analysis(response)
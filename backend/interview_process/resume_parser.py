@@ -1,38 +1,61 @@
-import PyPDF2
-import docx
 import io
+import os
+import docx
+from pypdf import PdfReader
+
+
+class ExtractionTimeout(Exception):
+    """Raised inside an extraction worker when a file takes too long to parse"""
+
+
+def _pdf_text(file, max_pages=None, max_chars=None) -> str:
+    reader = PdfReader(file)
+    parts, size = [], 0
+    for page in reader.pages[:max_pages]:
+        text = (page.extract_text() or "") + "\n"
+        parts.append(text)
+        size += len(text)
+        if max_chars and size >= max_chars:
+            break
+    return "".join(parts)[:max_chars]
 
-def parse_pdf(file) -> str:
+
+def _docx_text(file, max_chars=None) -> str:
+    doc = docx.Document(file)
+    parts, size = [], 0
+    for para in doc.paragraphs:
+        parts.append(para.text + "\n")
+        size += len(para.text) + 1
+        if max_chars and size >= max_chars:
+            break
+    return "".join(parts)[:max_chars]
+
+
+def parse_pdf(file, max_pages=None) -> str:
     """Extract text from a PDF file."""
     try:
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return _pdf_text(file, max_pages)
     except Exception as e:
         return f"Error parsing PDF: {str(e)}"
 
+
 def parse_docx(file) -> str:
     """Extract text from a DOCX file."""
     try:
-        doc = docx.Document(file)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        return text
+        return _docx_text(file)
     except Exception as e:
         return f"Error parsing DOCX: {str(e)}"
 
+
 def parse_resume(uploaded_file) -> str:
     """
     Parse uploaded resume file (PDF or DOCX) and return text content.
     """
     if uploaded_file is None:
         return ""
-    
+
     file_type = uploaded_file.name.split('.')[-1].lower()
-    
+
     if file_type == 'pdf':
         return parse_pdf(uploaded_file)
     elif file_type in ['docx', 'doc']:
@@ -44,3 +67,50 @@ def parse_resume(uploaded_file) -> str:
             return stringio.read()
         except Exception as e:
             return f"Error parsing file: {str(e)}"
+
+
+def extract_resume_text(file_path: str, max_pages=None, max_chars=None) -> str:
+    """
+    Plain text of a stored PDF, DOCX or text resume, for the resume
+    pipeline. Unreadable documents fall back to decoding the raw bytes.
+    ExtractionTimeout and MemoryError are left to the caller.
+    """
+    try:
+        resume_text = ""
+        file_ext = file_path.lower().split('.')[-1]
+
+        if file_ext == 'pdf':
+            try:
+                resume_text = _pdf_text(file_path, max_pages, max_chars)
+            except (ExtractionTimeout, MemoryError):
+                raise
+            except Exception as e:
+                print(f"PDF Error: {e}")
+                # Fallback to binary decode if PDF read fails (unlikely to work but last resort)
+                with open(file_path, "rb") as f:
+                    resume_text = f.read(max_chars or -1).decode('utf-8', errors='ignore')
+
+        elif file_ext in ['docx', 'doc']:
+            try:
+                resume_text = _docx_text(file_path, max_chars)
+            except (ExtractionTimeout, MemoryError):
+                raise
+            except Exception as e:
+                print(f"DOCX Error: {e}")
+                with open(file_path, "rb") as f:
+                    resume_text = f.read(max_chars or -1).decode('utf-8', errors='ignore')
+
+        else:
+            # Text file
+            with open(file_path, "rb") as f:
+                resume_text = f.read(max_chars or -1).decode('utf-8', errors='ignore')
+
+        if not resume_text.strip():
+            resume_text = "No readable text found in resume."
+
+    except (ExtractionTimeout, MemoryError):
+        raise
+    except Exception as e:
+        print(f"Text Extraction Error ({os.path.basename(file_path)}): {e}")
+        resume_text = "Error extracting text."
+    return resume_text
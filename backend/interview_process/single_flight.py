@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of starting their own. Each
+    caller awaits through asyncio.shield, so one caller giving up (client
+    disconnect) does not cancel the result the others are waiting for.
+    Tasks are tracked per event loop since they cannot be awaited across loops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, call_site: str, outcome: str):
+        site = self.counters.setdefault(call_site, {"leaders": 0, "coalesced": 0})
+        site[outcome] += 1
+
+    async def do(self, key: str, work: Callable[[], Awaitable[T]], call_site: str = "default") -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._inflight.setdefault(loop, {})
+            task = tasks.get(key)
+            if task is None:
+                task = loop.create_task(work())
+                tasks[key] = task
+                task.add_done_callback(lambda t: self._forget(loop, key, t))
+                self._count(call_site, "leaders")
+            else:
+                self._count(call_site, "coalesced")
+        return await asyncio.shield(task)
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: str, task: asyncio.Task):
+        with self._lock:
+            tasks = self._inflight.get(loop)
+            if tasks is not None and tasks.get(key) is task:
+                del tasks[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller has gone away
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "in_flight": sum(len(tasks) for tasks in self._inflight.values()),
+                "call_sites": {site: dict(c) for site, c in self.counters.items()},
+            }
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,118 @@
+import re
+from collections import deque
+from typing import Dict, List, Tuple
+
+try:
+    from .config import SKILL_CATEGORIES
+except ImportError:
+    from config import SKILL_CATEGORIES
+
+# Words (letters/digits) and single symbols; whitespace only separates tokens.
+# Matching whole tokens gives word boundaries: "Go" never matches "good".
+_TOKEN = re.compile(r"[^\W_]+|\S")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over word tokens for all SKILL_CATEGORIES keywords.
+
+    `match` finds every keyword in one left-to-right pass over the text
+    (overlaps included, e.g. "Data" and "Data Science") and returns the
+    skills in config order plus the number of matched keywords per category.
+    Keywords are compared case-insensitively and ignoring spacing, so
+    "TCP / IP" in the text matches the keyword "TCP/IP".
+    """
+
+    def __init__(self, categories: Dict[str, List[str]] = SKILL_CATEGORIES):
+        self.categories = list(categories)
+        self.keywords: List[str] = []
+        self.keyword_categories: List[Tuple[str, ...]] = []
+        ids: Dict[Tuple[str, ...], int] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                tokens = tuple(_tokens(keyword))
+                if not tokens:
+                    continue
+                if tokens not in ids:
+                    ids[tokens] = len(self.keywords)
+                    self.keywords.append(keyword.strip())
+                    self.keyword_categories.append(())
+                kid = ids[tokens]
+                if category not in self.keyword_categories[kid]:
+                    self.keyword_categories[kid] += (category,)
+
+        # Trie
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[int, ...]] = [()]
+        for tokens, kid in ids.items():
+            state = 0
+            for token in tokens:
+                if token not in self._goto[state]:
+                    self._goto[state][token] = len(self._goto)
+                    self._goto.append({})
+                    self._out.append(())
+                state = self._goto[state][token]
+            self._out[state] += (kid,)
+
+        # Failure links (breadth first), merging the outputs of suffix states
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def _matched_ids(self, text: str) -> set:
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        found = set()
+        state = 0
+        # str.split is much cheaper than the token regex; only words with symbols are split further
+        for word in text.lower().split():
+            for token in (word,) if word.isalnum() else _TOKEN.findall(word):
+                if not state and token not in root:
+                    continue
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                if out[state]:
+                    found.update(out[state])
+        return found
+
+    def _result(self, found: set) -> Tuple[List[str], Dict[str, int]]:
+        found = sorted(found)
+        counts = {category: 0 for category in self.categories}
+        for kid in found:
+            for category in self.keyword_categories[kid]:
+                counts[category] += 1
+        return [self.keywords[kid] for kid in found], counts
+
+    def match(self, text: str) -> Tuple[List[str], Dict[str, int]]:
+        """(skills found in config order, matched keyword count per category)"""
+        return self._result(self._matched_ids(text))
+
+    def match_all(self, texts: List[str]) -> Tuple[List[str], Dict[str, int]]:
+        """Like `match` over several separate strings (e.g. a skill list), without matching across them"""
+        found = set()
+        for text in texts:
+            # One pass per string: a keyword can never span two of them
+            found |= self._matched_ids(text)
+        return self._result(found)
+
+    @staticmethod
+    def primary_category(counts: Dict[str, int], default: str = "backend") -> str:
+        best = max(counts, key=counts.get) if counts else default
+        return best if counts.get(best, 0) > 0 else default
+
+
+skill_matcher = SkillMatcher()
@@ -0,0 +1,413 @@
+import ast
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError, field_validator
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class StructuredOutputError(ValueError):
+    """LLM output could not be parsed into the requested model, even after repair"""
+
+
+def _number(value, default: float = 5.0) -> float:
+    """Accept 7, "7", "7/10" or "7.5 (good)" for a score field"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = re.search(r"-?\d+(?:\.\d+)?", str(value or ""))
+    return float(match.group()) if match else default
+
+
+def _string_list(value) -> List[str]:
+    """Accept a list, a single string or a comma/newline separated string"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip(" -•\t") for part in re.split(r"[\n,;]", value) if part.strip(" -•\t")]
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def _text(value, default: str) -> str:
+    """Accept null (the field default) and objects/lists (serialized as JSON) for a text field"""
+    if value is None:
+        return default
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class _Lenient(BaseModel):
+    """Null values take the field default; text fields also accept objects and lists"""
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _defaults(cls, value, info):
+        field = cls.model_fields[info.field_name]
+        if field.annotation is str:
+            return _text(value, field.default)
+        if value is None and field.annotation in (bool, int):
+            return field.default
+        return value
+
+
+class _Scores(_Lenient):
+    """Score fields are clamped to 1-10 instead of failing validation"""
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _coerce(cls, value, info):
+        annotation = cls.model_fields[info.field_name].annotation
+        if annotation is float:
+            return max(1.0, min(10.0, _number(value)))
+        if annotation == List[str]:
+            return _string_list(value)
+        return value
+
+
+class AnswerEvaluation(_Scores):
+    technical_accuracy: float = 5
+    completeness: float = 5
+    clarity: float = 5
+    depth: float = 5
+    practicality: float = 5
+    overall: float = 5
+    strengths: List[str] = []
+    weaknesses: List[str] = []
+
+
+class IntroAnalysis(_Lenient):
+    skills: List[str] = []
+    experience_level: str = "mid"
+    primary_technical_area: str = "backend"
+    confidence: str = "medium"
+    communication: str = "adequate"
+    projects_mentioned: int = 0
+
+    @field_validator("skills", mode="before")
+    @classmethod
+    def _skills(cls, value):
+        return _string_list(value)
+
+    @field_validator("projects_mentioned", mode="before")
+    @classmethod
+    def _projects(cls, value):
+        return int(_number(value, 0))
+
+
+class ResumeExtraction(_Lenient):
+    is_resume: bool = True
+    skills: List[str] = []
+    experience: float = 0
+    experience_level: str = "Unknown"
+    education: List[str] = []
+    roles: List[str] = []
+    summary: str = "No summary available."
+
+    @field_validator("skills", "education", "roles", mode="before")
+    @classmethod
+    def _lists(cls, value):
+        return _string_list(value)
+
+    @field_validator("experience", mode="before")
+    @classmethod
+    def _numbers(cls, value):
+        return _number(value, 0)
+
+
+class InterviewReportData(_Scores):
+    summary: str = ""
+    recommendation: str = "consider"
+    strengths: List[str] = []
+    weaknesses: List[str] = []
+    technical_score: float = 5
+    communication_score: float = 5
+    problem_solving_score: float = 5
+    detailed_feedback: str = ""
+
+
+class BatchAnswerEvaluation(AnswerEvaluation):
+    index: int = 0
+
+
+class AnswerEvaluationBatch(BaseModel):
+    evaluations: List[BatchAnswerEvaluation] = []
+
+
+class InterviewAssessment(InterviewReportData):
+    evaluations: List[BatchAnswerEvaluation] = []
+
+
+def _fields(model: Type[BaseModel]) -> Dict:
+    names = {str: "string", float: "number", int: "integer", bool: "boolean", List[str]: "array of strings"}
+    fields = {}
+    for name, field in model.model_fields.items():
+        item = (get_args(field.annotation) or (None,))[0]
+        if get_origin(field.annotation) is list and isinstance(item, type) and issubclass(item, BaseModel):
+            fields[name] = [_fields(item)]
+        else:
+            fields[name] = names.get(field.annotation, "string")
+    return fields
+
+
+def _schema_hint(model: Type[BaseModel]) -> str:
+    """Compact {field: type} description used in the system prompt"""
+    return json.dumps(_fields(model))
+
+
+# Built once at import; validators are compiled by pydantic at class creation
+SCHEMA_HINTS: Dict[type, str] = {
+    model: _schema_hint(model)
+    for model in (AnswerEvaluation, AnswerEvaluationBatch, IntroAnalysis, ResumeExtraction,
+                  InterviewReportData, InterviewAssessment)
+}
+
+
+def with_schema_instructions(messages: List[Dict], model: Type[BaseModel]) -> List[Dict]:
+    """Append the JSON contract for `model` to the system message (JSON mode needs one)"""
+    hint = SCHEMA_HINTS.get(model) or _schema_hint(model)
+    instruction = f"Respond with a single JSON object only, with these keys: {hint}"
+    messages = [dict(m) for m in messages]
+    for message in messages:
+        if message["role"] == "system":
+            message["content"] = f"{message['content']}\n\n{instruction}"
+            return messages
+    return [{"role": "system", "content": instruction}] + messages
+
+
+def _first_object(text: str) -> Optional[str]:
+    """First balanced {...} in text, closing any braces left open at the end"""
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    # Truncated output (e.g. max_tokens): close what is open
+    tail = text[start:].rstrip().rstrip(",")
+    if in_string:
+        tail += '"'
+    stack = []
+    in_string = escaped = False
+    for ch in tail:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    return tail + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Optional[dict]:
+    """Cheap local fixes for near-miss JSON: fences, prose, trailing commas, Python literals"""
+    text = text.replace("```json", "").replace("```", "").strip()
+    candidate = _first_object(text)
+    if candidate is None:
+        return None
+    candidate = re.sub(r",\s*([}\]])", r"\1", candidate)
+    try:
+        value = json.loads(candidate)
+    except json.JSONDecodeError:
+        try:
+            # Single quotes / True / False / None
+            value = ast.literal_eval(candidate)
+        except (ValueError, SyntaxError):
+            return None
+    return value if isinstance(value, dict) else None
+
+
+def _decode_partial(raw: str) -> str:
+    """Decode the body of a JSON string that may end mid-escape"""
+    trailing = len(raw) - len(raw.rstrip("\\"))
+    if trailing % 2:
+        raw = raw[:-1]
+    raw = re.sub(r"\\u[0-9a-fA-F]{0,3}$", "", raw)
+    try:
+        text = json.loads(f'"{raw}"', strict=False)
+    except json.JSONDecodeError:
+        return raw
+    # Hold back half of a surrogate pair until the other half arrives
+    return text[:-1] if text and "\ud800" <= text[-1] <= "\udbff" else text
+
+
+def _decode_value(raw: str) -> Any:
+    raw = raw.strip()
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(re.sub(r",\s*([}\]])", r"\1", raw))
+    except json.JSONDecodeError:
+        return raw
+
+
+class StreamingFieldParser:
+    """
+    Incremental reader for a JSON object arriving in chunks.
+
+    feed() returns events as soon as they are known: ("delta", key, text)
+    while a top-level string value is streaming, and ("field", key, value)
+    when a top-level value is complete. Nested values are buffered and
+    decoded whole. Validate the joined text with StructuredParser at the end;
+    these events are for display only.
+    """
+
+    def __init__(self):
+        self.mode = "start"
+        self.key: Optional[str] = None
+        self.target = "key"
+        self.raw: List[str] = []
+        self.emitted = ""
+        self.escaped = False
+        self.nesting = 0
+        self.nested_string = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        events = []
+        for ch in chunk:
+            self._step(ch, events)
+        if self.mode == "string" and self.target == "value":
+            self._delta(events, _decode_partial("".join(self.raw)))
+        return events
+
+    def _delta(self, events: List, text: str):
+        if len(text) > len(self.emitted):
+            events.append(("delta", self.key, text[len(self.emitted):]))
+            self.emitted = text
+
+    def _step(self, ch: str, events: List):
+        mode = self.mode
+        if mode == "start":
+            if ch == "{":
+                self.mode = "key"
+        elif mode == "key":
+            if ch == '"':
+                self.mode, self.target, self.raw = "string", "key", []
+            elif ch == "}":
+                self.mode = "done"
+        elif mode == "colon":
+            if ch == ":":
+                self.mode = "value"
+        elif mode == "value":
+            if ch.isspace():
+                return
+            if ch == '"':
+                self.mode, self.target, self.raw, self.emitted = "string", "value", [], ""
+            elif ch in "{[":
+                self.mode, self.raw, self.nesting, self.nested_string = "nested", [ch], 1, False
+            else:
+                self.mode, self.raw = "scalar", [ch]
+        elif mode == "string":
+            if self.escaped:
+                self.escaped = False
+            elif ch == "\\":
+                self.escaped = True
+            elif ch == '"':
+                text = _decode_partial("".join(self.raw))
+                if self.target == "key":
+                    self.key, self.mode = text, "colon"
+                else:
+                    self._delta(events, text)
+                    events.append(("field", self.key, text))
+                    self.mode = "after"
+                return
+            self.raw.append(ch)
+        elif mode == "nested":
+            self.raw.append(ch)
+            if self.nested_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.nested_string = False
+            elif ch == '"':
+                self.nested_string = True
+            elif ch in "{[":
+                self.nesting += 1
+            elif ch in "}]":
+                self.nesting -= 1
+                if self.nesting == 0:
+                    events.append(("field", self.key, _decode_value("".join(self.raw))))
+                    self.mode = "after"
+        elif mode == "scalar":
+            if ch in ",}":
+                events.append(("field", self.key, _decode_value("".join(self.raw))))
+                self.mode = "key" if ch == "," else "done"
+            else:
+                self.raw.append(ch)
+        elif mode == "after":
+            if ch == ",":
+                self.mode = "key"
+            elif ch == "}":
+                self.mode = "done"
+
+
+class StructuredParser:
+    """Validates LLM output against pydantic models and counts outcomes per LLM model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, llm_model: str, outcome: str):
+        with self._lock:
+            site = self.counters.setdefault(llm_model, {"parsed": 0, "repaired": 0, "failed": 0})
+            site[outcome] += 1
+
+    def parse(self, text: str, model: Type[M], llm_model: str = "unknown") -> M:
+        try:
+            result = model.model_validate_json(text)
+            self._count(llm_model, "parsed")
+            return result
+        except ValidationError:
+            pass
+        data = repair_json(text or "")
+        if data is not None:
+            try:
+                result = model.model_validate(data)
+                self._count(llm_model, "repaired")
+                return result
+            except ValidationError:
+                pass
+        self._count(llm_model, "failed")
+        raise StructuredOutputError(f"{llm_model} returned output that does not match {model.__name__}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                llm_model: {
+                    **c,
+                    "failure_rate": round(c["failed"] / max(1, sum(c.values())), 3),
+                }
+                for llm_model, c in self.counters.items()
+            }
+
+
+structured_parser = StructuredParser()
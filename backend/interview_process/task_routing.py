@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from .config import (
+    PROVIDER_MODELS,
+    PROVIDER_MODEL_TIERS,
+    LLM_TASK_ROUTES,
+    LLM_TASK_SLO_WINDOW,
+    LLM_TASK_SLO_MIN_SAMPLES,
+    LLM_TASK_ESCALATION_SECONDS,
+)
+
+
+class TaskRouter:
+    """
+    Chooses the model size tier for each call site and tracks its SLOs.
+
+    Every completion reports its latency and whether the output was usable
+    (parsed into the requested model, or non-empty text). When a small-tier
+    task's recent failure rate exceeds its quality SLO, the task is served
+    by the large tier for `escalation_seconds`, then tried on the small tier
+    again with a fresh window. Latency SLOs are reported, not enforced.
+    """
+
+    def __init__(self, routes: Dict[str, Dict] = LLM_TASK_ROUTES, window: int = LLM_TASK_SLO_WINDOW,
+                 min_samples: int = LLM_TASK_SLO_MIN_SAMPLES, escalation_seconds: float = LLM_TASK_ESCALATION_SECONDS):
+        self.routes = routes
+        self.window = window
+        self.min_samples = min_samples
+        self.escalation_seconds = escalation_seconds
+        self._lock = threading.Lock()
+        # (call_site, tier) -> recent (latency, ok) samples
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, bool]]] = {}
+        self._escalated_until: Dict[str, float] = {}
+        self.escalations: Dict[str, int] = {}
+
+    def route(self, call_site: str) -> Dict:
+        return self.routes.get(call_site, self.routes["default"])
+
+    def tier_for(self, call_site: str) -> str:
+        tier = self.route(call_site)["tier"]
+        if tier == "small":
+            with self._lock:
+                until = self._escalated_until.get(call_site)
+                if until is not None:
+                    if time.monotonic() < until:
+                        return "large"
+                    del self._escalated_until[call_site]
+                    self._samples.pop((call_site, "small"), None)
+        return tier
+
+    @staticmethod
+    def model_for(provider: str, tier: Optional[str]) -> str:
+        return PROVIDER_MODEL_TIERS.get(provider, {}).get(tier) or PROVIDER_MODELS[provider]
+
+    def record(self, call_site: str, tier: str, latency: float, ok: bool):
+        route = self.route(call_site)
+        with self._lock:
+            samples = self._samples.setdefault((call_site, tier), deque(maxlen=self.window))
+            samples.append((latency, ok))
+            if tier != "small" or ok or len(samples) < self.min_samples:
+                return
+            failure_rate = sum(not good for _, good in samples) / len(samples)
+            if failure_rate > route["max_failure_rate"] and call_site not in self._escalated_until:
+                self._escalated_until[call_site] = time.monotonic() + self.escalation_seconds
+                self.escalations[call_site] = self.escalations.get(call_site, 0) + 1
+                print(f"Task routing: {call_site} escalated to the large tier "
+                      f"(failure rate {failure_rate:.0%} > {route['max_failure_rate']:.0%})")
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+            escalated = {site: until for site, until in self._escalated_until.items() if until > now}
+            escalations = dict(self.escalations)
+        result = {}
+        for (call_site, tier), values in sorted(samples.items()):
+            route = self.route(call_site)
+            latencies = sorted(latency for latency, _ in values)
+            p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else None
+            failure_rate = sum(not ok for _, ok in values) / len(values) if values else 0.0
+            site = result.setdefault(call_site, {
+                "tier": route["tier"],
+                "escalated": call_site in escalated,
+                "escalations": escalations.get(call_site, 0),
+                "latency_slo": route["latency_slo"],
+                "max_failure_rate": route["max_failure_rate"],
+                "tiers": {},
+            })
+            site["tiers"][tier] = {
+                "samples": len(values),
+                "p95_latency": round(p95, 3) if p95 is not None else None,
+                "failure_rate": round(failure_rate, 3),
+                "latency_slo_met": p95 is not None and p95 <= route["latency_slo"],
+                "quality_slo_met": failure_rate <= route["max_failure_rate"],
+            }
+        return result
+
+
+task_router = TaskRouter()
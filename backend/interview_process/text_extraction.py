@@ -0,0 +1,212 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from .config import (
+    TEXT_EXTRACTION_WORKERS,
+    TEXT_EXTRACTION_TIMEOUT,
+    TEXT_EXTRACTION_MAX_PAGES,
+    TEXT_EXTRACTION_MAX_CHARS,
+    TEXT_EXTRACTION_MEMORY_MB,
+)
+from .resume_parser import ExtractionTimeout, extract_resume_text
+
+try:
+    import resource
+except ImportError:  # POSIX-only; the alarm and the parent-side timeout still apply
+    resource = None
+
+FAILED_TEXT = "Error extracting text."
+# Time the parent waits past the in-worker alarm before abandoning the pool
+_GRACE_SECONDS = 5.0
+
+
+class ExtractionFailed(Exception):
+    """Extraction did not produce text; `outcome` is 'timeout', 'memory_limit' or 'error'"""
+
+    def __init__(self, outcome: str):
+        super().__init__(f"text extraction {outcome}")
+        self.outcome = outcome
+
+    @property
+    def retryable(self) -> bool:
+        # Timeouts and memory limits come from the file itself and would recur
+        return self.outcome == "error"
+
+
+def _init_worker(memory_mb: int):
+    """Cap the worker's address space so a hostile file raises MemoryError instead of exhausting the host"""
+    if resource is None:
+        print("Text extraction: memory limit not applied (no resource module)")
+        return
+    try:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        # A worker stopped by its CPU limit must not leave a core file behind
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    except (ValueError, OSError) as e:
+        print(f"Text extraction: memory limit not applied ({e})")
+
+
+def _set_cpu_limit(seconds: Optional[float]):
+    """
+    Soft CPU-time limit `seconds` from now (None: back to the hard limit).
+    The kernel ends the worker with SIGXCPU when it is exceeded, which also
+    covers long C calls during which the alarm handler cannot run.
+    """
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        soft = hard
+    else:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as e:
+        print(f"Text extraction: CPU limit not applied ({e})")
+
+
+def _on_alarm(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _extract_in_worker(file_path: str, timeout: float, max_pages: int, max_chars: int) -> Tuple[str, str]:
+    """Runs in a pool process; returns (outcome, text)"""
+    import signal
+    alarm = hasattr(signal, "setitimer")
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    _set_cpu_limit(timeout + _GRACE_SECONDS)
+    try:
+        return "ok", extract_resume_text(file_path, max_pages, max_chars)
+    except ExtractionTimeout:
+        return "timeout", FAILED_TEXT
+    except MemoryError:
+        return "memory_limit", FAILED_TEXT
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        _set_cpu_limit(None)
+
+
+class TextExtractor:
+    """
+    Resume text extraction off the event loop, in a pool of worker processes.
+
+    PDF and DOCX parsing is pure-Python and CPU bound, so threads would still
+    contend for the GIL; separate processes use every core. Each file is
+    limited to `max_pages` pages / `max_chars` characters and `timeout`
+    seconds (an alarm inside the worker, backed by a CPU-time limit the
+    kernel enforces), and each worker to `memory_mb` of address space. If a
+    call still does not return shortly after its alarm, the pool is abandoned
+    and recreated; the stuck worker is ended by its CPU limit.
+    """
+
+    def __init__(self, workers: int = TEXT_EXTRACTION_WORKERS, timeout: float = TEXT_EXTRACTION_TIMEOUT,
+                 max_pages: int = TEXT_EXTRACTION_MAX_PAGES, max_chars: int = TEXT_EXTRACTION_MAX_CHARS,
+                 memory_mb: int = TEXT_EXTRACTION_MEMORY_MB):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.memory_mb = memory_mb
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.counters = {"extracted": 0, "timeouts": 0, "memory_limit": 0, "errors": 0, "abandoned": 0, "pool_restarts": 0}
+        self._total_seconds = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs an event loop and client threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_mb,),
+                )
+            return self._pool
+
+    def _restart(self, pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is not pool:
+                return  # already replaced by another caller
+            self._pool = None
+            self.counters["pool_restarts"] += 1
+        # A running call cannot be cancelled; new calls go to a fresh pool meanwhile
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, file_path: str, fallback: bool = True) -> str:
+        """
+        Text of the resume at `file_path`. A file that cannot be extracted
+        gives FAILED_TEXT, or raises ExtractionFailed with fallback=False.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        for attempt in range(2):
+            pool = self._executor()
+            try:
+                future = loop.run_in_executor(pool, _extract_in_worker, file_path,
+                                              self.timeout, self.max_pages, self.max_chars)
+                outcome, text = await asyncio.wait_for(future, self.timeout + _GRACE_SECONDS)
+                break
+            except asyncio.TimeoutError:
+                print(f"Text extraction of {file_path} did not stop after {self.timeout}s; abandoning its pool")
+                self.counters["abandoned"] += 1
+                self._restart(pool)
+                outcome, text = "timeout", FAILED_TEXT
+                break
+            except BrokenProcessPool:
+                # A worker died (e.g. at its CPU limit while parsing another file); retry once on a fresh pool
+                self._restart(pool)
+                if attempt:
+                    outcome, text = "error", FAILED_TEXT
+            except Exception as e:
+                # e.g. the worker could not even import the parsers under its memory limit
+                print(f"Text extraction worker error: {e!r}")
+                outcome, text = "error", FAILED_TEXT
+                break
+
+        if outcome == "ok":
+            self.counters["extracted"] += 1
+        elif outcome == "timeout":
+            self.counters["timeouts"] += 1
+        elif outcome == "memory_limit":
+            self.counters["memory_limit"] += 1
+        else:
+            self.counters["errors"] += 1
+        self._total_seconds += time.monotonic() - started
+        if outcome != "ok":
+            print(f"Text extraction of {file_path} failed: {outcome}")
+            if not fallback:
+                raise ExtractionFailed(outcome)
+        return text
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        done = sum(self.counters[k] for k in ("extracted", "timeouts", "memory_limit", "errors"))
+        return {
+            "workers": self.workers,
+            "timeout": self.timeout,
+            "max_pages": self.max_pages,
+            "memory_mb": self.memory_mb,
+            "avg_seconds": round(self._total_seconds / done, 3) if done else None,
+            **self.counters,
+        }
+
+
+text_extractor = TextExtractor()
@@ -7,30 +7,13 @@ def format_response(text: str, color: str = None) -> str:
 def extract_skills(text: str) -> List[str]:
     """Extract technical skills from text using config (Dynamic)"""
     try:
-        from .config import SKILL_CATEGORIES
+        from .skill_matcher import skill_matcher
     except ImportError:
         return []
 
-    found_skills = []
-    text_lower = text.lower()
-    
-    # Iterate through all categories in config
-    for category, keywords in SKILL_CATEGORIES.items():
-        for keyword in keywords:
-            # Check for keyword in text (case insensitive)
-            if keyword.lower() in text_lower:
-                found_skills.append(keyword)
-    
-    # Remove duplicates while preserving order
-    unique_skills = []
-    seen = set()
-    for skill in found_skills:
-        skill_clean = skill.strip()
-        if skill_clean.lower() not in seen:
-            seen.add(skill_clean.lower())
-            unique_skills.append(skill_clean)
-            
-    return unique_skills
+    # One pass over the text with the precompiled keyword automaton
+    skills, _ = skill_matcher.match(text)
+    return skills
 
 def calculate_performance_score(responses: List[Dict]) -> float:
     """Calculate candidate performance score"""
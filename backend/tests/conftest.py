@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Isolated database and no LLM cache; must be set before the app modules are imported
+_tmp = tempfile.mkdtemp(prefix="hr_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["LOCAL_SCORER_ENABLED"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app import models  # noqa: E402,F401
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def candidate_application(db):
+    """An HR user's job and a candidate's application approved for interview"""
+    hr = models.User(email="hr@example.com", password_hash="x", full_name="HR", role="hr")
+    candidate = models.User(email="c@example.com", password_hash="x", full_name="Candidate", role="candidate")
+    db.add_all([hr, candidate])
+    db.commit()
+    job = models.Job(title="Backend Engineer", description="APIs", required_skills="Python, SQL",
+                     experience_level="mid", hr_id=hr.id)
+    db.add(job)
+    db.commit()
+    application = models.Application(
+        job_id=job.id, candidate_id=candidate.id, status="approved_for_interview",
+        resume_file_path="uploads/resume.pdf"
+    )
+    db.add(application)
+    db.commit()
+    db.add(models.ResumeExtraction(application_id=application.id, extracted_text="Python developer"))
+    db.commit()
+    return candidate, application
@@ -0,0 +1,48 @@
+import asyncio
+
+from app import models
+from app.routes import interviews
+from app.schemas import InterviewStart
+from app.services import ai_service, question_pool
+
+POOLED = [f"Pooled backend question {i}?" for i in range(8)]
+
+
+def test_interview_from_pool_has_five_uniquely_numbered_questions(db, candidate_application, monkeypatch):
+    candidate, application = candidate_application
+    question_pool.add_questions(db, "backend", "mid", "fundamentals", POOLED)
+
+    async def analysis(text):
+        return {"primary_skill": "backend", "experience": "mid"}
+
+    async def no_llm_questions(*args, **kwargs):
+        raise AssertionError("pool-served skill must not generate questions")
+
+    monkeypatch.setattr(ai_service, "analyze_introduction", analysis)
+    monkeypatch.setattr(ai_service, "generate_domain_questions", no_llm_questions)
+    monkeypatch.setattr(question_pool, "schedule_refill", lambda *args: None)
+
+    interview = asyncio.run(interviews.start_interview(
+        InterviewStart(application_id=application.id), current_user=candidate, db=db
+    ))
+
+    questions = db.query(models.InterviewQuestion).filter_by(interview_id=interview.id).all()
+    assert sorted(q.question_number for q in questions) == [1, 2, 3, 4, 5]
+    technical = [q.question_text for q in questions if q.question_type == "technical"]
+    assert len(technical) == 4 and set(technical) <= set(POOLED)
+    # Only the questions asked were marked served
+    served = db.query(models.QuestionPoolEntry).filter(models.QuestionPoolEntry.times_served > 0).count()
+    assert served == 4
+
+
+def test_refill_does_not_pool_fallback_questions(db, monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise RuntimeError("no provider")
+
+    monkeypatch.setattr("interview_process.question_generator.chat_completion", unavailable)
+    errors = question_pool.pool_stats["refill_errors"]
+
+    asyncio.run(question_pool.refill_pool("backend", "mid"))
+
+    assert question_pool.pool_stats["refill_errors"] == errors + 1
+    assert db.query(models.QuestionPoolEntry).count() == 0
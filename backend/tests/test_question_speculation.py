@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.services import question_speculation as speculation
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    yield
+    # Each test's event loop is closed by now; just forget its entries
+    speculation._pending.clear()
+    speculation._locks.clear()
+    speculation._last_used.clear()
+
+
+async def _question():
+    return {"question_text": "Next?", "question_type": "technical"}
+
+
+def test_abandoned_interviews_are_evicted_when_idle(monkeypatch):
+    async def scenario():
+        speculation.speculate(1, 1, _question)
+        speculation.lock(2)
+        monkeypatch.setattr(speculation, "SPECULATION_IDLE_SECONDS", -1)
+        speculation.speculate(3, 1, _question)
+        return await speculation.take(3, 1)
+
+    evicted = speculation.next_question_stats["evicted"]
+    question = asyncio.run(scenario())
+
+    assert question["question_text"] == "Next?"
+    assert set(speculation._pending) == set() and set(speculation._locks) == set()
+    assert list(speculation._last_used) == [3]
+    assert speculation.next_question_stats["evicted"] == evicted + 2
+
+
+def test_store_is_bounded_and_keeps_held_locks(monkeypatch):
+    monkeypatch.setattr(speculation, "SPECULATION_MAX_INTERVIEWS", 2)
+
+    async def scenario():
+        held = speculation.lock(1)
+        async with held:
+            speculation.lock(2)
+            speculation.speculate(3, 1, _question)  # evicts 2: 1 is in use
+            assert list(speculation._last_used) == [1, 3]
+            assert speculation._locks[1] is held
+        speculation.lock(4)  # 1 is free again and least recently used
+        assert list(speculation._last_used) == [3, 4]
+        assert 3 in speculation._pending
+
+    asyncio.run(scenario())
+
+
+def test_end_of_interview_discards_everything():
+    async def scenario():
+        speculation.lock(5)
+        speculation.speculate(5, 2, _question)
+        speculation.discard(5)
+
+    asyncio.run(scenario())
+
+    assert 5 not in speculation._pending and 5 not in speculation._locks and 5 not in speculation._last_used
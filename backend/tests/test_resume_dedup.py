@@ -0,0 +1,76 @@
+import asyncio
+import io
+
+from fastapi import UploadFile
+
+from app import models
+from app.services import resume_queue, uploads
+from app.services.uploads import store_upload
+
+RESUME = b"Jane Doe\nBackend engineer: Python, SQL, Docker\n" * 50
+PROFILE = {"skills": ["Python", "SQL", "Docker"], "experience": 4, "experience_level": "Mid-Level",
+           "education": [], "roles": ["Backend Engineer"], "summary": "Backend engineer",
+           "is_resume": True, "parsed_by": "llm"}
+
+
+def _store(directory):
+    upload = UploadFile(io.BytesIO(RESUME), filename="resume.txt")
+    return asyncio.run(store_upload(upload, str(directory), "txt", max_size=1 << 20))
+
+
+def test_duplicate_upload_reuses_the_stored_file(tmp_path):
+    deduplicated = uploads.upload_stats["deduplicated"]
+
+    first = _store(tmp_path)
+    second = _store(tmp_path)
+
+    assert first == second
+    assert [p.name for p in tmp_path.iterdir()] == [f"{first[1]}.txt"]
+    assert uploads.upload_stats["deduplicated"] == deduplicated + 1
+
+
+def test_duplicate_resume_reuses_text_and_profile(db, candidate_application, tmp_path, monkeypatch):
+    candidate, application = candidate_application
+    other_job = models.Job(title="Platform Engineer", description="Infra", required_skills="Docker, Kubernetes",
+                           experience_level="mid", hr_id=application.job.hr_id)
+    db.add(other_job)
+    db.commit()
+
+    # The same file uploaded for two jobs
+    applications = [application, models.Application(job_id=other_job.id, candidate_id=candidate.id)]
+    for app_row in applications:
+        app_row.resume_file_path, app_row.resume_sha256, _ = _store(tmp_path)
+        db.add(app_row)
+        resume_queue.enqueue(db, app_row)
+        db.commit()
+
+    calls = {"extract": 0, "parse": 0}
+
+    async def extract(path, fallback=True):
+        calls["extract"] += 1
+        with open(path) as f:
+            return f.read()
+
+    async def parse_resume_profile(text, fallback=True):
+        calls["parse"] += 1
+        return dict(PROFILE)
+
+    monkeypatch.setattr(resume_queue.text_extractor, "extract", extract)
+    monkeypatch.setattr(resume_queue, "parse_resume_profile", parse_resume_profile)
+
+    for _ in applications:
+        job_id = resume_queue._claim(db, "worker")
+        asyncio.run(resume_queue.process_job(job_id, "worker"))
+    db.expire_all()
+
+    assert calls == {"extract": 1, "parse": 1}
+    document = db.query(models.ResumeDocument).one()
+    assert document.sha256 == applications[0].resume_sha256 == applications[1].resume_sha256
+    assert document.times_reused == 1
+    # The skill match is still computed per job
+    matches = {
+        e.application_id: e.skill_match_percentage for e in db.query(models.ResumeExtraction).all()
+    }
+    assert set(matches) == {a.id for a in applications}
+    assert matches[applications[0].id] != matches[applications[1].id]
+    assert {j.status for j in db.query(models.ResumeJob).all()} == {"completed"}
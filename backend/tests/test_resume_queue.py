@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app import models
+from app.database import SessionLocal
+from app.services import resume_queue
+
+PROFILE = {"skills": ["Python", "SQL"], "experience": 3, "experience_level": "Mid-Level",
+           "education": [], "roles": [], "summary": "Backend developer", "is_resume": True}
+
+
+def _queued_job(db, application):
+    job = resume_queue.enqueue(db, application)
+    db.commit()
+    return job.id
+
+
+def _run_due_job(db, worker_id="worker"):
+    """Claim the next due job and process it, like one worker iteration"""
+    job_id = resume_queue._claim(db, worker_id)
+    assert job_id is not None
+    asyncio.run(resume_queue.process_job(job_id, worker_id))
+    db.expire_all()
+    return db.get(models.ResumeJob, job_id)
+
+
+def _fake_extract(monkeypatch, text="Python and SQL developer"):
+    async def extract(path, fallback=True):
+        return text
+    monkeypatch.setattr(resume_queue.text_extractor, "extract", extract)
+
+
+def test_running_job_is_reclaimed_only_after_its_lease_expires(db, candidate_application):
+    _, application = candidate_application
+    job_id = _queued_job(db, application)
+    job = db.get(models.ResumeJob, job_id)
+    job.status, job.locked_by, job.attempts = "running", "dead-worker", 1
+    job.locked_at = datetime.utcnow() - timedelta(seconds=resume_queue.RESUME_JOB_LEASE_SECONDS / 2)
+    db.commit()
+
+    assert resume_queue._claim(db, "worker") is None
+
+    job.locked_at = datetime.utcnow() - timedelta(seconds=resume_queue.RESUME_JOB_LEASE_SECONDS + 1)
+    db.commit()
+    reclaimed = resume_queue.resume_queue_stats["reclaimed"]
+
+    assert resume_queue._claim(db, "worker") == job_id
+    db.expire_all()
+    job = db.get(models.ResumeJob, job_id)
+    assert (job.status, job.locked_by, job.attempts) == ("running", "worker", 2)
+    assert resume_queue.resume_queue_stats["reclaimed"] == reclaimed + 1
+    # A second worker cannot take the job while the new lease is held
+    assert resume_queue._claim(db, "other-worker") is None
+
+
+def test_reclaimed_job_past_its_last_attempt_fails(db, candidate_application, monkeypatch):
+    _, application = candidate_application
+    monkeypatch.setattr(resume_queue, "RESUME_JOB_MAX_ATTEMPTS", 2)
+    job_id = _queued_job(db, application)
+    job = db.get(models.ResumeJob, job_id)
+    job.status, job.locked_by, job.attempts = "running", "dead-worker", 2
+    job.locked_at = datetime.utcnow() - timedelta(seconds=resume_queue.RESUME_JOB_LEASE_SECONDS + 1)
+    db.commit()
+
+    job = _run_due_job(db)
+
+    assert job.status == "failed"
+    assert job.last_error == "Lease expired on the final attempt"
+
+
+def test_regex_fallback_runs_only_on_the_last_attempt(db, candidate_application, monkeypatch):
+    _, application = candidate_application
+    monkeypatch.setattr(resume_queue, "RESUME_JOB_MAX_ATTEMPTS", 3)
+    _fake_extract(monkeypatch)
+    fallbacks = []
+
+    async def parse_resume_profile(text, fallback=True):
+        fallbacks.append(fallback)
+        if not fallback:
+            raise RuntimeError("LLM unavailable")
+        return {**PROFILE, "parsed_by": "regex"}
+
+    monkeypatch.setattr(resume_queue, "parse_resume_profile", parse_resume_profile)
+    job_id = _queued_job(db, application)
+
+    for attempt in (1, 2):
+        job = _run_due_job(db)
+        assert (job.status, job.stage, job.attempts) == ("queued", "score", attempt)
+        assert job.last_error == "LLM unavailable"
+        job.next_run_at = datetime.utcnow()  # skip the backoff
+        db.commit()
+
+    job = _run_due_job(db)
+
+    assert fallbacks == [False, False, True]
+    assert (job.id, job.status, job.stage) == (job_id, "completed", "done")
+    assert db.query(models.ResumeExtraction).filter_by(application_id=application.id).one().years_of_experience == 3
+
+
+def test_job_fails_after_max_attempts(db, candidate_application, monkeypatch):
+    _, application = candidate_application
+    monkeypatch.setattr(resume_queue, "RESUME_JOB_MAX_ATTEMPTS", 2)
+    _fake_extract(monkeypatch)
+
+    async def parse_resume_profile(text, fallback=True):
+        raise RuntimeError("parser crashed")
+
+    monkeypatch.setattr(resume_queue, "parse_resume_profile", parse_resume_profile)
+    _queued_job(db, application)
+
+    job = _run_due_job(db)
+    assert job.status == "queued" and job.next_run_at > datetime.utcnow()
+    job.next_run_at = datetime.utcnow()
+    db.commit()
+
+    job = _run_due_job(db)
+    assert (job.status, job.attempts, job.last_error) == ("failed", 2, "parser crashed")
+
+
+def test_job_reclaimed_during_a_stage_is_not_processed_twice(db, candidate_application, monkeypatch):
+    _, application = candidate_application
+    _fake_extract(monkeypatch)
+    job_id = _queued_job(db, application)
+
+    async def slow_parse(text, fallback=True):
+        # Meanwhile the lease expired and another worker reclaimed the job
+        other = SessionLocal()
+        other.query(models.ResumeJob).filter_by(id=job_id).update({"locked_by": "other-worker"})
+        other.commit()
+        other.close()
+        return dict(PROFILE)
+
+    monkeypatch.setattr(resume_queue, "parse_resume_profile", slow_parse)
+    lost = resume_queue.resume_queue_stats["lease_lost"]
+
+    job = _run_due_job(db)
+
+    assert (job.status, job.stage, job.locked_by) == ("running", "score", "other-worker")
+    # The fixture's extraction was not overwritten with this worker's result
+    extraction = db.query(models.ResumeExtraction).one()
+    assert (extraction.extracted_text, extraction.years_of_experience) == ("Python developer", None)
+    assert db.query(models.Notification).count() == 0
+    assert resume_queue.resume_queue_stats["lease_lost"] == lost + 1
+
+
+def test_lease_is_renewed_during_a_long_stage(db, candidate_application, monkeypatch):
+    _, application = candidate_application
+    monkeypatch.setattr(resume_queue, "RESUME_JOB_LEASE_SECONDS", 0.3)
+    _fake_extract(monkeypatch)
+    _queued_job(db, application)
+    claims_during_stage = []
+
+    async def slow_parse(text, fallback=True):
+        await asyncio.sleep(0.6)  # twice the lease
+        other = SessionLocal()
+        claims_during_stage.append(resume_queue._claim(other, "other-worker"))
+        other.close()
+        return dict(PROFILE)
+
+    monkeypatch.setattr(resume_queue, "parse_resume_profile", slow_parse)
+
+    job = _run_due_job(db)
+
+    assert claims_during_stage == [None]
+    assert (job.status, job.attempts) == ("completed", 1)
+    assert db.query(models.Notification).count() == 1
@@ -0,0 +1,77 @@
+import re
+
+import pytest
+
+from interview_process.config import SKILL_CATEGORIES
+from interview_process.skill_matcher import SkillMatcher, skill_matcher
+
+_WORD = r"[^\W_]"
+
+
+def _tokens(text):
+    return tuple(re.findall(r"[^\W_]+|\S", text.lower()))
+
+
+def _keyword_regex(keyword):
+    """Per-keyword reference: whole words, any spacing around symbols, case-insensitive"""
+    tokens = _tokens(keyword)
+    pattern = re.escape(tokens[0])
+    for previous, token in zip(tokens, tokens[1:]):
+        separator = r"\s+" if previous[-1].isalnum() and token[0].isalnum() else r"\s*"
+        pattern += separator + re.escape(token)
+    if tokens[0][0].isalnum():
+        pattern = rf"(?<!{_WORD})" + pattern
+    if tokens[-1][-1].isalnum():
+        pattern += rf"(?!{_WORD})"
+    return re.compile(pattern)
+
+
+KEYWORDS = {keyword.strip() for keywords in SKILL_CATEGORIES.values() for keyword in keywords}
+REFERENCE = {keyword: _keyword_regex(keyword) for keyword in KEYWORDS}
+
+
+def _reference_match(items):
+    return {_tokens(k) for k, regex in REFERENCE.items() for item in items if regex.search(item.lower())}
+
+
+def _matched(items):
+    skills, _ = skill_matcher.match_all(items)
+    return {_tokens(skill) for skill in skills}
+
+
+SENTENCES = [
+    "I have built good REST APIs in Python and Go, deployed with Docker and Kubernetes on AWS.",
+    "Frontend work in React, Node.js and TypeScript; some UI/UX and C# on the side.",
+    "Network engineer: TCP / IP, LAN/WAN, routing & switching, CI/CD pipelines.",
+    "javascript developer, not java; data science and machine learning with pandas.",
+]
+
+
+@pytest.mark.parametrize("category", list(SKILL_CATEGORIES))
+def test_skill_table_matches_reference(category):
+    items = SKILL_CATEGORIES[category]
+    assert _matched(items) == _reference_match(items)
+
+
+def test_all_skill_tables_and_sentences_match_reference():
+    items = [k for keywords in SKILL_CATEGORIES.values() for k in keywords] + SENTENCES
+    assert _matched(items) == _reference_match(items)
+    for sentence in SENTENCES:
+        assert _matched([sentence]) == _reference_match([sentence])
+
+
+def test_adjacent_items_do_not_form_a_keyword():
+    # Neighbouring halves of every multi-token keyword, as separate list items
+    for keyword in KEYWORDS:
+        tokens = _tokens(keyword)
+        for cut in range(1, len(tokens)):
+            items = [" ".join(tokens[:cut]), " ".join(tokens[cut:])]
+            assert _matched(items) == _reference_match(items), (keyword, items)
+
+
+def test_separator_in_keyword_cannot_span_items():
+    matcher = SkillMatcher({"tools": ["A | B", "Make"]})
+
+    assert matcher.match_all(["A", "B"]) == ([], {"tools": 0})
+    assert matcher.match_all(["a | b", "make"]) == (["A | B", "Make"], {"tools": 2})
+    assert matcher.match("A | B") == (["A | B"], {"tools": 1})
@@ -0,0 +1,50 @@
+import json
+
+from interview_process.structured_output import (
+    SCHEMA_HINTS, InterviewReportData, IntroAnalysis, ResumeExtraction, structured_parser
+)
+
+
+def test_report_accepts_object_feedback_and_null_recommendation():
+    feedback = {"technical": "Solid API design", "communication": "Clear"}
+    text = json.dumps({"summary": "x", "recommendation": None, "detailed_feedback": feedback})
+
+    report = structured_parser.parse(text, InterviewReportData)
+
+    assert report.summary == "x"
+    assert report.recommendation == "consider"
+    assert json.loads(report.detailed_feedback) == feedback
+
+
+def test_report_accepts_list_feedback():
+    report = structured_parser.parse('{"detailed_feedback": ["a", "b"]}', InterviewReportData)
+
+    assert json.loads(report.detailed_feedback) == ["a", "b"]
+
+
+def test_resume_extraction_null_fields_take_defaults():
+    text = '{"skills": ["a"], "experience_level": null, "summary": null, "is_resume": null, "experience": null}'
+
+    resume = structured_parser.parse(text, ResumeExtraction)
+
+    assert resume.skills == ["a"]
+    assert resume.experience_level == "Unknown"
+    assert resume.summary == "No summary available."
+    assert resume.is_resume is True
+    assert resume.experience == 0
+
+
+def test_resume_extraction_has_no_job_specific_fields():
+    # The parse is cached per file and reused across jobs; scoring happens per job
+    text = '{"skills": ["Python"], "score": 9, "match_percentage": 80}'
+
+    resume = structured_parser.parse(text, ResumeExtraction)
+
+    assert "score" not in resume.model_dump() and "match_percentage" not in resume.model_dump()
+    assert "score" not in SCHEMA_HINTS[ResumeExtraction] and "match_percentage" not in SCHEMA_HINTS[ResumeExtraction]
+
+
+def test_intro_analysis_null_fields_take_defaults():
+    analysis = structured_parser.parse('{"experience_level": null, "projects_mentioned": null}', IntroAnalysis)
+
+    assert (analysis.experience_level, analysis.projects_mentioned) == ("mid", 0)
@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+import pytest
+
+from app import models
+from app.services import resume_queue
+from interview_process.text_extraction import TextExtractor
+
+
+def _write_pdf(path, pages, lines_per_page):
+    """A minimal text PDF"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    line = b"(Senior Python engineer building REST APIs with FastAPI and PostgreSQL) Tj T* " * lines_per_page
+    for _ in range(pages):
+        stream = b"BT /F1 8 Tf 10 TL 20 780 Td " + line + b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+@pytest.fixture
+def extractor():
+    extractor = TextExtractor(workers=1, timeout=1, max_pages=10000, max_chars=10 ** 9, memory_mb=1024)
+    yield extractor
+    extractor.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_extraction_timeout_fails_the_job(db, candidate_application, extractor, tmp_path, monkeypatch):
+    _, application = candidate_application
+    # Opening a pipe nobody writes to blocks until the worker's alarm fires
+    stuck = tmp_path / "stuck.txt"
+    os.mkfifo(stuck)
+    application.resume_file_path = str(stuck)
+    job = resume_queue.enqueue(db, application)
+    db.commit()
+    monkeypatch.setattr(resume_queue, "text_extractor", extractor)
+
+    async def no_llm(*args, **kwargs):
+        raise AssertionError("a failed extraction must not reach the parser")
+
+    monkeypatch.setattr(resume_queue, "parse_resume_profile", no_llm)
+
+    job_id = resume_queue._claim(db, "worker")
+    asyncio.run(asyncio.wait_for(resume_queue.process_job(job_id, "worker"), timeout=30))
+    db.expire_all()
+    job = db.get(models.ResumeJob, job.id)
+
+    # Not retried: the same file would time out again
+    assert (job.status, job.stage, job.attempts) == ("failed", "extract", 1)
+    assert job.last_error == "text extraction timeout"
+    assert (extractor.counters["timeouts"], extractor.counters["abandoned"]) == (1, 0)
+
+    # The worker is free for the next file
+    resume = tmp_path / "resume.txt"
+    resume.write_text("Python developer")
+    assert asyncio.run(extractor.extract(str(resume))) == "Python developer"
+
+
+def test_extraction_returns_text_within_limits(extractor, tmp_path):
+    extractor.timeout = 20
+    small_pdf = tmp_path / "small.pdf"
+    _write_pdf(small_pdf, pages=2, lines_per_page=3)
+
+    text = asyncio.run(extractor.extract(str(small_pdf)))
+
+    assert "Senior Python engineer" in text
+    assert extractor.counters["extracted"] == 1
@@ -0,0 +1,48 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.services import uploads
+from app.services.uploads import UploadTooLarge, store_upload
+
+
+def _upload(data, size=None):
+    # size=None: the size is only discovered while streaming
+    return UploadFile(io.BytesIO(data), filename="resume.pdf", size=size)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_CHUNK_SIZE", 1024)
+
+
+def test_oversized_stream_is_aborted_and_part_file_removed(tmp_path):
+    too_large = uploads.upload_stats["too_large"]
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(store_upload(_upload(b"x" * 10_000), str(tmp_path), "pdf", max_size=4096))
+
+    assert list(tmp_path.iterdir()) == []
+    assert uploads.upload_stats["too_large"] == too_large + 1
+
+
+def test_declared_oversized_upload_is_rejected_without_copying(tmp_path):
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(store_upload(_upload(b"x" * 10_000, size=10_000), str(tmp_path), "pdf", max_size=4096))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_is_stored_under_its_content_hash(tmp_path):
+    data = b"%PDF-1.4 resume " * 500
+
+    path, sha256, size = asyncio.run(store_upload(_upload(data), str(tmp_path), "PDF", max_size=1 << 20))
+
+    assert sha256 == hashlib.sha256(data).hexdigest()
+    assert path == f"{tmp_path}/{sha256}.pdf"
+    assert size == len(data)
+    assert [p.name for p in tmp_path.iterdir()] == [f"{sha256}.pdf"]
+    assert (tmp_path / f"{sha256}.pdf").read_bytes() == data
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Train the local answer scorer from historical LLM scores.
+Run offline (e.g. nightly); the API loads LOCAL_SCORER_PATH at startup.
+
+    python train_local_scorer.py [--output local_scorer.npz]
+"""
+
+import argparse
+import json
+import random
+import sys
+
+from app.database import SessionLocal
+from app.models import InterviewAnswer, InterviewQuestion
+from interview_process.local_scorer import LocalScorer
+from interview_process.config import LOCAL_SCORER_PATH, LOCAL_SCORER_MIN_SAMPLES
+
+
+def load_samples(db):
+    """(question, answer, score) for answers scored by the LLM"""
+    rows = db.query(InterviewQuestion.question_text, InterviewAnswer.answer_text,
+                    InterviewAnswer.answer_score, InterviewAnswer.answer_evaluation).join(
+        InterviewQuestion, InterviewAnswer.question_id == InterviewQuestion.id
+    ).filter(
+        InterviewAnswer.answer_score.isnot(None),
+        InterviewAnswer.needs_reevaluation != True
+    ).all()
+    samples = []
+    for question, answer, score, evaluation in rows:
+        try:
+            scored_by = json.loads(evaluation or "{}").get("scored_by")
+        except (ValueError, AttributeError):
+            scored_by = None
+        # Never train on the local model's own output
+        if scored_by != "local_model":
+            samples.append((question, answer, score))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=LOCAL_SCORER_PATH)
+    parser.add_argument("--ridge", type=float, default=1.0)
+    parser.add_argument("--vocab-size", type=int, default=300)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        samples = load_samples(db)
+    finally:
+        db.close()
+
+    print(f"Loaded {len(samples)} LLM-scored answers")
+    if len(samples) < LOCAL_SCORER_MIN_SAMPLES:
+        print(f"Need at least {LOCAL_SCORER_MIN_SAMPLES} to train; nothing written")
+        sys.exit(1)
+
+    # Hold out 20% to report how the tier would behave
+    random.Random(0).shuffle(samples)
+    split = int(len(samples) * 0.8)
+    scorer = LocalScorer(path=None).fit(samples[:split], args.vocab_size, args.ridge)
+    errors, confident_errors = [], []
+    for question, answer, score in samples[split:]:
+        predicted, stderr = scorer.predict(question, answer)
+        errors.append(abs(predicted - score))
+        if stderr <= scorer.max_stderr:
+            confident_errors.append(abs(predicted - score))
+    held_out = len(errors)
+    print(f"Held-out MAE: {sum(errors) / held_out:.2f} on {held_out} answers")
+    if confident_errors:
+        within = sum(e <= 1.0 for e in confident_errors) / len(confident_errors)
+        print(f"Scored locally: {len(confident_errors) / held_out:.0%} "
+              f"(MAE {sum(confident_errors) / len(confident_errors):.2f}, {within:.0%} within one point)")
+    else:
+        print("Scored locally: 0% (every held-out answer would be escalated)")
+
+    LocalScorer(path=None).fit(samples, args.vocab_size, args.ridge).save(args.output)
+    print(f"Saved model trained on {len(samples)} answers to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,28 @@ def update_schema():
             print("Success: locked_skill column added.")
         else:
             print("Info: locked_skill column already exists.")
+
+        cursor.execute("PRAGMA table_info(interview_answers)")
+        columns = [info[1] for info in cursor.fetchall()]
+        if 'needs_reevaluation' not in columns:
+            print("Attempting to add needs_reevaluation column...")
+            cursor.execute("ALTER TABLE interview_answers ADD COLUMN needs_reevaluation BOOLEAN DEFAULT 0")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_interview_answers_needs_reevaluation ON interview_answers (needs_reevaluation)")
+            conn.commit()
+            print("Success: needs_reevaluation column added.")
+        else:
+            print("Info: needs_reevaluation column already exists.")
+
+        cursor.execute("PRAGMA table_info(applications)")
+        columns = [info[1] for info in cursor.fetchall()]
+        if 'resume_sha256' not in columns:
+            print("Attempting to add resume_sha256 column...")
+            cursor.execute("ALTER TABLE applications ADD COLUMN resume_sha256 VARCHAR(64)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_applications_resume_sha256 ON applications (resume_sha256)")
+            conn.commit()
+            print("Success: resume_sha256 column added.")
+        else:
+            print("Info: resume_sha256 column already exists.")
             
     except Exception as e:
         print(f"Error: {e}")